@@ -1,7 +1,9 @@
-
 # https://hivinfo.nih.gov/understanding-hiv/fact-sheets/fda-approved-hiv-medicines
 # https://docs.python.org/3/library/re.html#matching-vs-searching.
 
+from collections import namedtuple
+from functools import lru_cache
+
 arv_master_dict = {
     # ... block RT; required for replication
     'NRTI': [('Ziagen', 'Abacavir', 'ABC', '1998-12-17'),
@@ -45,7 +47,73 @@ arv_master_dict = {
 }
 
 
-def extract_from_zips(path_to_zips):
+class ZippedReport(namedtuple('ZippedReport', ['zip_path', 'member'])):
+    """
+    Reference to a PDF report inside a .zip archive.
+
+    Stands in for the path of an extracted report; it is cheap to pickle
+    (no PDF bytes) and its name is the member's file name, as would be the
+    name of the report had it been extracted to disk.
+    """
+    __slots__ = ()
+
+    @property
+    def name(self):
+        from pathlib import PurePosixPath
+
+        return PurePosixPath(self.member).name
+
+    def read_bytes(self):
+        return _open_zip(self.zip_path).read(self.member)
+
+
+class PrefetchedReport(namedtuple('PrefetchedReport', ['name', 'pdf_bytes'])):
+    """
+    A report already read into memory (see _prefetch_reports); stands in
+    for the path of the report, as does a ZippedReport.
+    """
+    __slots__ = ()
+
+    def read_bytes(self):
+        return self.pdf_bytes
+
+
+def _open_zip(zip_path):
+    import os
+
+    # An archive rewritten or replaced since it was opened is opened anew
+    stat = os.stat(zip_path)
+
+    # So is an archive opened before this process was forked (a worker);
+    #   a handle inherited from the parent shares its file offset
+    return _open_zip_version(str(zip_path), stat.st_mtime_ns, stat.st_size,
+                             os.getpid())
+
+
+@lru_cache(maxsize=8)
+def _open_zip_version(zip_path, mtime_ns, size, pid):
+    from zipfile import ZipFile
+
+    # Kept open (per process) so that each archive's central directory
+    #   is read once rather than once per member
+    return ZipFile(zip_path, 'r')
+
+
+def _list_zip_files(path_to_zips):
+    """
+    The .zip archives in the specified directory, oldest first (by
+    modification time, then name) so that where a report is delivered in
+    more than one archive the latest delivery is read last (and wins).
+    """
+    from pathlib import Path
+
+    zip_files = [i for i in Path(path_to_zips).iterdir() if ".zip" in str(i)]
+
+    # iterdir() order is arbitrary
+    return sorted(zip_files, key=lambda i: (i.stat().st_mtime_ns, i.name))
+
+
+def extract_from_zips(path_to_zips, stream=False):
     """
     Obtains paths to all files within .zip folders in the specified directory.
 
@@ -54,15 +122,23 @@ def extract_from_zips(path_to_zips):
     where extraction_date is a descriptive string -- such as 30JUN2019.
     It then returns a list of paths to these files.
 
+    Archives are read oldest first, so a report delivered in more than one
+    archive resolves to the newest delivery.
+
+    In streaming mode nothing is written to disk; instead a reference to
+    each .PDF member is returned and its bytes are read straight out of
+    the archive when the report is scraped.
+
     Parameters
     ----------
     path_to_zips : PosixPath
 
-    extraction_date : PosixPath
+    stream : bool
+        Return ZippedReport references rather than extracting to disk
 
     Returns
     -------
-    List of Posix paths
+    List of Posix paths (or ZippedReports)
     """
 
     from zipfile import ZipFile
@@ -72,8 +148,21 @@ def extract_from_zips(path_to_zips):
     path_to_zips = Path(path_to_zips)
     output_path = path_to_zips.joinpath('extracted-reports')
 
-    # list all .zip files in folder
-    zip_files = [i for i in path_to_zips.iterdir() if ".zip" in str(i)]
+    # list all .zip files in folder (oldest first)
+    zip_files = _list_zip_files(path_to_zips)
+
+    if stream:
+        # Key on file name; as with extractall() a report delivered in
+        #   more than one archive resolves to the last one read (newest)
+        zipped_reports = {}
+        for zip_file in zip_files:
+            with ZipFile(zip_file, 'r') as zipObj:
+                for member in zipObj.namelist():
+                    if ".PDF" in member:
+                        report = ZippedReport(str(zip_file), member)
+                        zipped_reports[report.name] = report
+
+        return list(zipped_reports.values())
 
     # if folder for these ZIP's already exists
     if output_path.exists():
@@ -97,24 +186,274 @@ def extract_from_zips(path_to_zips):
         return report_paths
 
 
-def scrape_PDF_to_text(path_to_pdf):
+def _list_zipped_reports(path_to_zips):
+    """
+    Lists every .PDF member of the .zip archives in the specified directory
+    along with its CRC and size (read from the archive's central directory;
+    nothing is decompressed).
+
+    As with extractall(), a report delivered in more than one archive
+    resolves to the last one read (the newest archive).
+
+    Returns
+    -------
+    DataFrame with one row per DOC_NAME
+    """
+    from zipfile import ZipFile
+    from pathlib import PurePosixPath
+    import pandas as pd
+
+    # list all .zip files in folder (oldest first)
+    zip_files = _list_zip_files(path_to_zips)
+
+    members = []
+    for zip_file in zip_files:
+        with ZipFile(zip_file, 'r') as zipObj:
+            for zip_info in zipObj.infolist():
+                if ".PDF" in zip_info.filename:
+                    members.append(
+                        {'ZIP_FILE': str(zip_file),
+                         'MEMBER': zip_info.filename,
+                         'DOC_NAME': PurePosixPath(zip_info.filename).name,
+                         'CRC': zip_info.CRC,
+                         'FILE_SIZE': zip_info.file_size})
+
+    zip_members = pd.DataFrame(
+        members,
+        columns=['ZIP_FILE', 'MEMBER', 'DOC_NAME', 'CRC', 'FILE_SIZE'])
+
+    zip_members = zip_members\
+        .drop_duplicates(subset='DOC_NAME', keep='last')\
+        .reset_index(drop=True)
+
+    return zip_members
+
+
+def _parsed_reports_paths(path_to_zips, parser):
+    """
+    Locations of the manifest and parsed tables kept for incremental runs
+    (and of the checkpoint of an unfinished run). The genotypic and
+    phenotypic parsers keep separate files since Phenosense-GT reports are
+    parsed by both.
+    """
+    from pathlib import Path
+
+    parsed_path = Path(path_to_zips).joinpath('parsed-reports')
+
+    return {'manifest': parsed_path.joinpath(f'{parser}-manifest.tsv'),
+            'tables': [parsed_path.joinpath(f'{parser}.pkl'),
+                       parsed_path.joinpath(f'{parser}-eav.pkl')],
+            'checkpoint': parsed_path.joinpath(f'{parser}-checkpoint.pkl')}
+
+
+def _select_unparsed_reports(path_to_zips, parser, stream=False):
+    """
+    Compares the archives against the manifest of a previous run and
+    returns only the reports that are new or have changed (CRC or size),
+    extracting just those reports unless streaming.
+
+    Returns
+    -------
+    (report_paths, manifest) : tuple
+        manifest is the previous manifest updated with the selected reports;
+        it is written once their parsed results have been saved
+    """
+    from zipfile import ZipFile
+    from pathlib import Path
+    import pandas as pd
+
+    paths = _parsed_reports_paths(path_to_zips, parser)
+    zip_members = _list_zipped_reports(path_to_zips)
+
+    # Without the parsed tables the manifest means nothing (start over)
+    if paths['manifest'].exists() and paths['tables'][0].exists():
+        previous = pd.read_csv(paths['manifest'], sep='\t',
+                               dtype={'CRC': 'int64', 'FILE_SIZE': 'int64'})
+    else:
+        previous = zip_members.iloc[0:0].copy()
+
+    # ZIP_FILE may change (re-delivered report); only the content matters
+    zip_members = zip_members.merge(
+        previous[['DOC_NAME', 'CRC', 'FILE_SIZE']],
+        on='DOC_NAME', how='left', suffixes=('', '_PREVIOUS'))
+
+    unparsed = zip_members[
+        (zip_members['CRC'] != zip_members['CRC_PREVIOUS']) |
+        (zip_members['FILE_SIZE'] != zip_members['FILE_SIZE_PREVIOUS'])]
+    unparsed = unparsed[['ZIP_FILE', 'MEMBER', 'DOC_NAME', 'CRC', 'FILE_SIZE']]
+
+    if stream:
+        report_paths = [ZippedReport(zip_file, member) for zip_file, member
+                        in zip(unparsed['ZIP_FILE'], unparsed['MEMBER'])]
+
+    else:
+        output_path = Path(path_to_zips).joinpath('extracted-reports')
+        report_paths = []
+        for zip_file, zip_unparsed in unparsed.groupby('ZIP_FILE', sort=False):
+            with ZipFile(zip_file, 'r') as zipObj:
+                for member in zip_unparsed['MEMBER']:
+                    report_paths.append(
+                        Path(zipObj.extract(member, output_path)))
+
+    # Reports no longer delivered keep their manifest entries (and results)
+    unparsed = unparsed.assign(
+        PARSED_DATE=pd.Timestamp.today().strftime('%Y-%m-%d'))
+    manifest = pd.concat([
+        previous[~previous['DOC_NAME'].isin(unparsed['DOC_NAME'])],
+        unparsed])
+    manifest.reset_index(drop=True, inplace=True)
+
+    return report_paths, manifest
+
+
+def _read_parsed_tables(path_to_zips, parser):
+    """
+    The tables saved by earlier incremental runs (None for any not saved).
+    """
+    import pandas as pd
+
+    paths = _parsed_reports_paths(path_to_zips, parser)
+
+    return [pd.read_pickle(path) if path.exists() else None
+            for path in paths['tables']]
+
+
+def _update_parsed_tables(path_to_zips, parser, manifest, tables,
+                          doc_names):
+    """
+    Replaces the results of re-parsed reports in the stored tables, appends
+    those of new reports, and saves the tables followed by the manifest.
+
+    Parameters
+    ----------
+    tables : list of DataFrames
+        Newly parsed tables (None = no new rows); the first one is sorted
+        by patient. A table with neither new nor earlier rows (e.g., on a
+        first run without reports) is returned empty and is not saved
+
+    doc_names : list
+        DOC_NAMEs of the (re-)parsed reports
+
+    Returns
+    -------
+    List of the combined tables
+    """
+    import pandas as pd
+
+    paths = _parsed_reports_paths(path_to_zips, parser)
+    paths['manifest'].parent.mkdir(parents=True, exist_ok=True)
+
+    previous_tables = _read_parsed_tables(path_to_zips, parser)
+
+    combined_tables = []
+    for i, table in enumerate(tables):
+        previous = previous_tables[i]
+
+        if table is None and previous is None:
+            combined_tables.append(pd.DataFrame())
+            continue
+
+        if previous is not None:
+            previous = previous[~previous['DOC_NAME'].isin(doc_names)]
+            table = pd.concat([previous, table])
+
+        # Re-sort by patient
+        if i == 0:
+            table = table.sort_values(['PAT_MRN_ID', 'ACCESSION'])
+
+        table = table.reset_index(drop=True)
+        table.to_pickle(paths['tables'][i])
+        combined_tables.append(table)
+
+    # Written last; an interrupted run is simply re-parsed
+    manifest.to_csv(paths['manifest'], sep='\t', index=False)
+
+    return combined_tables
+
+
+# Part of every text cache key; bump whenever a change to the scraper
+#   would alter its output so that stale cache entries are never read
+SCRAPER_VERSION = 'pdfminer3-text-1'
+
+
+def scrape_PDF_to_text(path_to_pdf, cache_dir=None, compress_cache=False,
+                       max_pages=None, stop=None, page_counts=None):
     """
     Scrapes a single PDF to text, maintaining relative position on page.
 
+    If a cache directory is given the text is stored under a hash of the
+    PDF's bytes (and the scraper version) so that subsequent runs, e.g.,
+    after changing a regular expression, skip pdfminer entirely.
+
     Parameters
     ----------
-    path_to_pdf : PosixPath
+    path_to_pdf : PosixPath, ZippedReport, PrefetchedReport
+                  or file-like object
+
+    cache_dir : PosixPath
+        Directory of the scraped-text cache (None = no caching)
+
+    compress_cache : bool
+        Write new cache entries gzip-compressed
+
+    max_pages : int
+        Scrape at most this many pages (None = every page)
+
+    stop : function
+        Called with the text scraped so far after each page; scraping ends
+        once it returns True (e.g., required_sections_seen)
+
+    page_counts : dict
+        Filled with the number of pages in the PDF ('PAGES') and the number
+        scraped ('PAGES_SCRAPED')
+
+    Page-limited text ({max_pages} or {stop}) is partial and so is neither
+    read from nor written to the cache.
 
     Returns
     -------
     A text version of the specified PDF
     """
 
+    pdf_bytes = _read_report_bytes(path_to_pdf)
+
+    if cache_dir is None or max_pages or stop is not None:
+        return _scrape_PDF_bytes_to_text(pdf_bytes, max_pages=max_pages,
+                                         stop=stop, page_counts=page_counts)
+
+    cache_key = _text_cache_key(pdf_bytes)
+
+    text = _read_text_cache(cache_dir, cache_key)
+    if text is None:
+        text = _scrape_PDF_bytes_to_text(pdf_bytes, page_counts=page_counts)
+        _write_text_cache(cache_dir, cache_key, text, compress=compress_cache)
+
+    return text
+
+
+def _read_report_bytes(path_to_pdf):
+    if isinstance(path_to_pdf, (ZippedReport, PrefetchedReport)):
+        return path_to_pdf.read_bytes()
+
+    # in-memory buffer
+    elif hasattr(path_to_pdf, 'read'):
+        return path_to_pdf.read()
+
+    else:
+        with open(path_to_pdf, 'rb') as fh:
+            return fh.read()
+
+
+def _scrape_PDF_bytes_to_text(pdf_bytes, max_pages=None, stop=None,
+                              page_counts=None):
     from pdfminer3.converter import TextConverter
     # from pdfminer3.layout import LAParams, LTTextBox
-    from pdfminer3.pdfpage import PDFPage
+    from pdfminer3.pdfpage import PDFPage, PDFTextExtractionNotAllowed
     from pdfminer3.pdfinterp import PDFResourceManager
     from pdfminer3.pdfinterp import PDFPageInterpreter
+    from pdfminer3.pdfparser import PDFParser
+    from pdfminer3.pdfdocument import PDFDocument
+    from pdfminer3.pdftypes import resolve1
     # from pdfminer3.converter import PDFPageAggregator
     import io
 
@@ -123,15 +462,32 @@ def scrape_PDF_to_text(path_to_pdf):
     converter = TextConverter(resource_manager, fake_file_handle)
     page_interpreter = PDFPageInterpreter(resource_manager, converter)
 
-    with open(path_to_pdf, 'rb') as fh:
+    with io.BytesIO(pdf_bytes) as fh:
+
+        # As PDFPage.get_pages(), but pages are processed one at a time so
+        #   that scraping can end after {max_pages} or once {stop} says so
+        document = PDFDocument(PDFParser(fh), caching=True)
+        if not document.is_extractable:
+            raise PDFTextExtractionNotAllowed(
+                f'Text extraction is not allowed: {fh!r}')
+
+        pages_scraped = 0
+        for page in PDFPage.create_pages(document):
+            if max_pages and pages_scraped >= max_pages:
+                break
 
-        for page in PDFPage.get_pages(fh,
-                                      caching=True,
-                                      check_extractable=True):
             page_interpreter.process_page(page)
+            pages_scraped += 1
+
+            if stop is not None and stop(fake_file_handle.getvalue()):
+                break
 
         text = fake_file_handle.getvalue()
 
+        if page_counts is not None:
+            page_counts['PAGES'] = resolve1(document.catalog['Pages'])['Count']
+            page_counts['PAGES_SCRAPED'] = pages_scraped
+
     # close open handles
     converter.close()
     fake_file_handle.close()
@@ -142,6 +498,118 @@ def scrape_PDF_to_text(path_to_pdf):
     return text
 
 
+def _text_cache_key(pdf_bytes):
+    import hashlib
+
+    digest = hashlib.sha256(SCRAPER_VERSION.encode())
+    digest.update(pdf_bytes)
+
+    return digest.hexdigest()
+
+
+def _text_cache_paths(cache_dir, cache_key):
+    from pathlib import Path
+
+    # Shard on the first two characters of the key
+    #   (avoids a single directory with 10,000+ entries)
+    shard = Path(cache_dir).joinpath(cache_key[:2])
+
+    return (shard.joinpath(f'{cache_key}.txt'),
+            shard.joinpath(f'{cache_key}.txt.gz'))
+
+
+def _read_text_cache(cache_dir, cache_key):
+    """
+    Returns the cached text (or None on a miss) and marks the entry as
+    recently used by touching its modification time.
+    """
+    import gzip
+    import os
+
+    plain_path, gzip_path = _text_cache_paths(cache_dir, cache_key)
+
+    try:
+        if plain_path.exists():
+            text = plain_path.read_bytes().decode('utf-8')
+            os.utime(plain_path)
+
+        elif gzip_path.exists():
+            text = gzip.decompress(gzip_path.read_bytes()).decode('utf-8')
+            os.utime(gzip_path)
+
+        else:
+            text = None
+
+    # the entry may be evicted by another process between the two calls
+    except FileNotFoundError:
+        text = None
+
+    return text
+
+
+def _write_text_cache(cache_dir, cache_key, text, compress=False):
+    import gzip
+    import os
+
+    plain_path, gzip_path = _text_cache_paths(cache_dir, cache_key)
+    cache_path = gzip_path if compress else plain_path
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+    data = text.encode('utf-8')
+    if compress:
+        data = gzip.compress(data)
+
+    # Write-then-rename so that concurrent workers never read a partial entry
+    temp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+    temp_path.write_bytes(data)
+    os.replace(temp_path, cache_path)
+
+
+def prune_text_cache(cache_dir, max_cache_bytes):
+    """
+    Evicts least-recently-used entries from the scraped-text cache until
+    its total size is at most {max_cache_bytes}.
+
+    Entries are touched whenever they are read, so modification time
+    orders them from least to most recently used.
+
+    Parameters
+    ----------
+    cache_dir : PosixPath
+
+    max_cache_bytes : int
+
+    Returns
+    -------
+    Number of entries evicted
+    """
+    from pathlib import Path
+
+    entries = []
+    for cache_path in Path(cache_dir).glob('*/*.txt*'):
+        if cache_path.name.endswith('.tmp'):
+            continue
+        try:
+            stat = cache_path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, cache_path))
+
+    # oldest first
+    entries.sort()
+    total_bytes = sum(size for _, size, _ in entries)
+
+    n_evicted = 0
+    for _, size, cache_path in entries:
+        if total_bytes <= max_cache_bytes:
+            break
+        cache_path.unlink(missing_ok=True)
+        total_bytes -= size
+        n_evicted += 1
+
+    return n_evicted
+
+
 def add_chart_reviewed_mrns(df, path_to_chart_review_csv):
     from pathlib import Path
     import pandas as pd
@@ -372,1398 +840,4033 @@ def replicate_comments_over_amino_acids(comments):
     return comments
 
 
-def parse_genotypic_reports(path_to_zips, test_type):
-    from src.utils import extract_from_zips, scrape_PDF_to_text
-    from ipypb import track
-    import pandas as pd
-    import numpy as np
-    import warnings
-
-    def _mark_report_as_complete(sample_text):
-        import re
-
-        report_complete = True
-
-        phrases = ['common causes of assay failure',
-                'unable to perform testing',
-                'quantity not sufficient',
-                'inadequate specimen volume',
-                'low sample volume',
-                'is not ready to report',
-                'canceled per client',
-                'insufficient HIV-infected cells',
-                'duplicate order',
-                'could not be obtained',
-                'could not be completed',
-                'this sample should not be used',
-                'inappropriately collected',
-                'resubmit a new specimen',
-                'resubmit a new sample',
-                'unsuccessful testing of this sample'
-                ]
-
-        for phrase in phrases:
-            if report_complete:
-                if re.search(phrase, sample_text, flags=re.IGNORECASE):
-                    report_complete = False
-            else:
-                pass
-
-        return report_complete
-
-    def _extract_order_info_as_dict(sample_text: str) -> dict:
-        """
-        Extract order info from text text of parsed PDF report.
-        The data elements always follow the same ordering though
-        some may be missing.
-
-        Parameters
-        ----------
-        sample_text : str
-            Text from parsed PDF report
-
-        Returns
-        ----------
-        row_values : list
-            List of values; one for each order info component
-        """
-        import re
-        import numpy as np
-
-        # Get phrasing used for MRN
-        if re.search('Medical Record #', sample_text):
-            mrn_prefix = 'Medical Record #'
-        else:
-            mrn_prefix = 'Patient ID'
-
-        # Get phrasing used for Lab Order ID
-        if re.search("ID/Order #", sample_text):
-            prov_suffix = 'Reference Lab ID/Order #'
-        else:
-            prov_suffix = 'Reference Lab ID'
-
-        full_name = re.search(
-            'Patient Name[:\s]*([A-Za-z -/.]*?)(?=DOB)', sample_text)
-        birth_date = re.search(
-            'DOB[:\s]*([A-Za-z0-9-/]*?)[ ]*(?=Patient ID)', sample_text)
-        mrn = re.search(
-            f'{mrn_prefix}[:\s]*([\d]*?)[ \D]*(?=Gender)', sample_text)
-
-        # occassionally Monogram placed the SSN in place of the PAT_MRN_ID
-        ssn = re.search(
-            f'{mrn_prefix}[:\s]*(\d\d\d-\d\d-\d\d\d\d)[ \D]*(?=Gender)',
-            sample_text)
-        if ssn:
-            mrn = None
-
-        gender = re.search(
-            'Gender[:\s]*([A-Za-z]*?)[ ]*(?=Monogram)', sample_text)
-        test_accession = re.search(
-            'Accession[:\s#]*([A-Za-z0-9-/_]*?)[ ]*(?=Date)', sample_text)
-        # Dates follow the format:  17-MAY-2016 11:20 PT
-        collection_date = re.search(
-            'Date Collected[:\s]*([A-Za-z0-9-/]*?)[ ][0-9][0-9]:', sample_text)
-        received_date = re.search(
-            'Date Received[:\s]*([A-Za-z0-9-/]*?)[ ][0-9][0-9]:', sample_text)
-        reported_date = re.search(
-            'Date Reported[:\s]*([A-Za-z0-9-/]*?)[ ][0-9][0-9]:', sample_text)
-        # Mode in [F, M, W]
-        test_mode = re.search(
-            'Mode[:\s]*([A-Z,]*?)[ ]*(?=Report)', sample_text)
-        report_status = re.search(
-            'Report Status[:\s]*([A-Z]*?)[ ]*(?=Referring)', sample_text)
-        # Referring Physician
-        referring_prov = re.search(
-            f'Referring Physician[:\s]*([A-Za-z\s\d,]*?)(?={prov_suffix})',
-            sample_text)
-        # keep only first two names (do not keep address, if present)
-        if referring_prov:
-            referring_prov = re.search(
-                '([A-Za-z]*[ ][A-Za-z]*)', referring_prov.group(1))
-        # Order ID should not contain letters
-        # ... in the early days the hospital floor was substituted
-        order_id = re.search(
-            f'{prov_suffix}[:\s]*([0-9]*?)[ _A-Z-:]', sample_text)
+# Part of the key of every compiled HIVdb ruleset; bump whenever a change
+#   to the loaders above would alter the ruleset so that it is recompiled
+RULESET_VERSION = 'hivdb-ruleset-1'
 
-        # HIV-1 subtype should be present unless viral load is < 500 copies/mL
-        #   or the specimen fails to meet collection specifications
-        hiv1_subtype = re.search(
-            '1[ -]?Sub[-]?type:[ ]+([A-Za-z\d\s]*?)[ ]*(?=Generic)',
-            sample_text)
-        # Algorithm version is a canned-comment
-        #   posted regardless of whether testing was performed
-        #   (not used by Phenosense-GT)
-        algorithm = re.search(
-            'proprietary algorithm \(version[ #]([0-9]*)\)', sample_text)
-
-        val_list = [full_name, birth_date, mrn, ssn, gender, test_accession,
-                    collection_date, received_date, reported_date, test_mode,
-                    report_status, referring_prov, order_id, hiv1_subtype,
-                    algorithm]
-        row_values = [v.group(1).strip()
-                      .title() if v else np.NaN for v in val_list]
-
-        col_names = ['FULL_NAME', 'BIRTH_DATE', 'PAT_MRN_ID', 'SSN', 'GENDER',
-                     'ACCESSION', 'COLLECTED_DATE', 'RECEIVED_DATE',
-                     'REPORTED_DATE', 'MODE', 'REPORT_STATUS',
-                     'REFERRING_PROV', 'ORDER_ID', 'HIV1_SUBTYPE',
-                     'ALGORITHM_VERSION']
-
-        order_info_dict = dict(zip(col_names, row_values))
-
-        return order_info_dict
-
-    def _extract_drms_as_dict(sample_text: str) -> dict:
-        from src.utils import arv_master_dict
-        import re
-
-        #arv_resistance_dict = {}
-        #for art_class, art_list in arv_master_dict.items():
-        #    for art_attributes in art_list:
-        #        resistance = re.search(
-        #            f'{art_attributes[0]}[ ]+([A-Za-z\d\s,]+)[ ]+(?={art_attributes[2]})', sample_text)
-        #        if resistance:
-        #            arv_resistance_dict[art_attributes[2]] = resistance.group(1).strip()
-
-        #        resistance_boosted = re.search(
-        #            f'{art_attributes[0]}[ ]\/[ ]r[ ]+([A-Za-z\d\s,]+)[ ]+(?={art_attributes[2]})', sample_text)
-        #        if resistance_boosted:
-        #            arv_resistance_dict[f'{art_attributes[2]}_r'] = resistance_boosted.group(1).strip()
-
-        arv_resistance_dict = {}
-        for art_class, art_list in arv_master_dict.items():
-            # {'NRTI': [('Ziagen', 'Abacavir', 'ABC', '1998-12-17'), ...],
-            #  'NNRTI': [('Pifeltro', 'Doravirine', 'DOR', '2018-08-30'), ...], ...}
-            for art_attributes in art_list:
-                # If brand name == generic name
-                # e.g., Bictegravir BictegravirL74I  BIC
-                if art_attributes[0] == art_attributes[1]:
-                    resistance = re.search(
-                        f'{art_attributes[0]}[ ]+{art_attributes[1]}[ ]*([A-Za-z\d\s,/]+)[ ]+?(?={art_attributes[2]})', sample_text)
-                    if resistance:
-                        arv_resistance_dict[art_attributes[2]] = resistance.group(1).strip()
-
-                # All others (brand name != generic name)
-                # e.g., Dolutegravir TivicayL74I  DTG
-                else:  
-                    resistance = re.search(
-                        f'{art_attributes[0]}[ ]*([A-Za-z\d\s,/]+)[ ]+?(?={art_attributes[2]})', sample_text)
-                    if resistance:
-                        # Because the above regex must include the '/' in order to capture
-                        #   mixtures (e.g., Q58Q/E), there is no way to exclude the '/ r'
-                        #   characters from the match.
-                        # If these characters are found, set the entire match to NULL
-                        #   and allow the next 'boosted' search to capture the mutations
-                        if re.search('/ r', sample_text):
-                            arv_resistance_dict[art_attributes[2]] = np.NaN
-                        else:
-                            arv_resistance_dict[art_attributes[2]] = resistance.group(1).strip()
-
-                    # Boosted ARVs include '/r' after brand name (and abbreviation)
-                    resistance_boosted = re.search(
-                        f'{art_attributes[0]}[ ]*\/[ ]r[ ]*([A-Za-z\d\s,/]+)[ ]+?(?={art_attributes[2]})', sample_text)
-                    if resistance_boosted:
-                        arv_resistance_dict[f'{art_attributes[2]}_r'] = resistance_boosted.group(1).strip()
-
-        return arv_resistance_dict
-
-    def _extract_full_mutation_lists_as_dict(sample_text: str,
-                                             test_type: str) -> dict:
-        import re
-
-        # To avoid writing an entirely separate function solely for parsing
-        #   Phenosense-GT tests the following switch is used.
-        #   The only difference between parsing the mutation list for
-        #   Phenosense-GT tests vs.
-        #   [Geneseq, Genosure-MG, Genosure-PRiME, Genosure-Archive]
-        #   is the use of a colon (:) rather than a space (\s).
-        if test_type.upper() in ['PHENOSENSE-GT']:
-            q = ':'
-        else:
-            q = '\s'
 
-        # regex for convenience
-        alphanum_list = '[A-Z0-9,/ \^]*?'
+def _hivdb_source_hashes(path_to_hivdb) -> dict:
+    """
+    SHA-256 of each Stanford score and comment file in the directory.
+    """
+    from pathlib import Path
+    import hashlib
 
-        # REVERSE TRANSCRIPTASE
-        # ---------------------
-        # Must account for the integrase loci section in (prime, archive)
-        if re.search(f' RT{q}[ ]?None', sample_text):
-            rt_list = 'None'
+    hivdb = Path(path_to_hivdb)
+    source_paths = sorted(set(hivdb.glob('*-scores-*')) |
+                          set(hivdb.glob('*-comments*')))
 
-        else:
-            rt_list = None
-            for behind in [f'(?<= RT{q})']:
-                for ahead in [f'(?= PR{q})', f'(?= PI{q})',
-                              f'(?= IN{q})', '[ ]+[A-Z][a-z][a-z]']:
-                    if not rt_list:
-                        try:
-                            rt_list = re.search(
-                                f'{behind}({alphanum_list}){ahead}',
-                                sample_text)
-                            rt_list = rt_list.group(1).strip().replace(':', '')
-                        except AttributeError:
-                            pass
-
-        # INTEGRASE
-        # ---------
-        # Integrase section is only present for archive/prime tests
-        # Occurs just prior to the list of protease mutations
-        if re.search(f' IN{q}[ ]?None', sample_text):
-            insti_list = 'None'
+    return {path.name: hashlib.sha256(path.read_bytes()).hexdigest()
+            for path in source_paths}
 
-        else:
-            insti_list = None
-            for behind in [f'(?<= IN{q})']:
-                for ahead in [f'(?= PR{q})', f'(?= PI{q})',
-                              '[ ]+[A-Z][a-z][a-z]']:
-                    if not insti_list:
-                        try:
-                            insti_list = re.search(
-                                f'{behind}({alphanum_list}){ahead}',
-                                sample_text)
-                            insti_list = insti_list.group(1).strip()\
-                                                   .replace(':', '')
-                        except AttributeError:
-                            pass
-
-        # PROTEASE
-        # ---------
-        # Same for all test-types
-        if re.search(f' PR{q}[ ]?None', sample_text):
-            pr_list = 'None'
 
-        else:
-            pr_list = None
-            for behind in [f'(?<= PR{q})', f'(?<= PI{q})']:
-                for ahead in [f'(?= IN{q})', '[ ]+[A-Z][a-z][a-z]']:
-                    if not pr_list:
-                        try:
-                            pr_list = re.search(
-                                f'{behind}({alphanum_list}){ahead}',
-                                sample_text)
-                            pr_list = pr_list.group(1).strip().replace(':', '')
-                        except AttributeError:
-                            pass
-
-        mutations_dict = {}
-        mutations_dict['RT_LIST'] = rt_list
-        mutations_dict['INSTI_LIST'] = insti_list
-        mutations_dict['PR_LIST'] = pr_list
-
-        return mutations_dict
-
-    def _reorder_dataframe_columns(df) -> pd.DataFrame:
-        # get list
-        cols = df.columns.to_list()
-
-        # order info
-        order_info = ['DOC_NAME', 'TEST_TYPE',
-                      'REPORT_COMPLETE',
-                      'FULL_NAME', 'PAT_MRN_ID', 'SSN',
-                      'BIRTH_DATE', 'GENDER', 'ACCESSION', 'ORDER_ID',
-                      'REFERRING_PROV', 'COLLECTED_DATE', 'RECEIVED_DATE',
-                      'REPORTED_DATE', 'REPORT_STATUS', 'MODE',
-                      'ALGORITHM_VERSION',  'HIV1_SUBTYPE']
-
-        order_info = [i for i in order_info if i in cols]
-
-        # lists of all mutations by loci
-        mutation_list_cols = [i for i in cols if i.endswith('_list')]
-
-        # individual mutations
-        nrti = ['3TC', 'ABC', 'd4T', 'ddC', 'ddI', 'FTC', 'TFV', 'TAF', 'ZDV']
-        nnrti = ['DOR', 'DLV', 'EFV', 'ETR', 'NVP', 'RPV']
-        insti = ['BIC', 'CAB', 'DTG', 'EVG', 'RAL']
-        pi = ['AMP', 'AMPr', 'ATV', 'ATVr', 'DRV', 'DRVr', 'IDV', 'IDVr',
-              'LPV', 'LPVr', 'NFV', 'NFVr', 'RTV', 'RTVr', 'SQV', 'SQVr',
-              'TPV', 'TPVr']
-        fusion = ['ENF']
-
-        nrti_cols = [i for i in nrti if i in cols]
-        nnrti_cols = [i for i in nnrti if i in cols]
-        insti_cols = [i for i in insti if i in cols]
-        pi_cols = [i for i in pi if i in cols]
-        fusion_cols = [i for i in fusion if i in cols]
-
-        # create re-ordered list of columns
-        cols_reordered = order_info + mutation_list_cols + nrti_cols + nnrti_cols + pi_cols + insti_cols + fusion_cols
-        not_listed_error = [i for i in cols if i not in cols_reordered]
-
-        # apply it
-        df = df[cols_reordered + not_listed_error]
-
-        return df
+# File name prefixes of the Stanford files of each locus
+#   (see load_hivdb_scores and load_hivdb_comments)
+hivdb_loci_prefixes = {'RT': ['nrti', 'nnrti'],
+                       'PR': ['pi'],
+                       'INSTI': ['insti']}
 
-    # Future Warning: Setting an item of incompatible dtype is deprecated
-    # This appears to be a bug in pandas 2.1.1
-    # See https://github.com/pandas-dev/pandas/issues/55025
-    warnings.simplefilter(action='ignore', category=FutureWarning)
 
-    allowable_test_types = ['GENESEQ', 'GENOSURE-MG', 'GENOSURE-PRIME',
-                            'GENOSURE-ARCHIVE', 'PHENOSENSE-GT']
-    if test_type.upper() not in allowable_test_types:
-        raise ValueError(f'Invalid test type ({allowable_test_types})')
+def _missing_hivdb_files(path_to_hivdb, loci) -> list:
+    """
+    Patterns of the Stanford files of {loci} not found in the directory.
+    """
+    from pathlib import Path
 
-    # Extract PDF reports from Zip files
-    report_paths = extract_from_zips(path_to_zips)
+    hivdb = Path(path_to_hivdb)
+    patterns = [f'{prefix}-{file_type}*'
+                for prefix in hivdb_loci_prefixes[loci]
+                for file_type in ['scores-simple', 'scores-complex',
+                                  'comments']]
 
-    # Empty dataframe (to fill)
-    # Many single-row insertions
-    df = pd.DataFrame()
+    return [pattern for pattern in patterns if not any(hivdb.glob(pattern))]
 
-    # Loop over PDF's
-    for i in track(range(0, len(report_paths)), label='Records'):
 
-        # Parse PDF to text
-        sample_text = scrape_PDF_to_text(report_paths[i])
+def compile_hivdb_ruleset(path_to_hivdb) -> dict:
+    """
+    Loads everything needed to score mutations from an HIVdb directory.
 
-        # Extract order info
-        order_info_dict = _extract_order_info_as_dict(sample_text=sample_text)
+    A locus missing any of its files is left out of the ruleset (with a
+    warning naming the files); FileNotFoundError if every locus is.
 
-        # Insert order info into dataframe
-        df.loc[i, 'TEST_TYPE'] = test_type.upper()
-        df.loc[i, 'DOC_NAME'] = report_paths[i].name
+    Returns
+    -------
+    ruleset : dict
+        {'VERSION': RULESET_VERSION,
+         'SOURCE_HASHES': {file name: SHA-256},
+         'RT': {'SIMPLE': scores,               (see load_hivdb_scores)
+                'SCORE_TENSOR': ScoreTensor,    (see compile_score_tensor)
+                'COMPLEX': complex rules,       (see load_hivdb_scores)
+                'COMPLEX_TOKENS': rule tokens,  (see tokenize_complex_rules)
+                'COMMENTS': comments},          (one row per amino acid)
+         'PR': {...}, 'INSTI': {...}}
+    """
+    import warnings
 
-        for attribute, value in order_info_dict.items():
-            df.loc[i, attribute] = value
+    ruleset = {'VERSION': RULESET_VERSION,
+               'SOURCE_HASHES': _hivdb_source_hashes(path_to_hivdb)}
 
-        # If report is not marked "incomplete"
-        #   gather oberserved mutations
-        report_complete = _mark_report_as_complete(sample_text=sample_text)
-        df.loc[i, 'REPORT_COMPLETE'] = report_complete
+    for loci in hivdb_loci_prefixes:
+        missing = _missing_hivdb_files(path_to_hivdb, loci)
+        if missing:
+            warnings.warn(f'{loci} left out of the HIVdb ruleset; no files '
+                          f'matching {", ".join(missing)} in {path_to_hivdb}')
+            continue
 
-        if report_complete:
-            # Phenosense-GT tests do *not* have mutations listed at the
-            #   drug-level (only lists at the loci-level)
-            if test_type.upper() not in ['PHENOSENSE-GT']:
-                arv_resistance_dict = _extract_drms_as_dict(
-                    sample_text=sample_text)
+        simple_scores = load_hivdb_scores(path_to_hivdb, loci, 'simple')
+        complex_rules = load_hivdb_scores(path_to_hivdb, loci, 'complex')
+        comments = load_hivdb_comments(path_to_hivdb, loci)
 
-                # Insert observed mutations into dataframe
-                for arv, resistance_result in arv_resistance_dict.items():
-                    df.loc[i, arv] = resistance_result
+        ruleset[loci] = {
+            'SIMPLE': simple_scores,
+            'SCORE_TENSOR': compile_score_tensor(simple_scores),
+            'COMPLEX': complex_rules,
+            'COMPLEX_TOKENS': tokenize_complex_rules(complex_rules),
+            'COMMENTS': replicate_comments_over_amino_acids(comments)}
 
-            # Loci-specific lists of mutations
-            mutations_list_dict = _extract_full_mutation_lists_as_dict(
-                sample_text=sample_text, test_type=test_type)
+    if not any(loci in ruleset for loci in hivdb_loci_prefixes):
+        raise FileNotFoundError(f'No HIVdb score or comment files in '
+                                f'{path_to_hivdb}')
 
-            # Insert observed mutations into dataframe
-            for loci, mutations_list in mutations_list_dict.items():
-                df.loc[i, loci] = mutations_list
+    return ruleset
 
-        # Reorder columns (aesthetic)
-        df = _reorder_dataframe_columns(df=df)
 
-    # Re-sort by patient
-    df.sort_values(['PAT_MRN_ID', 'ACCESSION'], inplace=True)
-    df.reset_index(drop=True, inplace=True)
+def load_hivdb_ruleset(path_to_hivdb, ruleset_path=None) -> dict:
+    """
+    Returns the compiled ruleset of an HIVdb directory
+    (see compile_hivdb_ruleset).
+
+    The ruleset is saved (pickled) to {ruleset_path} -- by default,
+    hivdb-ruleset.pkl within {path_to_hivdb} -- and is recompiled only
+    if the Stanford files have changed (by SHA-256) or RULESET_VERSION
+    has been bumped since it was saved, or if the saved ruleset cannot be
+    read (e.g., it was pickled by another version of pandas); a warning
+    gives the reason it is recompiled.
+
+    # ruleset = load_hivdb_ruleset(path_to_hivdb)
+    # scored = score_positioned_mutations(
+    #     position_df, ruleset['RT']['SCORE_TENSOR'])
+    # totals = calculate_total_resistance(
+    #     scored, ruleset['RT']['COMPLEX'], ruleset['RT']['COMPLEX_TOKENS'])
+    """
+    from pathlib import Path
+    import warnings
+    import pickle
+    import os
 
-    # Set '' (artefact of regular expression) to missing
-    for col in [i for i in df.columns if df[i].dtype == 'O']:
-        df.loc[df[col] == '', col] = np.NaN
+    if ruleset_path is None:
+        ruleset_path = Path(path_to_hivdb).joinpath('hivdb-ruleset.pkl')
+    ruleset_path = Path(ruleset_path)
 
-    # Dates
-    for date_col in ['BIRTH_DATE', 'COLLECTED_DATE',
-                     'RECEIVED_DATE', 'REPORTED_DATE']:
-        df[date_col] = pd.to_datetime(df[date_col], format='mixed')
+    source_hashes = _hivdb_source_hashes(path_to_hivdb)
 
-    # MRN can be up to 8 characters (if not starting with '0')
-    #   ... but if < 7 it is zero-padded to 7 characters
-    # Will need to perform manual chart review for missing MRNs
-    mrn_length = df['PAT_MRN_ID'].str.len()
-    leading_zero = df['PAT_MRN_ID'].str.startswith('0')
+    if ruleset_path.exists():
+        try:
+            with open(ruleset_path, 'rb') as f:
+                ruleset = pickle.load(f)
 
-    df.loc[(mrn_length > 8) & (leading_zero), 
-           'MRN_OUTDATED'] = df['PAT_MRN_ID'].str.slice(1, )
-    df.loc[(mrn_length > 8), 'PAT_MRN_ID'] = np.NaN
+            if (ruleset['VERSION'] == RULESET_VERSION and
+                    ruleset['SOURCE_HASHES'] == source_hashes):
+                return ruleset
 
-    df.loc[(mrn_length == 8) & (leading_zero),
-           'PAT_MRN_ID'] = df['PAT_MRN_ID'].str.slice(1, )
-    df.loc[(mrn_length == 8), 'MRN_OUTDATED'] = 1
+            warnings.warn(f'Recompiling {ruleset_path}; saved for other '
+                          'HIVdb files or another RULESET_VERSION')
 
-    df.loc[mrn_length < 7, 'PAT_MRN_ID'] = df['PAT_MRN_ID'].str.zfill(7)
+        # Unreadable (e.g., truncated, or saved by another version of
+        #   pandas whose classes have since moved)
+        except (pickle.UnpicklingError, EOFError, OSError, AttributeError,
+                ImportError, KeyError, TypeError) as exception:
+            warnings.warn(f'Recompiling {ruleset_path}; could not be read '
+                          f'({type(exception).__name__}: {exception})')
 
-    # Manual fix (no info on PDF)
-    df.loc[df['DOC_NAME'] == '96063822_18-184109-1GN-0_F.PDF',
-           'ACCESSION'] = '18-184109'
+    ruleset = compile_hivdb_ruleset(path_to_hivdb)
 
-    print(f"{i+1} {test_type} records parsed")
+    # Write-then-rename so that a concurrent run never reads a partial file
+    ruleset_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = ruleset_path.with_name(
+        f'{ruleset_path.name}.{os.getpid()}.tmp')
+    with open(temp_path, 'wb') as f:
+        pickle.dump(ruleset, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, ruleset_path)
 
-    return df
+    return ruleset
 
 
-def melt_loci_specific_mutations_to_position(mutations_df, loci):
+# Monogram's canned phrases for reports on which testing failed
+failure_phrases = ['common causes of assay failure',
+                   'unable to perform testing',
+                   'quantity not sufficient',
+                   'inadequate specimen volume',
+                   'low sample volume',
+                   'is not ready to report',
+                   'canceled per client',
+                   'insufficient HIV-infected cells',
+                   'duplicate order',
+                   'could not be obtained',
+                   'could not be completed',
+                   'this sample should not be used',
+                   'inappropriately collected',
+                   'resubmit a new specimen',
+                   'resubmit a new sample',
+                   'unsuccessful testing of this sample'
+                   ]
+
+
+@lru_cache(maxsize=None)
+def _compile_failure_phrases(phrases: tuple):
+    import re
+
+    # One alternation scans the text once for all phrases
+    #   (rather than once per phrase)
+    return re.compile('|'.join(re.escape(phrase) for phrase in phrases),
+                      flags=re.IGNORECASE)
+
+
+def find_failure_phrase(sample_text: str) -> tuple:
+    """
+    Finds the first (left-most) of Monogram's failure phrases
+    in a single pass over the report text.
+
+    Parameters
+    ----------
+    sample_text : str
+        Text from parsed PDF report
+
+    Returns
+    ----------
+    (phrase, position) : tuple
+        The phrase (as listed in failure_phrases) and its offset in the
+        text; (None, None) if the report contains none of the phrases
+    """
+    from src.utils import failure_phrases
+
+    failure = _compile_failure_phrases(tuple(failure_phrases))\
+        .search(sample_text)
+
+    if not failure:
+        return (None, None)
+
+    # Recover the listed phrase from the (case-insensitive) match
+    matched = failure.group(0).lower()
+    phrase = next(phrase for phrase in failure_phrases
+                  if phrase.lower() == matched)
+
+    return (phrase, failure.start())
+
+
+def _mark_report_as_complete(sample_text):
+    """
+    Shared by the genotypic and phenotypic parsers; a report is
+    "incomplete" if it contains any of Monogram's canned failure phrases.
+    """
+    phrase, _ = find_failure_phrase(sample_text)
+
+    return phrase is None
+
+
+@lru_cache(maxsize=None)
+def _compile_section_anchors():
+    import re
+
+    return re.compile('(?P<REFERENCE>Reference Lab ID)'
+                      '|(?P<GENERIC>Generic)'
+                      '|(?P<LIST> (?:RT|PR|PI|IN)[:\s])'
+                      '|(?P<PATIENT_SPECIFIC>Patient-specific)'
+                      '|(?P<IC50>IC50)'
+                      '|(?P<CAPACITY>Capacity)'
+                      '|(?P<ALGORITHM>proprietary algorithm \(version)')
+
+
+def _find_section_anchors(sample_text: str) -> dict:
+    """
+    Offsets of every section anchor in the text, by anchor name
+    (see _compile_section_anchors); FIRST_LIST holds the LIST anchors
+    that begin a loci-specific mutation list.
+    """
+    import re
+
+    anchors = {'REFERENCE': [], 'GENERIC': [], 'LIST': [], 'FIRST_LIST': [],
+               'PATIENT_SPECIFIC': [], 'IC50': [], 'CAPACITY': [],
+               'ALGORITHM': []}
+
+    for anchor in _compile_section_anchors().finditer(sample_text):
+        anchors[anchor.lastgroup].append(anchor.start())
+
+        # Loci lists begin with a mutation (e.g., M184V, E/^) or 'None';
+        #   distinguishes them from drug-class labels in the drug table
+        if anchor.lastgroup == 'LIST' and re.match(
+                '[ ]?(?:None|[A-Z][\d/])',
+                sample_text[anchor.end():anchor.end() + 6]):
+            anchors['FIRST_LIST'].append(anchor.start())
+
+    return anchors
+
+
+def index_report_sections(sample_text: str) -> dict:
+    """
+    Locates the sections of a report in a single pass over its text
+    so that each extractor searches only its own section.
+
+    Sections start at the first occurrence of the text that their
+    extractors' patterns begin with (or look behind for); a section whose
+    anchor is not found spans the whole report.
+
+    Sections end at the end of the report but for HEADER, which ends with
+    the 'Generic' column header that follows the last header field. The
+    drug table is followed by the mutation lists of genotypic reports, but
+    DRUG_TABLE runs on to the end of the report regardless, as the DRM,
+    fold change and (Phenosense-Entry) IC50 patterns searched the whole
+    report before sections were indexed.
+
+    Parameters
+    ----------
+    sample_text : str
+        Text from parsed PDF report
+
+    Returns
+    ----------
+    sections : dict
+        {'HEADER': (start, end), 'DRUG_TABLE': (start, end),
+         'MUTATION_LISTS': (start, end), 'IC50': (start, end),
+         'REPLICATION': (start, end)}
+    """
+    report_end = len(sample_text)
+
+    anchors = _find_section_anchors(sample_text)
+
+    def _first(anchor_name, after=0):
+        return next((i for i in anchors[anchor_name] if i >= after), None)
+
+    # ORDER INFO
+    # ----------
+    # Header fields always occur in the same order, ending with the
+    #   Reference Lab ID and the HIV-1 subtype (looks ahead to 'Generic')
+    reference = _first('REFERENCE')
+    generic = _first('GENERIC', after=reference or 0)
+
+    if generic is not None:
+        header = (0, generic + len('Generic'))
+    else:
+        header = (0, report_end)
+
+    # DRUG TABLE
+    # ----------
+    # From the table's 'Generic' column header
+    if generic is not None:
+        drug_table = (generic, report_end)
+    else:
+        drug_table = (0, report_end)
+
+    # MUTATION LISTS
+    # --------------
+    # The lists end at the first capitalized word; search to the end
+    if anchors['LIST']:
+        mutation_lists = (anchors['LIST'][0], report_end)
+    else:
+        mutation_lists = (0, report_end)
+
+    # IC50
+    # ----
+    ic50_anchors = anchors['PATIENT_SPECIFIC'][:1] + anchors['IC50'][:1]
+    if ic50_anchors:
+        ic50 = (min(ic50_anchors), report_end)
+    else:
+        ic50 = (0, report_end)
+
+    # REPLICATION CAPACITY
+    # --------------------
+    if anchors['CAPACITY']:
+        replication = (anchors['CAPACITY'][0], report_end)
+    else:
+        replication = (0, report_end)
+
+    return {'HEADER': header,
+            'DRUG_TABLE': drug_table,
+            'MUTATION_LISTS': mutation_lists,
+            'IC50': ic50,
+            'REPLICATION': replication}
+
+
+def _section_text(sample_text: str, sections: dict, section: str) -> str:
+    if sections is None:
+        sections = index_report_sections(sample_text)
+
+    start, end = sections[section]
+
+    return sample_text[start:end]
+
+
+def _extract_order_info_as_dict(sample_text: str,
+                                genotypic: bool = True,
+                                sections: dict = None) -> dict:
+    """
+    Extract order info from text of parsed PDF report.
+    The data elements always follow the same ordering though
+    some may be missing.
+
+    Parameters
+    ----------
+    sample_text : str
+        Text from parsed PDF report
+
+    genotypic : bool
+        Also extract HIV-1 subtype and algorithm version
+        (reported on genotypic tests only)
+
+    sections : dict
+        Output of index_report_sections (computed if not given)
+
+    Returns
+    ----------
+    order_info_dict : dict
+    """
+    import re
+    import numpy as np
+
+    # Algorithm version is a canned-comment (not part of the header)
+    report_text = sample_text
+    sample_text = _section_text(report_text, sections, 'HEADER')
+
+    # Get phrasing used for MRN
+    if re.search('Medical Record #', sample_text):
+        mrn_prefix = 'Medical Record #'
+    else:
+        mrn_prefix = 'Patient ID'
+
+    # Get phrasing used for Lab Order ID
+    if re.search("ID/Order #", sample_text):
+        prov_suffix = 'Reference Lab ID/Order #'
+    else:
+        prov_suffix = 'Reference Lab ID'
+
+    full_name = re.search(
+        'Patient Name[:\s]*([A-Za-z -/.]*?)(?=DOB)', sample_text)
+    birth_date = re.search(
+        'DOB[:\s]*([A-Za-z0-9-/]*?)[ ]*(?=Patient ID)', sample_text)
+    mrn = re.search(
+        f'{mrn_prefix}[:\s]*([\d]*?)[ \D]*(?=Gender)', sample_text)
+
+    # occassionally Monogram placed the SSN in place of the PAT_MRN_ID
+    ssn = re.search(
+        f'{mrn_prefix}[:\s]*(\d\d\d-\d\d-\d\d\d\d)[ \D]*(?=Gender)',
+        sample_text)
+    if ssn:
+        mrn = None
+
+    gender = re.search(
+        'Gender[:\s]*([A-Za-z]*?)[ ]*(?=Monogram)', sample_text)
+    test_accession = re.search(
+        'Accession[:\s#]*([A-Za-z0-9-/_]*?)[ ]*(?=Date)', sample_text)
+    # Dates follow the format:  17-MAY-2016 11:20 PT
+    collection_date = re.search(
+        'Date Collected[:\s]*([A-Za-z0-9-/]*?)[ ][0-9][0-9]:', sample_text)
+    received_date = re.search(
+        'Date Received[:\s]*([A-Za-z0-9-/]*?)[ ][0-9][0-9]:', sample_text)
+    reported_date = re.search(
+        'Date Reported[:\s]*([A-Za-z0-9-/]*?)[ ][0-9][0-9]:', sample_text)
+    # Mode in [F, M, W]
+    test_mode = re.search(
+        'Mode[:\s]*([A-Z,]*?)[ ]*(?=Report)', sample_text)
+    report_status = re.search(
+        'Report Status[:\s]*([A-Z]*?)[ ]*(?=Referring)', sample_text)
+    # Referring Physician
+    referring_prov = re.search(
+        f'Referring Physician[:\s]*([A-Za-z\s\d,]*?)(?={prov_suffix})',
+        sample_text)
+    # keep only first two names (do not keep address, if present)
+    if referring_prov:
+        referring_prov = re.search(
+            '([A-Za-z]*[ ][A-Za-z]*)', referring_prov.group(1))
+    # Order ID should not contain letters
+    # ... in the early days the hospital floor was substituted
+    order_id = re.search(
+        f'{prov_suffix}[:\s]*([0-9]*?)[ _A-Z-:]', sample_text)
+
+    val_list = [full_name, birth_date, mrn, ssn, gender, test_accession,
+                collection_date, received_date, reported_date, test_mode,
+                report_status, referring_prov, order_id]
+
+    col_names = ['FULL_NAME', 'BIRTH_DATE', 'PAT_MRN_ID', 'SSN', 'GENDER',
+                 'ACCESSION', 'COLLECTED_DATE', 'RECEIVED_DATE',
+                 'REPORTED_DATE', 'MODE', 'REPORT_STATUS',
+                 'REFERRING_PROV', 'ORDER_ID']
+
+    if genotypic:
+        # HIV-1 subtype should be present unless viral load is < 500 copies/mL
+        #   or the specimen fails to meet collection specifications
+        hiv1_subtype = re.search(
+            '1[ -]?Sub[-]?type:[ ]+([A-Za-z\d\s]*?)[ ]*(?=Generic)',
+            sample_text)
+        # Algorithm version is a canned-comment
+        #   posted regardless of whether testing was performed
+        #   (not used by Phenosense-GT)
+        algorithm = re.search(
+            'proprietary algorithm \(version[ #]([0-9]*)\)', report_text)
+
+        val_list += [hiv1_subtype, algorithm]
+        col_names += ['HIV1_SUBTYPE', 'ALGORITHM_VERSION']
+
+    row_values = [v.group(1).strip()
+                  .title() if v else np.NaN for v in val_list]
+
+    order_info_dict = dict(zip(col_names, row_values))
+
+    return order_info_dict
+
+
+def _arv_master_fingerprint() -> tuple:
+    from src.utils import arv_master_dict
+
+    # Hashable snapshot of arv_master_dict; any addition or edit to the
+    #   dictionary yields a new fingerprint (and so a new pattern registry)
+    return tuple((art_class, tuple(art_list))
+                 for art_class, art_list in arv_master_dict.items())
+
+
+def arv_pattern_registry(test_type: str) -> dict:
+    """
+    Returns the drug-specific regular expressions for {test_type},
+    compiled once and reused for every report.
+
+    The registry is keyed on the contents of arv_master_dict so that
+    it is rebuilt automatically if the dictionary is extended.
+
+    Parameters
+    ----------
+    test_type : str
+
+    Returns
+    ----------
+    registry : dict
+        {'DRMS': [(art_attributes, unboosted, boosted), ...],
+         'FOLD_CHANGE': [(art_attributes, unboosted, boosted), ...]}
+
+        Patterns are in arv_master_dict order; boosted is None
+        where the brand name is the generic name (DRMS only)
+    """
+    return _compile_arv_patterns(test_type.upper(), _arv_master_fingerprint())
+
+
+@lru_cache(maxsize=None)
+def _compile_arv_patterns(test_type: str, fingerprint: tuple) -> dict:
+    import re
+
+    drm_patterns = []
+    fold_change_patterns = []
+
+    for art_class, art_list in fingerprint:
+        # {'NRTI': [('Ziagen', 'Abacavir', 'ABC', '1998-12-17'), ...],
+        #  'NNRTI': [('Pifeltro', 'Doravirine', 'DOR', '2018-08-30'), ...], ...}
+        for attr in art_list:
+
+            ###########################
+            # Drug resistance mutations
+            ###########################
+            # If brand name == generic name
+            # e.g., Bictegravir BictegravirL74I  BIC
+            if attr[0] == attr[1]:
+                unboosted = re.compile(
+                    f'{attr[0]}[ ]+{attr[1]}[ ]*([A-Za-z\d\s,/]+)[ ]+?(?={attr[2]})')
+                boosted = None
+
+            # All others (brand name != generic name)
+            # e.g., Dolutegravir TivicayL74I  DTG
+            else:
+                unboosted = re.compile(
+                    f'{attr[0]}[ ]*([A-Za-z\d\s,/]+)[ ]+?(?={attr[2]})')
+                # Boosted ARVs include '/r' after brand name (and abbreviation)
+                boosted = re.compile(
+                    f'{attr[0]}[ ]*\/[ ]r[ ]*([A-Za-z\d\s,/]+)[ ]+?(?={attr[2]})')
+
+            drm_patterns.append((attr, unboosted, boosted))
+
+            #############
+            # Fold change
+            #############
+            # Switch for Phenosense-GT tests (different ending)
+            if test_type == 'PHENOSENSE-GT':
+                suffix = '[ YN]+?'
+            else:
+                suffix = f'[ ]*?(?={attr[2]})'
+
+            # Capture groups
+            g1 = '([\d.\s-]+)'
+            g2 = '([\d.>MAX]+?)'
+
+            # Unboosted ARVs
+            unboosted = re.compile(
+                f'{attr[1]}[ ]+{attr[0]}[ ]*\({g1}\)[ ]*?{g2}{suffix}')
+            # Boosted ARVs include '/r' after brand name
+            boosted = re.compile(
+                f'{attr[0]}[ ]*\/[ ]r[ ]*\({g1}\)[ ]*?{g2}{suffix}')
+
+            fold_change_patterns.append((attr, unboosted, boosted))
+
+    return {'DRMS': drm_patterns, 'FOLD_CHANGE': fold_change_patterns}
+
+
+def _extract_drms_as_dict(sample_text: str, sections: dict = None) -> dict:
+    import numpy as np
+
+    #arv_resistance_dict = {}
+    #for art_class, art_list in arv_master_dict.items():
+    #    for art_attributes in art_list:
+    #        resistance = re.search(
+    #            f'{art_attributes[0]}[ ]+([A-Za-z\d\s,]+)[ ]+(?={art_attributes[2]})', sample_text)
+    #        if resistance:
+    #            arv_resistance_dict[art_attributes[2]] = resistance.group(1).strip()
+
+    #        resistance_boosted = re.search(
+    #            f'{art_attributes[0]}[ ]\/[ ]r[ ]+([A-Za-z\d\s,]+)[ ]+(?={art_attributes[2]})', sample_text)
+    #        if resistance_boosted:
+    #            arv_resistance_dict[f'{art_attributes[2]}_r'] = resistance_boosted.group(1).strip()
+
+    # Because the unboosted regex must include the '/' in order to capture
+    #   mixtures (e.g., Q58Q/E), there is no way to exclude the '/ r'
+    #   characters from the match.
+    # If these characters are found, set the entire match to NULL
+    #   and allow the next 'boosted' search to capture the mutations
+    boosted_report = '/ r' in sample_text
+
+    # Search only the drug table
+    sample_text = _section_text(sample_text, sections, 'DRUG_TABLE')
+
+    # Drug-resistance patterns do not vary by genotypic test type
+    drm_patterns = arv_pattern_registry('GENESEQ')['DRMS']
+
+    arv_resistance_dict = {}
+    for art_attributes, unboosted, boosted in drm_patterns:
+        resistance = unboosted.search(sample_text)
+
+        # If brand name == generic name
+        # e.g., Bictegravir BictegravirL74I  BIC
+        if boosted is None:
+            if resistance:
+                arv_resistance_dict[art_attributes[2]] = resistance.group(1).strip()
+
+        # All others (brand name != generic name)
+        # e.g., Dolutegravir TivicayL74I  DTG
+        else:
+            if resistance:
+                if boosted_report:
+                    arv_resistance_dict[art_attributes[2]] = np.NaN
+                else:
+                    arv_resistance_dict[art_attributes[2]] = resistance.group(1).strip()
+
+            # Boosted ARVs include '/r' after brand name (and abbreviation)
+            resistance_boosted = boosted.search(sample_text)
+            if resistance_boosted:
+                arv_resistance_dict[f'{art_attributes[2]}_r'] = resistance_boosted.group(1).strip()
+
+    return arv_resistance_dict
+
+
+def _extract_full_mutation_lists_as_dict(sample_text: str,
+                                         test_type: str,
+                                         sections: dict = None) -> dict:
+    import re
+
+    # Search only from the first of the loci-specific lists onward
+    sample_text = _section_text(sample_text, sections, 'MUTATION_LISTS')
+
+    # To avoid writing an entirely separate function solely for parsing
+    #   Phenosense-GT tests the following switch is used.
+    #   The only difference between parsing the mutation list for
+    #   Phenosense-GT tests vs.
+    #   [Geneseq, Genosure-MG, Genosure-PRiME, Genosure-Archive]
+    #   is the use of a colon (:) rather than a space (\s).
+    if test_type.upper() in ['PHENOSENSE-GT']:
+        q = ':'
+    else:
+        q = '\s'
+
+    # regex for convenience
+    alphanum_list = '[A-Z0-9,/ \^]*?'
+
+    # REVERSE TRANSCRIPTASE
+    # ---------------------
+    # Must account for the integrase loci section in (prime, archive)
+    if re.search(f' RT{q}[ ]?None', sample_text):
+        rt_list = 'None'
+
+    else:
+        rt_list = None
+        for behind in [f'(?<= RT{q})']:
+            for ahead in [f'(?= PR{q})', f'(?= PI{q})',
+                          f'(?= IN{q})', '[ ]+[A-Z][a-z][a-z]']:
+                if not rt_list:
+                    try:
+                        rt_list = re.search(
+                            f'{behind}({alphanum_list}){ahead}',
+                            sample_text)
+                        rt_list = rt_list.group(1).strip().replace(':', '')
+                    except AttributeError:
+                        pass
+
+    # INTEGRASE
+    # ---------
+    # Integrase section is only present for archive/prime tests
+    # Occurs just prior to the list of protease mutations
+    if re.search(f' IN{q}[ ]?None', sample_text):
+        insti_list = 'None'
+
+    else:
+        insti_list = None
+        for behind in [f'(?<= IN{q})']:
+            for ahead in [f'(?= PR{q})', f'(?= PI{q})',
+                          '[ ]+[A-Z][a-z][a-z]']:
+                if not insti_list:
+                    try:
+                        insti_list = re.search(
+                            f'{behind}({alphanum_list}){ahead}',
+                            sample_text)
+                        insti_list = insti_list.group(1).strip()\
+                                               .replace(':', '')
+                    except AttributeError:
+                        pass
+
+    # PROTEASE
+    # ---------
+    # Same for all test-types
+    if re.search(f' PR{q}[ ]?None', sample_text):
+        pr_list = 'None'
+
+    else:
+        pr_list = None
+        for behind in [f'(?<= PR{q})', f'(?<= PI{q})']:
+            for ahead in [f'(?= IN{q})', '[ ]+[A-Z][a-z][a-z]']:
+                if not pr_list:
+                    try:
+                        pr_list = re.search(
+                            f'{behind}({alphanum_list}){ahead}',
+                            sample_text)
+                        pr_list = pr_list.group(1).strip().replace(':', '')
+                    except AttributeError:
+                        pass
+
+    mutations_dict = {}
+    mutations_dict['RT_LIST'] = rt_list
+    mutations_dict['INSTI_LIST'] = insti_list
+    mutations_dict['PR_LIST'] = pr_list
+
+    return mutations_dict
+
+
+def _reorder_genotypic_columns(df):
+    # get list
+    cols = df.columns.to_list()
+
+    # order info
+    order_info = ['DOC_NAME', 'TEST_TYPE',
+                  'REPORT_COMPLETE', 'FAILURE_PHRASE',
+                  'FULL_NAME', 'PAT_MRN_ID', 'SSN',
+                  'BIRTH_DATE', 'GENDER', 'ACCESSION', 'ORDER_ID',
+                  'REFERRING_PROV', 'COLLECTED_DATE', 'RECEIVED_DATE',
+                  'REPORTED_DATE', 'REPORT_STATUS', 'MODE',
+                  'ALGORITHM_VERSION',  'HIV1_SUBTYPE']
+
+    order_info = [i for i in order_info if i in cols]
+
+    # lists of all mutations by loci
+    mutation_list_cols = [i for i in cols if i.endswith('_list')]
+
+    # individual mutations
+    nrti = ['3TC', 'ABC', 'd4T', 'ddC', 'ddI', 'FTC', 'TFV', 'TAF', 'ZDV']
+    nnrti = ['DOR', 'DLV', 'EFV', 'ETR', 'NVP', 'RPV']
+    insti = ['BIC', 'CAB', 'DTG', 'EVG', 'RAL']
+    pi = ['AMP', 'AMPr', 'ATV', 'ATVr', 'DRV', 'DRVr', 'IDV', 'IDVr',
+          'LPV', 'LPVr', 'NFV', 'NFVr', 'RTV', 'RTVr', 'SQV', 'SQVr',
+          'TPV', 'TPVr']
+    fusion = ['ENF']
+
+    nrti_cols = [i for i in nrti if i in cols]
+    nnrti_cols = [i for i in nnrti if i in cols]
+    insti_cols = [i for i in insti if i in cols]
+    pi_cols = [i for i in pi if i in cols]
+    fusion_cols = [i for i in fusion if i in cols]
+
+    # create re-ordered list of columns
+    cols_reordered = order_info + mutation_list_cols + nrti_cols + nnrti_cols + pi_cols + insti_cols + fusion_cols
+    not_listed_error = [i for i in cols if i not in cols_reordered]
+
+    # apply it
+    df = df[cols_reordered + not_listed_error]
+
+    return df
+
+
+def _clean_order_info(df):
+    """
+    Sorts a dataframe of parsed reports by patient and cleans the
+    order info (missing values, dates, MRNs).
+    """
+    import pandas as pd
+    import numpy as np
+
+    # Re-sort by patient
+    df.sort_values(['PAT_MRN_ID', 'ACCESSION'], inplace=True)
+    df.reset_index(drop=True, inplace=True)
+
+    # Set '' (artefact of regular expression) to missing
+    for col in [i for i in df.columns if df[i].dtype == 'O']:
+        df.loc[df[col] == '', col] = np.NaN
+
+    # Dates
+    for date_col in ['BIRTH_DATE', 'COLLECTED_DATE',
+                     'RECEIVED_DATE', 'REPORTED_DATE']:
+        df[date_col] = pd.to_datetime(df[date_col], format='mixed')
+
+    # MRN can be up to 8 characters (if not starting with '0')
+    #   ... but if < 7 it is zero-padded to 7 characters
+    # Will need to perform manual chart review for missing MRNs
+    mrn_length = df['PAT_MRN_ID'].str.len()
+    leading_zero = df['PAT_MRN_ID'].str.startswith('0')
+
+    df.loc[(mrn_length > 8) & (leading_zero),
+           'MRN_OUTDATED'] = df['PAT_MRN_ID'].str.slice(1, )
+    df.loc[(mrn_length > 8), 'PAT_MRN_ID'] = np.NaN
+
+    df.loc[(mrn_length == 8) & (leading_zero),
+           'PAT_MRN_ID'] = df['PAT_MRN_ID'].str.slice(1, )
+    df.loc[(mrn_length == 8), 'MRN_OUTDATED'] = 1
+
+    df.loc[mrn_length < 7, 'PAT_MRN_ID'] = df['PAT_MRN_ID'].str.zfill(7)
+
+    return df
+
+
+def _finalize_genotypic_df(df):
+    # Reorder columns (aesthetic)
+    df = _reorder_genotypic_columns(df=df)
+
+    df = _clean_order_info(df=df)
+
+    # Manual fix (no info on PDF)
+    df.loc[df['DOC_NAME'] == '96063822_18-184109-1GN-0_F.PDF',
+           'ACCESSION'] = '18-184109'
+
+    return df
+
+
+def _finalize_phenotypic_df(df):
+    # Reorder columns (aesthetic)
+    df = _reorder_phenotypic_columns(df=df)
+
+    return _clean_order_info(df=df)
+
+
+def _prefetch_reports(report_paths, queue_depth):
+    """
+    Reads reports into memory in a background thread, at most
+    {queue_depth} reports ahead of the consumer, and yields them as
+    PrefetchedReports (in the same order as {report_paths}).
+
+    Reading (from disk, a network share or a .zip archive) thereby
+    overlaps scraping; once the queue is full the reader waits.
+    """
+    from threading import Thread, Event
+    from queue import Queue, Full
+
+    prefetched = Queue(maxsize=queue_depth)
+    stop = Event()
+    done = object()
+
+    def _put(item):
+        # Give up (rather than block forever) if the consumer has stopped
+        while not stop.is_set():
+            try:
+                prefetched.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def _read():
+        try:
+            for path_to_pdf in report_paths:
+                if hasattr(path_to_pdf, 'read_bytes'):
+                    pdf_bytes = path_to_pdf.read_bytes()
+                else:
+                    with open(path_to_pdf, 'rb') as fh:
+                        pdf_bytes = fh.read()
+
+                if not _put(PrefetchedReport(path_to_pdf.name, pdf_bytes)):
+                    return
+
+            _put(done)
+
+        # Re-raised by the consumer
+        except Exception as exception:
+            _put(exception)
+
+    reader = Thread(target=_read, daemon=True)
+    reader.start()
+
+    try:
+        while True:
+            report = prefetched.get()
+
+            if report is done:
+                break
+            if isinstance(report, Exception):
+                raise report
+
+            yield report
+
+    finally:
+        stop.set()
+        reader.join()
+
+
+def _report_fingerprint(path_to_pdf, by_accession=False):
+    """
+    Hash of a report's bytes and (if {by_accession}) its accession key,
+    'ACCESSION|REPORTED_DATE|REPORT_STATUS' scraped from the first page
+    only (None if the accession cannot be read).
+    """
+    import hashlib
+
+    pdf_bytes = _read_report_bytes(path_to_pdf)
+    content_hash = hashlib.sha256(pdf_bytes).hexdigest()
+
+    accession_key = None
+    if by_accession:
+        # The order info heads the first page
+        first_page = _scrape_PDF_bytes_to_text(pdf_bytes, max_pages=1)
+        order_info = _extract_order_info_as_dict(first_page, genotypic=False)
+
+        if isinstance(order_info['ACCESSION'], str):
+            accession_key = '|'.join(
+                str(order_info[i]) for i in
+                ['ACCESSION', 'REPORTED_DATE', 'REPORT_STATUS'])
+
+    return content_hash, accession_key
+
+
+def deduplicate_reports(report_paths, by_accession=False, workers=1,
+                        earlier=None):
+    """
+    Finds reports delivered more than once (e.g., again in a later .zip
+    under a different name) so that each is parsed only once.
+
+    Reports are duplicates if their bytes are identical or, with
+    by_accession=True, if they share an accession key (the accession,
+    reported date and report status, read from a scrape of the first page
+    only); re-generated PDFs of the same report differ in their bytes.
+
+    Reports are taken in DOC_NAME order (whatever the order of
+    {report_paths}) and the first of each set of duplicates is the one
+    parsed, unless a duplicate was parsed by an earlier run ({earlier}).
+
+    Parameters
+    ----------
+    report_paths : list of PosixPath (or ZippedReport)
+
+    by_accession : bool
+
+    workers : int
+        Number of processes used to hash (and scrape) reports
+
+    earlier : DataFrame
+        PARSED_AS, CONTENT_HASH and ACCESSION_KEY of the reports of earlier
+        (incremental) runs; duplicates of these are not parsed again
+
+    Returns
+    -------
+    (report_paths, duplicates_df) : tuple
+        The reports to parse (in DOC_NAME order), and a map of every
+        DOC_NAME to the DOC_NAME of the report parsed in its place;
+
+        # DOC_NAME          PARSED_AS         MATCH      CONTENT_HASH  ...
+        # -----------------------------------------------------------------
+        # 18-157409_F.PDF   18-157409_F.PDF   NaN        9f2c...       ...
+        # 18-157409_R.PDF   18-157409_F.PDF   CONTENT    9f2c...       ...
+        # 18-157409_X.PDF   18-157409_F.PDF   ACCESSION  41be...       ...
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+    from ipypb import track
+    import pandas as pd
+    import numpy as np
+
+    # The report parsed is the same whatever the order reports were listed
+    #   in (e.g., list(set()) in extract_from_zips)
+    report_paths = sorted(report_paths,
+                          key=lambda report_path: report_path.name)
+
+    fingerprint = partial(_report_fingerprint, by_accession=by_accession)
+
+    if workers is None or workers <= 1:
+        fingerprints = [fingerprint(report_path) for report_path
+                        in track(report_paths, label='Fingerprints')]
+
+    else:
+        chunksize = max(1, len(report_paths) // (workers * 16))
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            fingerprints = list(executor.map(fingerprint, report_paths,
+                                             chunksize=chunksize))
+
+    # First DOC_NAME seen for each hash (and accession key)
+    #   starting from those of earlier runs
+    parsed_as_by_hash = {}
+    parsed_as_by_accession = {}
+
+    if earlier is not None:
+        earlier = earlier.sort_values('DOC_NAME')
+
+        for parsed_as, content_hash, accession_key in zip(
+                earlier['PARSED_AS'], earlier['CONTENT_HASH'],
+                earlier['ACCESSION_KEY']):
+            parsed_as_by_hash.setdefault(content_hash, parsed_as)
+
+            # Missing keys read back (from the manifest) as NaN
+            if isinstance(accession_key, str):
+                parsed_as_by_accession.setdefault(accession_key, parsed_as)
+
+    unique_report_paths = list()
+    rows = list()
+
+    for report_path, (content_hash, accession_key) in zip(report_paths,
+                                                          fingerprints):
+        if content_hash in parsed_as_by_hash:
+            parsed_as, match = parsed_as_by_hash[content_hash], 'CONTENT'
+
+        elif accession_key in parsed_as_by_accession:
+            parsed_as, match = \
+                parsed_as_by_accession[accession_key], 'ACCESSION'
+
+        else:
+            parsed_as, match = report_path.name, np.NaN
+            unique_report_paths.append(report_path)
+
+            if accession_key is not None:
+                parsed_as_by_accession[accession_key] = parsed_as
+
+        parsed_as_by_hash.setdefault(content_hash, parsed_as)
+        rows.append((report_path.name, parsed_as, match, content_hash,
+                     accession_key))
+
+    duplicates_df = pd.DataFrame(rows, columns=['DOC_NAME', 'PARSED_AS',
+                                                'MATCH', 'CONTENT_HASH',
+                                                'ACCESSION_KEY'])
+
+    return unique_report_paths, duplicates_df
+
+
+def _deduplicate_report_paths(report_paths, dedupe, workers=1,
+                              manifest=None):
+    """
+    Applies the {dedupe} option of the parsers (False, True or
+    'accession').
+
+    The {manifest} of an incremental run supplies the reports of earlier
+    runs and is returned with the PARSED_AS, CONTENT_HASH and ACCESSION_KEY
+    of the reports selected by this run (for the runs that follow).
+
+    Returns
+    -------
+    (report_paths, duplicates, manifest) : tuple
+        The reports to parse, and the duplicate map as records
+        (empty unless deduplicating)
+    """
+    if dedupe not in [False, True, 'accession']:
+        raise ValueError("Invalid dedupe ([False, True, 'accession'])")
+
+    if not dedupe:
+        return report_paths, list(), manifest
+
+    dedupe_cols = ['PARSED_AS', 'CONTENT_HASH', 'ACCESSION_KEY']
+
+    earlier = None
+    if manifest is not None:
+        # Manifests of runs without dedupe lack the columns
+        manifest = manifest.reindex(
+            columns=list(manifest.columns) +
+            [col for col in dedupe_cols if col not in manifest.columns])
+
+        selected = manifest['DOC_NAME'].isin(
+            [report_path.name for report_path in report_paths])
+        earlier = manifest[~selected & manifest['CONTENT_HASH'].notna()]
+
+    unique_report_paths, duplicates_df = deduplicate_reports(
+        report_paths, by_accession=dedupe == 'accession', workers=workers,
+        earlier=earlier)
+
+    print(f"{len(report_paths) - len(unique_report_paths)} duplicate "
+          "reports not parsed")
+
+    if manifest is not None:
+        duplicates_by_name = duplicates_df.set_index('DOC_NAME')
+        for col in dedupe_cols:
+            manifest.loc[selected, col] = manifest.loc[selected, 'DOC_NAME']\
+                .map(duplicates_by_name[col])
+
+    return unique_report_paths, duplicates_df.to_dict('records'), manifest
+
+
+def _duplicate_names(duplicates):
+    # Any rows that duplicates have from earlier runs are dropped
+    return [duplicate['DOC_NAME'] for duplicate in duplicates
+            if duplicate['DOC_NAME'] != duplicate['PARSED_AS']]
+
+
+def _isolated_worker_loop(conn, parse_report):
+    import traceback
+
+    while True:
+        task = conn.recv()
+
+        # Sentinel (shut down)
+        if task is None:
+            break
+
+        path_to_pdf, test_type = task
+
+        try:
+            conn.send(('OK', parse_report(path_to_pdf, test_type)))
+
+        except Exception as exception:
+            conn.send(('FAILED', (f'{type(exception).__name__}: {exception}',
+                                  traceback.format_exc())))
+
+
+class _RecyclableWorker:
+    """
+    A worker process that parses one report at a time and, should a
+    report hang, is killed and replaced (recycled) without disturbing
+    the other workers.
+    """
+
+    def __init__(self, parse_report):
+        self.parse_report = parse_report
+        self._start()
+
+    def _start(self):
+        import multiprocessing as mp
+
+        self.conn, worker_conn = mp.Pipe()
+        self.process = mp.Process(target=_isolated_worker_loop,
+                                  args=(worker_conn, self.parse_report),
+                                  daemon=True)
+        self.process.start()
+        worker_conn.close()
+
+    def recycle(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+        self._start()
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+        self.conn.close()
+
+
+def _map_reports_isolated(parse_report, reports, test_type, workers=1,
+                          timeout=None, quarantine=None):
+    """
+    As _map_reports, but each report is parsed in a recyclable worker
+    process under a wall-clock {timeout} (seconds; None = unlimited).
+
+    A report that raises, hangs past the timeout or kills its worker
+    yields None instead of a result and is recorded in {quarantine}
+    (a list of dicts; DOC_NAME, EXCEPTION, TRACEBACK, SECONDS); the
+    remaining reports are parsed regardless.
+
+    Reports are handed out no more than {workers} ahead of the next result
+    to be yielded, so at most {workers} results are held back to restore
+    the order; a slow report leaves the other workers idle until it is done
+    (or, with a {timeout}, recycled).
+    """
+    from multiprocessing.connection import wait
+    import time
+
+    if quarantine is None:
+        quarantine = list()
+
+    pool = [_RecyclableWorker(parse_report)
+            for _ in range(max(1, workers or 1))]
+
+    reports = enumerate(reports)
+    exhausted = False
+    handed_out = 0
+
+    idle = list(pool)
+    # Worker -> (index, DOC_NAME, start time) of the report it is parsing
+    busy = dict()
+
+    # Results are buffered to be yielded in order (fewer than there are
+    #   workers; see the window below)
+    results = dict()
+    next_index = 0
+
+    def _quarantine(index, doc_name, started, exception, trace=''):
+        quarantine.append({'DOC_NAME': doc_name,
+                           'EXCEPTION': exception,
+                           'TRACEBACK': trace,
+                           'SECONDS': time.monotonic() - started})
+        results[index] = None
+
+    try:
+        while True:
+            # Hand a report to each idle worker, within a window of
+            #   len(pool) reports from the next one to be yielded
+            while (idle and not exhausted and
+                   handed_out < next_index + len(pool)):
+                try:
+                    index, path_to_pdf = next(reports)
+                except StopIteration:
+                    exhausted = True
+                    break
+
+                handed_out += 1
+
+                worker = idle.pop()
+                worker.conn.send((path_to_pdf, test_type))
+                busy[worker] = (index, path_to_pdf.name, time.monotonic())
+
+            while next_index in results:
+                yield results.pop(next_index)
+                next_index += 1
+
+            if not busy:
+                if exhausted:
+                    break
+                continue
+
+            # Wait for a result (or the earliest deadline)
+            if timeout is None:
+                wait_seconds = None
+            else:
+                earliest = min(started for _, _, started in busy.values())
+                wait_seconds = max(0, earliest + timeout - time.monotonic())
+
+            ready = wait([worker.conn for worker in busy],
+                         timeout=wait_seconds)
+
+            for worker in [worker for worker in busy
+                           if worker.conn in ready]:
+                index, doc_name, started = busy.pop(worker)
+
+                try:
+                    status, payload = worker.conn.recv()
+
+                except (EOFError, OSError):
+                    status, payload = 'FAILED', ('Worker exited', '')
+                    worker.recycle()
+
+                if status == 'OK':
+                    results[index] = payload
+                else:
+                    _quarantine(index, doc_name, started, *payload)
+
+                idle.append(worker)
+
+            # Recycle the workers of reports past their deadline
+            if timeout is not None:
+                for worker, (index, doc_name, started) in list(busy.items()):
+                    if time.monotonic() - started >= timeout:
+                        worker.recycle()
+                        del busy[worker]
+                        _quarantine(index, doc_name, started,
+                                    f'TimeoutError: exceeded {timeout} s')
+                        idle.append(worker)
+
+    finally:
+        for worker in pool:
+            worker.close()
+
+
+def _quarantine_table(quarantine):
+    """
+    Quarantined reports as a dataframe (printing a summary).
+
+    # DOC_NAME          EXCEPTION                       TRACEBACK   SECONDS
+    # ---------------------------------------------------------------------
+    # 18-157409_F.PDF   TimeoutError: exceeded 60 s                 60.01
+    # 19-102211_F.PDF   PDFSyntaxError: No /Root object  Traceb...   0.42
+    """
+    import pandas as pd
+
+    quarantine_df = pd.DataFrame(
+        quarantine, columns=['DOC_NAME', 'EXCEPTION', 'TRACEBACK', 'SECONDS'])
+    quarantine_df = quarantine_df.sort_values('DOC_NAME', ignore_index=True)
+
+    if len(quarantine_df) > 0:
+        print(f"{len(quarantine_df)} reports quarantined (not parsed):")
+        for doc_name, exception in zip(quarantine_df['DOC_NAME'],
+                                       quarantine_df['EXCEPTION']):
+            print(f"  - {doc_name}: {exception}")
+
+    return quarantine_df
+
+
+def _checkpoint_options(dedupe=False, page_limit=False, stop=None,
+                        isolate=False, timeout=None) -> dict:
+    """
+    Options of a run kept in the header of its checkpoint; they decide
+    which reports are parsed and what is extracted from them, so a run is
+    resumed only with the options it was started with.
+    """
+    if stop is not None:
+        # (by name; a function need not compare equal once unpickled)
+        stop = '.'.join([getattr(stop, '__module__', ''),
+                         getattr(stop, '__qualname__',
+                                 type(stop).__qualname__)])
+
+    return {'DEDUPE': dedupe,
+            'PAGE_LIMIT': page_limit or stop is not None,
+            'STOP': stop,
+            'ISOLATE': isolate or timeout is not None,
+            'TIMEOUT': timeout}
+
+
+def _read_checkpoint(checkpoint_path, test_type, options=None):
+    """
+    Results saved to a checkpoint by an earlier (interrupted) run.
+
+    A checkpoint is a header (the TEST_TYPE and OPTIONS of the run; see
+    _checkpoint_options) followed by chunks of (DOC_NAME, result) pairs,
+    each pickled in turn; a chunk cut short by the interruption is ignored.
+    A checkpoint of another test type, or of a run with other {options},
+    raises ValueError.
+
+    Returns
+    -------
+    (checkpointed, end) : tuple
+        Dict of results by DOC_NAME, and the offset of the end of the
+        last complete chunk (None if there is no checkpoint)
+    """
+    import pickle
+
+    checkpointed = {}
+
+    if not checkpoint_path.exists():
+        return checkpointed, None
+
+    with open(checkpoint_path, 'rb') as f:
+        try:
+            header = pickle.load(f)
+        except (EOFError, pickle.UnpicklingError):
+            return checkpointed, None
+
+        if header['TEST_TYPE'] != test_type.upper():
+            raise ValueError(f"{checkpoint_path} is a checkpoint of "
+                             f"{header['TEST_TYPE']} (not {test_type}) "
+                             "reports")
+
+        if header.get('OPTIONS') != options:
+            raise ValueError(f"{checkpoint_path} is a checkpoint of a run "
+                             f"with options {header.get('OPTIONS')} (not "
+                             f"{options}); resume with the same options "
+                             "or start over (resume=False)")
+
+        end = f.tell()
+        while True:
+            try:
+                checkpointed.update(pickle.load(f))
+            except (EOFError, pickle.UnpicklingError):
+                break
+            end = f.tell()
+
+    return checkpointed, end
+
+
+def _map_reports_checkpointed(map_reports, report_paths, test_type,
+                              checkpoint_path, checkpoint_every=None,
+                              resume=False, options=None):
+    """
+    Yields map_reports(report_paths) (results in the same order as
+    {report_paths}) while saving results to {checkpoint_path} every
+    {checkpoint_every} reports.
+
+    With resume=True reports checkpointed by an earlier run are not parsed
+    again; their results are read back and yielded in their original place,
+    so that the tables built from them are identical to those of an
+    uninterrupted run. Reports are keyed by DOC_NAME; the {options} of the
+    run are kept in the checkpoint (see _read_checkpoint).
+    """
+    import pickle
+    import os
+
+    checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if resume:
+        checkpointed, end = _read_checkpoint(checkpoint_path, test_type,
+                                             options=options)
+    else:
+        checkpointed, end = {}, None
+
+    if end is None:
+        f = open(checkpoint_path, 'wb')
+        pickle.dump({'TEST_TYPE': test_type.upper(), 'OPTIONS': options}, f)
+    else:
+        # Drop any chunk cut short by the interruption before appending
+        f = open(checkpoint_path, 'r+b')
+        f.truncate(end)
+        f.seek(end)
+
+    if checkpointed:
+        print(f"{len(checkpointed)} checkpointed records resumed")
+
+    def _save(chunk):
+        pickle.dump(chunk, f)
+        f.flush()
+        os.fsync(f.fileno())
+
+    remaining = [report_path for report_path in report_paths
+                 if report_path.name not in checkpointed]
+    results = map_reports(remaining)
+
+    with f:
+        chunk = []
+        for report_path in report_paths:
+            if report_path.name in checkpointed:
+                yield checkpointed[report_path.name]
+                continue
+
+            result = next(results)
+
+            # Quarantined reports (None) are retried when resuming
+            if result is not None:
+                chunk.append((report_path.name, result))
+
+            if checkpoint_every and len(chunk) >= checkpoint_every:
+                _save(chunk)
+                chunk = []
+
+            yield result
+
+        if checkpoint_every and chunk:
+            _save(chunk)
+
+
+def _map_reports(parse_report, report_paths, test_type, workers=1,
+                 queue_depth=None, timeout=None, isolate=False,
+                 quarantine=None, checkpoint_path=None,
+                 checkpoint_every=None, resume=False,
+                 checkpoint_options=None, **parse_kwargs):
+    """
+    Applies a single-report parser to every report, yielding results
+    in the same order as {report_paths}.
+
+    With workers > 1 reports are sent to a process pool; the parser must
+    therefore be a top-level (picklable) function of this module.
+
+    With a {queue_depth} the reports are processed as a pipeline of three
+    stages linked by bounded queues;
+
+        (1) a reader thread prefetching PDF bytes (see _prefetch_reports)
+        (2) the scrape/extract workers (at most {queue_depth} reports
+            in flight)
+        (3) the caller, consuming results one at a time (the writer)
+
+    so that reading overlaps scraping, and the number of reports held in
+    memory is set by {queue_depth} rather than the size of the corpus.
+
+    Parameters
+    ----------
+    parse_report : function
+        One of _parse_genotypic_report, _parse_phenotypic_report,
+        _ingest_report
+
+    report_paths : list of PosixPath
+
+    test_type : str
+
+    workers : int
+        Number of worker processes (1 = parse serially)
+
+    queue_depth : int
+        Depth of the queues between stages (None = no pipeline)
+
+    timeout : float
+        Seconds allowed for each report; reports that exceed it, raise or
+        crash their worker yield None and are added to {quarantine}
+        (see _map_reports_isolated). None = no deadline
+
+    isolate : bool
+        Parse each report in a worker process even without a {timeout};
+        reports that raise or crash their worker are quarantined. Reports
+        are always isolated when a {timeout} is given; otherwise a failing
+        report stops the run
+
+    quarantine : list
+        Filled with a dict per quarantined report
+
+    checkpoint_path : PosixPath
+        Checkpoint file (None = no checkpointing)
+
+    checkpoint_every : int
+        Save results to the checkpoint every this many reports
+
+    resume : bool
+        Read back the results of reports checkpointed by an earlier run
+        rather than parsing them again (see _map_reports_checkpointed)
+
+    checkpoint_options : dict
+        Options of the run, kept in the checkpoint; resuming a run with
+        other options raises ValueError (see _checkpoint_options)
+
+    **parse_kwargs
+        Passed to {parse_report} for every report
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from collections import deque
+    from functools import partial
+    from ipypb import track
+
+    if checkpoint_path is not None:
+        map_reports = partial(_map_reports, parse_report,
+                              test_type=test_type, workers=workers,
+                              queue_depth=queue_depth, timeout=timeout,
+                              isolate=isolate, quarantine=quarantine,
+                              **parse_kwargs)
+
+        yield from _map_reports_checkpointed(
+            map_reports, report_paths, test_type,
+            checkpoint_path=checkpoint_path,
+            checkpoint_every=checkpoint_every, resume=resume,
+            options=checkpoint_options)
+        return
+
+    # partial() of a top-level function remains picklable
+    parse_report = partial(parse_report, **parse_kwargs)
+
+    if queue_depth:
+        reports = _prefetch_reports(report_paths, queue_depth)
+    else:
+        reports = report_paths
+
+    if isolate or timeout is not None:
+        results = _map_reports_isolated(parse_report, reports, test_type,
+                                        workers=workers, timeout=timeout,
+                                        quarantine=quarantine)
+
+        for result in track(results, total=len(report_paths),
+                            label='Records'):
+            yield result
+
+    elif workers is None or workers <= 1:
+        for path_to_pdf in track(reports, total=len(report_paths),
+                                 label='Records'):
+            yield parse_report(path_to_pdf, test_type)
+
+    elif queue_depth:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Submit no further reports while {queue_depth} are in flight
+            #   (backpressure on the reader); results are yielded in order
+            def _results():
+                in_flight = deque()
+
+                for path_to_pdf in reports:
+                    in_flight.append(
+                        executor.submit(parse_report, path_to_pdf, test_type))
+
+                    if len(in_flight) >= queue_depth:
+                        yield in_flight.popleft().result()
+
+                while in_flight:
+                    yield in_flight.popleft().result()
+
+            for result in track(_results(), total=len(report_paths),
+                                label='Records'):
+                yield result
+
+    else:
+        # Small chunks keep the pool balanced (report sizes vary widely)
+        #   without paying the pickling overhead on every single report
+        chunksize = max(1, len(report_paths) // (workers * 16))
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # executor.map() returns results in submission order
+            results = executor.map(parse_report,
+                                   report_paths,
+                                   [test_type] * len(report_paths),
+                                   chunksize=chunksize)
+
+            for result in track(results, total=len(report_paths),
+                                label='Records'):
+                yield result
+
+
+def _parse_genotypic_report(path_to_pdf, test_type: str,
+                            scrape_kwargs: dict = None) -> dict:
+    """
+    Scrapes a single genotypic report and extracts its contents.
+
+    Parameters
+    ----------
+    path_to_pdf : PosixPath
+
+    test_type : str
+
+    scrape_kwargs : dict
+        Passed to scrape_PDF_to_text (e.g., cache settings); see
+        _scrape_report
+
+    Returns
+    -------
+    record : dict
+        Column names and values for one row of the genotypic dataframe
+    """
+    # Parse PDF to text
+    sample_text, page_counts = _scrape_report(path_to_pdf, test_type,
+                                              scrape_kwargs=scrape_kwargs)
+
+    record = _extract_genotypic_record(sample_text, test_type,
+                                       doc_name=path_to_pdf.name)
+
+    # Run metrics (removed by the caller)
+    if page_counts is not None:
+        record['_PAGE_COUNTS'] = page_counts
+
+    return record
+
+
+def _extract_genotypic_record(sample_text: str, test_type: str,
+                              doc_name: str, sections: dict = None) -> dict:
+    """
+    Extracts one row of the genotypic dataframe from scraped text.
+    """
+    # Locate the report's sections (once, for all extractors)
+    if sections is None:
+        sections = index_report_sections(sample_text)
+
+    # Extract order info
+    order_info_dict = _extract_order_info_as_dict(sample_text=sample_text,
+                                                  sections=sections)
+
+    record = {'TEST_TYPE': test_type.upper(),
+              'DOC_NAME': doc_name}
+    record.update(order_info_dict)
+
+    # If report is not marked "incomplete"
+    #   gather oberserved mutations
+    failure_phrase, _ = find_failure_phrase(sample_text=sample_text)
+    report_complete = failure_phrase is None
+    record['REPORT_COMPLETE'] = report_complete
+    record['FAILURE_PHRASE'] = failure_phrase
+
+    if report_complete:
+        # Phenosense-GT tests do *not* have mutations listed at the
+        #   drug-level (only lists at the loci-level)
+        if test_type.upper() not in ['PHENOSENSE-GT']:
+            record.update(_extract_drms_as_dict(sample_text=sample_text,
+                                                sections=sections))
+
+        # Loci-specific lists of mutations
+        record.update(_extract_full_mutation_lists_as_dict(
+            sample_text=sample_text, test_type=test_type, sections=sections))
+
+    return record
+
+
+def parse_genotypic_reports(path_to_zips, test_type, workers=1,
+                            cache_dir=None, compress_cache=False,
+                            max_cache_bytes=None, stream=False,
+                            incremental=False, queue_depth=None,
+                            timeout=None, isolate=False,
+                            checkpoint_every=None, resume=False,
+                            dedupe=False, page_limit=False, stop=None):
+    """
+    Returns a dataframe with one row per test accession/order.
+
+    Parameters
+    ----------
+    path_to_zips : PosixPath
+
+    test_type : str
+        One of [Geneseq, Genosure-MG, Genosure-PRIme,
+                Genosure-Archive, Phenosense-GT]
+
+    workers : int
+        Number of processes used to scrape and extract reports
+        (1 = serial); output is identical regardless
+
+    cache_dir : PosixPath
+        Directory of the scraped-text cache (None = no caching)
+
+    compress_cache : bool
+        Write new cache entries gzip-compressed
+
+    max_cache_bytes : int
+        Evict least-recently-used cache entries beyond this size
+        at the end of the run (None = unbounded)
+
+    stream : bool
+        Read reports directly out of the .zip archives
+        rather than extracting them to disk
+
+    incremental : bool
+        Parse only reports that are new or changed since the last
+        incremental run (per the manifest kept in parsed-reports/)
+        and append them to the previously parsed results
+
+    queue_depth : int
+        Prefetch reports in a background thread and keep at most this
+        many in memory at each stage (None = read reports as they are
+        scraped); see _map_reports
+
+    timeout : float
+        Seconds allowed to scrape and extract each report, in a worker
+        process that is replaced if the report hangs. Reports that time
+        out or fail are skipped and listed in df.attrs['QUARANTINE'] (as
+        records; pd.DataFrame(df.attrs['QUARANTINE']) gives the quarantine
+        table). None = no deadline
+
+    isolate : bool
+        Quarantine failing reports as above but without a deadline; implied
+        by a {timeout}. With neither, a failing report stops the run
+
+    checkpoint_every : int
+        Save parsed records to parsed-reports/genotypic-checkpoint.pkl
+        every this many reports (None = no checkpoint); the checkpoint is
+        removed once the run completes
+
+    resume : bool
+        Resume an interrupted run; reports in its checkpoint (by DOC_NAME)
+        are not parsed again. The dataframe returned is identical to that
+        of an uninterrupted run. The run must be resumed with the {dedupe},
+        {page_limit}, {stop}, {isolate} and {timeout} it was started with
+        (otherwise ValueError)
+
+    dedupe : bool or str
+        Parse only one of each set of duplicate reports; True = identical
+        bytes, 'accession' = also the same accession key (see
+        deduplicate_reports). The map of every DOC_NAME to the report
+        parsed in its place is kept in df.attrs['DUPLICATES'] (as records)
+
+    page_limit : bool
+        Scrape at most page_budgets[test_type] pages of each report, ending
+        early once the sections extracted have been seen (see
+        required_sections_seen). Pages scraped and saved are printed and
+        kept in df.attrs['PAGES']; scraped-text caching does not apply.
+        Fields printed only beyond the budget are missing, hence off by
+        default (the budgets are yet to be measured on every report type)
+
+    stop : function
+        Stop callback to use instead of required_sections_seen
+        (implies page_limit); picklable if workers > 1
+    """
+    from src.utils import extract_from_zips, prune_text_cache
+    import pandas as pd
+    import warnings
+
+    # Future Warning: Setting an item of incompatible dtype is deprecated
+    # This appears to be a bug in pandas 2.1.1
+    # See https://github.com/pandas-dev/pandas/issues/55025
+    warnings.simplefilter(action='ignore', category=FutureWarning)
+
+    allowable_test_types = ['GENESEQ', 'GENOSURE-MG', 'GENOSURE-PRIME',
+                            'GENOSURE-ARCHIVE', 'PHENOSENSE-GT']
+    if test_type.upper() not in allowable_test_types:
+        raise ValueError(f'Invalid test type ({allowable_test_types})')
+
+    # Extract PDF reports from Zip files
+    if incremental:
+        report_paths, manifest = _select_unparsed_reports(
+            path_to_zips, parser='genotypic', stream=stream)
+
+        # Nothing new (or, on a first run, no reports at all)
+        if len(report_paths) == 0:
+            print(f"0 new {test_type} records parsed")
+            tables = _update_parsed_tables(
+                path_to_zips, parser='genotypic', manifest=manifest,
+                tables=[None], doc_names=[])
+            return tables[0]
+
+    else:
+        report_paths = extract_from_zips(path_to_zips, stream=stream)
+        manifest = None
+
+    # Parse each distinct report once
+    #   (nor again those parsed by earlier incremental runs)
+    report_paths, duplicates, manifest = _deduplicate_report_paths(
+        report_paths, dedupe=dedupe, workers=workers, manifest=manifest)
+
+    # Every new report duplicates one parsed by an earlier run
+    if incremental and len(report_paths) == 0:
+        print(f"0 new {test_type} records parsed")
+        tables = _update_parsed_tables(
+            path_to_zips, parser='genotypic', manifest=manifest,
+            tables=[None], doc_names=_duplicate_names(duplicates))
+        return tables[0]
+
+    if checkpoint_every or resume:
+        checkpoint_path = _parsed_reports_paths(
+            path_to_zips, parser='genotypic')['checkpoint']
+        checkpoint_options = _checkpoint_options(
+            dedupe=dedupe, page_limit=page_limit, stop=stop,
+            isolate=isolate, timeout=timeout)
+    else:
+        checkpoint_path, checkpoint_options = None, None
+
+    # Loop over PDF's
+    # One dict per report is accumulated and the dataframe built only once
+    #   (growing a dataframe cell-by-cell is quadratic in the number of rows)
+    scrape_kwargs = {'cache_dir': cache_dir, 'compress_cache': compress_cache,
+                     'page_limit': page_limit or stop is not None,
+                     'stop': stop}
+    quarantine = list()
+    records = list(_map_reports(_parse_genotypic_report, report_paths,
+                                test_type=test_type, workers=workers,
+                                queue_depth=queue_depth, timeout=timeout,
+                                isolate=isolate, quarantine=quarantine,
+                                checkpoint_path=checkpoint_path,
+                                checkpoint_every=checkpoint_every,
+                                resume=resume,
+                                checkpoint_options=checkpoint_options,
+                                scrape_kwargs=scrape_kwargs))
+
+    # Quarantined reports have no record
+    records = [record for record in records if record is not None]
+
+    page_counts = [record.pop('_PAGE_COUNTS') for record in records
+                   if '_PAGE_COUNTS' in record]
+
+    df = pd.DataFrame.from_records(records)
+
+    # Bound the size of the scraped-text cache
+    if cache_dir is not None and max_cache_bytes is not None:
+        prune_text_cache(cache_dir, max_cache_bytes)
+
+    df = _finalize_genotypic_df(df=df)
+
+    print(f"{len(records)} {test_type} records parsed")
+    quarantine_df = _quarantine_table(quarantine)
+    page_metrics = _page_metrics(page_counts)
+
+    # Append to (or replace within) the results of previous runs
+    #   (quarantined reports are left out of the manifest to be retried)
+    if incremental:
+        manifest = manifest[~manifest['DOC_NAME'].isin(
+            quarantine_df['DOC_NAME'])]
+        df, = _update_parsed_tables(
+            path_to_zips, parser='genotypic', manifest=manifest, tables=[df],
+            doc_names=(df['DOC_NAME'].to_list() +
+                       _duplicate_names(duplicates)))
+
+    # The run is complete
+    if checkpoint_path is not None:
+        checkpoint_path.unlink(missing_ok=True)
+
+    df.attrs['QUARANTINE'] = quarantine_df.to_dict('records')
+    df.attrs['DUPLICATES'] = duplicates
+    df.attrs['PAGES'] = page_metrics
+
+    return df
+
+
+class MutationToken(namedtuple('MutationToken',
+                                 ['wild_type', 'position', 'aa',
+                                  'insertion_deletion', 'mutation',
+                                  'components'])):
+    """
+    A mutation (e.g., M184V, V245V/M, T69T/S/SSS, E/^) parsed into
+
+        wild_type           : reference amino acid (e.g., 'V')
+        position            : codon (e.g., 245.0)
+        aa                  : amino acid(s) as reported (e.g., 'V/M'),
+                              or 'ins'/'del' for insertions/deletions
+        insertion_deletion  : True for insertions and deletions
+        mutation            : mutation as listed in the position dataframe
+                              (deletions lose their '/^')
+        components          : amino acids of a substitution mixture, one
+                              per row of the position dataframe
+                              (e.g., ('V', 'M'))
+    """
+    __slots__ = ()
+
+
+@lru_cache(maxsize=None)
+def parse_mutation_token(mutation: str) -> MutationToken:
+    """
+    Parses a single mutation (see MutationToken).
+
+    There are only a few thousand distinct mutations across all reports;
+    results are cached so that each is parsed once per process, however
+    many accessions, loci or runs it appears in.
+    """
+    import re
+    import numpy as np
+
+    wild_type = re.match('([A-Z])[\d]', mutation)
+    wild_type = wild_type.group(1) if wild_type else np.NaN
+
+    position = re.search('[A-Z]([\d]+)', mutation)
+    position = float(position.group(1)) if position else np.NaN
+
+    aa = re.search('[\d]+([A-Z/\^]*)', mutation)
+    aa = aa.group(1) if aa else np.NaN
+
+    # T69T/S/SSS refers to an amino acid insertion between codons 67 and 70 in the
+    #   reverse transcriptase of HIV-1. By convention, it is assigned to codon 69.
+    if '^' in mutation:
+        aa = 'del'
+        # remove the '/^' from deletions
+        mutation = re.sub('\/.*', '', mutation)
+
+    elif re.search('[A-Z][A-Z]+', mutation):
+        aa = 'ins'
+
+    insertion_deletion = aa in ['ins', 'del']
+
+    # Substitution mixtures (e.g., V245V/M) have one component per
+    #   amino acid in the run separated by forward-slashes
+    if '/' in mutation and not insertion_deletion:
+        run = re.search('((?:[A-Z]/)+[A-Z])', mutation)
+        components = tuple(run.group(1).split('/')) if run else (np.NaN,)
+
+    else:
+        components = (aa,)
+
+    return MutationToken(wild_type, position, aa, insertion_deletion,
+                         mutation, components)
+
+
+def mutation_token_table(mutations):
+    """
+    Returns a dataframe of parsed mutations (see MutationToken)
+    with one row per distinct mutation, indexed by the mutation.
+
+    # TOKEN      WILD_TYPE  POSITION  AA    INSERTION_DELETION  ...  COMPONENTS
+    # -------------------------------------------------------------------------
+    # V245V/M    V          245.0     V/M   False               ...  (V, M)
+    # E44E/^     E          44.0      del   True                ...  (del,)
+    """
+    import pandas as pd
+
+    distinct_mutations = pd.unique(pd.Series(mutations).dropna())
+
+    token_table = pd.DataFrame.from_records(
+        [parse_mutation_token(mutation) for mutation in distinct_mutations],
+        columns=MutationToken._fields,
+        index=pd.Index(distinct_mutations, name='TOKEN'))
+    token_table.columns = token_table.columns.str.upper()
+
+    return token_table
+
+
+def _carry_forward_mutations(patients, mutation_lists):
+    """
+    Cumulative (within-patient) union of comma-separated mutation lists.
+
+    Each list becomes every mutation observed in the patient's tests so
+    far, in the order first observed; e.g., 'M184V,K103N' then
+    'K103N,Y181C' become 'M184V, K103N' then 'M184V, K103N, Y181C'.
+
+    Tests must be sorted by patient (and date); each mutation is visited
+    once per test, so the time taken grows linearly with the number of
+    tests rather than with the square of the patient's history.
+
+    Parameters
+    ----------
+    patients : Series
+        PAT_MRN_ID of each test
+
+    mutation_lists : Series
+        Comma-separated mutations of each test (e.g., RT_LIST)
+
+    Returns
+    -------
+    List of carried-forward mutation lists (in the order of the tests)
+    """
+    carried_forward = list()
+
+    # Dict keys (insertion-ordered) serve as an ordered set
+    observed = dict()
+    previous_patient = None
+
+    for patient, mutation_list in zip(patients, mutation_lists):
+        if patient != previous_patient:
+            observed = dict()
+            previous_patient = patient
+
+        observed.update(dict.fromkeys(mutation_list.split(',')))
+        carried_forward.append(', '.join(observed))
+
+    return carried_forward
+
+
+def melt_loci_specific_mutations_to_position(mutations_df, loci):
+    return melt_mutations_to_position(mutations_df, loci=[loci])[loci.upper()]
+
+
+def melt_mutations_to_position(mutations_df, loci=['RT', 'PR', 'INSTI'],
+                               long_format=False):
+    """
+    Melts the loci-specific lists of mutations (e.g., RT_LIST, PR_LIST,
+    INSTI_LIST) to one row per mutation (per component of a mixture).
+
+    Filtering (completed tests with an MRN) and sorting are done once
+    for all loci; mutations are then filled forward over time (within
+    patient) and melted locus-by-locus.
+
+    Parameters
+    ----------
+    mutations_df : DataFrame
+        Genotypic dataframe (see parse_genotypic_reports)
+
+    loci : list
+        Any of [RT, PI/PR, INSTI]
+
+    long_format : bool
+        Return one dataframe with a LOCUS field
+        rather than a dataframe per locus
+
+    Returns
+    -------
+    position_dfs : dict
+        Keys are loci, Values are position dataframes
+        (or a single dataframe if long_format=True)
+    """
+    import pandas as pd
+
+    from warnings import simplefilter
+
+    # Future Warning: Setting an item of incompatible dtype is deprecated
+    # This appears to be a bug in pandas 2.1.1
+    # See https://github.com/pandas-dev/pandas/issues/55025
+    simplefilter(action='ignore', category=FutureWarning)
+
+    # PerformanceWarning: DataFrame is highly fragmented.
+    # This new to pandas 2.0(+)
+    # See https://stackoverflow.com/questions/68292862
+    simplefilter(action="ignore", category=pd.errors.PerformanceWarning)
+
+    loci = [locus.upper() for locus in loci]
+    for locus in loci:
+        if locus not in ['RT', 'PI', 'PR', 'INSTI']:
+            raise ValueError('Loci argument must be one of [RT, PI/PR, INSTI]')
+
+    loci_lists = [locus + '_LIST' for locus in loci]
+    for loci_list in loci_lists:
+        if loci_list not in mutations_df.columns:
+            raise ValueError(f'DataFrame has no {loci_list} field.')
+
+    # Make a copy of the mutations dataframe (one list per test/row)
+    #   with only the fields needed
+    order_info_cols = ['PAT_MRN_ID', 'COLLECTED_DATE', 'ACCESSION']
+    df = mutations_df[order_info_cols + ['REPORT_COMPLETE'] + loci_lists].copy()
+
+    print(f'Extracting positions of mutations within the {", ".join(loci_lists)} loci.')
+    print('All values of "None" must be set to missing to allow ')
+    print('     filling mutations forward over time (within patient).')
+    print()
+
+    # Keep only
+    #   (1) completed tests
+    #   (2) with a medical record number
+    #   (3) non-null list of loci-specific mutations (e.g., RT_list)
+    #       (locus-by-locus below)
+    print('Dropped')
+
+    complete_test = (df['REPORT_COMPLETE'] == True)
+    print(f'  - {len(df[~complete_test])} incomplete test accessions')
+    df = df[complete_test]
+
+    have_mrn = (df['PAT_MRN_ID'].notnull())
+    print(f'  - {len(df[~have_mrn])} test accessions with no MRN')
+    df = df[have_mrn]
+
+    for locus, loci_list in zip(loci, loci_lists):
+        have_mutations_list = (df[loci_list].notnull())
+        print(f'  - {len(df[~have_mutations_list])} without observed mutations at the {locus} locus')
+    print('')
+
+    # Sort by patient (once, for all loci)
+    # Sorting on multiple fields is stable; so subsets of this dataframe
+    #   are in the same order as were they sorted separately
+    df.sort_values(['PAT_MRN_ID', 'COLLECTED_DATE'], inplace=True)
+
+    position_dfs = dict()
+    for locus, loci_list in zip(loci, loci_lists):
+        locus_df = df.loc[df[loci_list].notnull(), order_info_cols + [loci_list]]
+
+        position_dfs[locus] = _melt_locus_to_position(locus_df, loci_list)
+
+    if long_format:
+        position_df = pd.concat(
+            [position_df.assign(LOCUS=locus)
+             for locus, position_df in position_dfs.items()])
+        position_df.reset_index(inplace=True, drop=True)
+
+        return position_df[['LOCUS'] + [i for i in position_df.columns
+                                        if i != 'LOCUS']]
+
+    return position_dfs
+
+
+def _melt_locus_to_position(df, loci_list):
+    """
+    Fills one locus' mutations forward over time (within patient) and
+    melts them to one row per mutation; see melt_mutations_to_position.
+
+    {df} holds only completed tests with an MRN and a {loci_list},
+    sorted by PAT_MRN_ID and COLLECTED_DATE.
+    """
+    import pandas as pd
+
+    order_info_cols = ['PAT_MRN_ID', 'COLLECTED_DATE', 'ACCESSION']
+
+    # Split off patients with a single test
+    #   to reduce processing time in the step below,
+    #   which is required only for patients with multiple tests
+    have_multiple_tests = df \
+        .groupby('PAT_MRN_ID')['ACCESSION'] \
+        .transform('nunique') > 1
+
+    single_test_df = df[~have_multiple_tests].copy()
+    # alphabetize/standardize the {loci_list} components
+    single_test_df[loci_list] = single_test_df[loci_list].apply(lambda x: ",".join(sorted(x.split(","))))
+
+    # multiple_test_df = df[have_multiple_tests].copy()
+    # Patients never actually "lose" a mutation; it's just unobserved due to 
+    #   a combination of treatment-inhibition and between-strain-competition.
+    # Therefore, we want to fill mutations over time, within patient.
+    # However, mutations are currently in an unordered list.
+    # In order to create a standardized order of mutations,
+    #   we will first create columns from the entries in {loci-list}
+
+    # Removed in favor of Ordered Dict approach
+    # for i, row in multiple_test_df.iterrows():
+    #    for mutation in row[loci_list].split(','):
+    #        multiple_test_df.loc[i, mutation.strip()] = mutation.strip()
+    # multiple_test_df.drop(columns=loci_list, inplace=True)
+
+    # PAT_MRN_ID     COLLECTED_DT     ...     Q102K     C162S     T200T/A     R211K     V245E/K     M184M/V
+    # -----------------------------------------------------------------------------------------------------
+    #   0000000       2018-02-14      ...      NaN       NaN        NaN       R211K      NaN         NaN
+    #   0000000       2018-02-14      ...      NaN       NaN        NaN       R211K      NaN        M184M/V
+
+    # ... then we will fill forward over time (within patient)
+    # multiple_test_df.sort_values(['PAT_MRN_ID', 'COLLECTED_DATE'], inplace=True)
+    # mutation_dummy_cols = [i for i in multiple_test_df.columns if i not in order_info_cols]
+
+    # multiple_test_df[mutation_dummy_cols] = multiple_test_df \
+    #     .groupby('PAT_MRN_ID')[mutation_dummy_cols] \
+    #     .transform(lambda x: x.ffill())
+    # multiple_test_df.reset_index(drop=True, inplace=True)
+
+    # ... and use the dummy columns to re-create the {loci-list} field
+    #   in a standardized order (per patient, overtime)
+    # for i, row in multiple_test_df.iterrows():
+        # that are not null
+    #    nonnull_mask = (row[mutation_dummy_cols].isnull() == False)
+    #    # re-create
+    #    multiple_test_df.loc[i, loci_list] = ','.join(row[mutation_dummy_cols][nonnull_mask].index.tolist()).strip()
+
+
+    # Patients never actually "lose" a mutation; it's just unobserved due to 
+    #   a combination of treatment-inhibition and between-strain-competition.
+    # Therefore, we want to fill mutations over time, within patient.
+    # However, mutations are currently in an unordered list.
+    # Carry forward the union of mutations observed so far (in the order
+    #   they were first observed) to standardize the order within the lists.
+    # (already sorted by patient)
+    multiple_test_df = df[have_multiple_tests].copy()
+    multiple_test_df.reset_index(inplace=True, drop=True)
+
+    multiple_test_df[loci_list] = _carry_forward_mutations(
+        multiple_test_df['PAT_MRN_ID'], multiple_test_df[loci_list])
+
+    # Recombine dataframes
+    position_df = pd.concat([single_test_df,
+                            multiple_test_df[order_info_cols + [loci_list]]])
+    position_df.reset_index(inplace=True, drop=True)
+
+    # Pivot from wide to long (create mutation dummies)
+    dummies_df = position_df[loci_list].str.split(",", expand=True)
+
+    # 0	        1           2           ...
+    # ------------------------------------------
+    # V245V/M   D123E      np.NaN
+
+    # Join (left) the dummies back into the position_df to get order info
+    position_df = position_df[order_info_cols] \
+        .merge(dummies_df, left_index=True, right_index=True, how='left')
+
+    # Melt from wide to long
+    # LINE is currently redundant with ACCESSION (but used in a later step)
+    position_df = position_df.melt(id_vars=order_info_cols) \
+        .sort_values(['PAT_MRN_ID', 'COLLECTED_DATE', 'variable']) \
+        .rename(columns={'variable': 'LINE', 'value': 'MUTATION'})
+
+    # remove any spaces at the begining of mutations (pre-cautinary)
+    position_df['MUTATION'] = position_df['MUTATION'].str.strip()
+
+    # Drop duplicates (artefact of filling mutations over time)
+    position_df.drop_duplicates(subset=['ACCESSION', 'MUTATION'], inplace=True)
+
+    # ACCESSION	    LINE	MUTATION
+    # ------------------------------
+    # 09-150972	    7	    V245V/M
+    # 09-150972     8 	    D123E
+
+    # Drop all null values generated during the melting process
+    position_df = position_df.loc[position_df['MUTATION'].notnull()]
+
+    # Parse each distinct mutation once (see parse_mutation_token)
+    #   and join the parsed components back onto every row
+    token_table = mutation_token_table(position_df['MUTATION'])
+
+    position_df['POSITION'] = position_df['MUTATION'].map(
+        token_table['POSITION'])
+    position_df['AA'] = position_df['MUTATION'].map(
+        token_table['COMPONENTS'])
+    insertions_deletions = position_df['MUTATION'].map(
+        token_table['INSERTION_DELETION'])
+    # remove the '/^' from deletions
+    position_df['MUTATION'] = position_df['MUTATION'].map(
+        token_table['MUTATION'])
+
+    # ACCESSION	    LINE	MUTATION	POSITION    AA
+    # ------------------------------------------------
+    # 09-150972	    7	    V245V/M	    245         (V, M)
+    # 09-150972     8 	    D123E	    123         (E,)
+    # 09-150972     9 	    T69T/S/SSS	69          (ins,)
+
+    # Set aside insertions (e.g., T69T/S/SSS) and deletions (e.g., E/^, T/^)
+    #   so that only substitution mixtures are split into components
+    ins_del_df = position_df[insertions_deletions].explode('AA')
+    # Remove insertions/deletions
+    position_df = position_df[~insertions_deletions]
+
+    # Give each component of a substitution mixture a row of its own
+    position_df = position_df.explode('AA')
+
+    # drop the index (no longer meaningful after replication)
+    position_df.reset_index(drop=True, inplace=True)
+
+    # LINE	MUTATION	POSITION    AA
+    # ------------------------------------
+    # 7	    V245V/M	    245         V  **
+    # 7	    V245V/M	    245         M  **
+    # 8 	D123E	    123         E
+
+    # Join back in the insertions and deletions that were removed earlier
+    position_df = pd.concat([position_df, ins_del_df], axis=0, sort=False)
+    position_df['POSITION'] = position_df['POSITION'].astype('float')
+
+    position_df.sort_values(
+        ['PAT_MRN_ID', 'COLLECTED_DATE', 'POSITION', 'LINE'], inplace=True)
+    position_df.reset_index(inplace=True, drop=True)
+
+    return position_df
+
+
+class MutationSets(namedtuple('MutationSets',
+                                ['accessions', 'bits', 'bit_index'])):
+    """
+    Each accession's set of mutations as a packed array of bits.
+
+    Every (POSITION, AA) observed at a locus is assigned a bit (see
+    mutation_bit_index); an accession's mutations are the bits set in its
+    row of {bits}, a (n_accessions, ceil(n_bits / 8)) array of uint8.
+
+        accessions  : DataFrame of order info, one row per row of {bits}
+                      (PAT_MRN_ID, COLLECTED_DATE, ACCESSION)
+        bits        : packed bits (little-endian within each byte)
+        bit_index   : DataFrame of POSITION, AA indexed by bit
+
+    Set operations act row-by-row on MutationSets over the same accessions
+    and bit index; see pack_mutation_sets and to_position_df.
+    """
+    __slots__ = ()
+
+    def _check_aligned(self, other):
+        if not (self.bit_index.equals(other.bit_index) and
+                self.accessions['ACCESSION'].equals(
+                    other.accessions['ACCESSION'])):
+            raise ValueError('MutationSets must share accessions and bit index')
+
+    def union(self, other):
+        self._check_aligned(other)
+        return self._replace(bits=self.bits | other.bits)
+
+    def intersection(self, other):
+        self._check_aligned(other)
+        return self._replace(bits=self.bits & other.bits)
+
+    def issubset(self, other):
+        """
+        Returns a boolean array; True where the accession's set of
+        mutations is a subset of the same accession's set in {other}.
+        """
+        self._check_aligned(other)
+        return ((self.bits & ~other.bits) == 0).all(axis=1)
+
+    def contains(self, mutations):
+        """
+        Returns a boolean array; True for accessions with
+        all of {mutations}, an iterable of (POSITION, AA). A mutation
+        without a bit (seen in none of the accessions) is in no set.
+        """
+        import numpy as np
+
+        bits = _bits_of(self.bit_index, mutations, missing=-1)
+
+        if (bits < 0).any():
+            return np.zeros(len(self.accessions), dtype=bool)
+
+        mask = _pack_bits(np.zeros(1, dtype=int), bits,
+                          n_rows=1, n_bits=len(self.bit_index))
+
+        return ((mask & ~self.bits) == 0).all(axis=1)
+
+    def to_position_df(self):
+        """
+        Returns one row per accession, per (POSITION, AA) in its set;
+        sorted by accession (in the order of {accessions}) then bit.
+
+        # PAT_MRN_ID    COLLECTED_DATE  ACCESSION   POSITION    AA
+        # ------------------------------------------------------------
+        # 0000000       2018-02-14      18-104532   41.0        L
+        # 0000000       2018-02-14      18-104532   184.0       V
+        """
+        import numpy as np
+
+        unpacked = np.unpackbits(self.bits, axis=1, count=len(self.bit_index),
+                                 bitorder='little')
+        rows, bits = np.nonzero(unpacked)
+
+        position_df = self.accessions.iloc[rows].reset_index(drop=True)
+        position_df[['POSITION', 'AA']] = \
+            self.bit_index.iloc[bits][['POSITION', 'AA']].to_numpy()
+        position_df['POSITION'] = position_df['POSITION'].astype(float)
+
+        return position_df
+
+
+def mutation_bit_index(position_df):
+    """
+    Assigns a bit to each distinct (POSITION, AA) in {position_df}
+    (in order of position, then amino acid).
+
+    # BIT   POSITION    AA
+    # ----------------------
+    # 0     41.0        L
+    # 1     184.0       I
+    # 2     184.0       V
+    """
+    bit_index = position_df[['POSITION', 'AA']]\
+        .dropna()\
+        .drop_duplicates()\
+        .sort_values(['POSITION', 'AA'])\
+        .reset_index(drop=True)
+    bit_index.index.name = 'BIT'
+
+    return bit_index
+
+
+def _bits_of(bit_index, mutations, missing=None):
+    # {missing}: the bit given to mutations not in {bit_index}
+    #   (default: raise ValueError)
+    import pandas as pd
+
+    mutations = pd.DataFrame(list(mutations), columns=['POSITION', 'AA'])
+    mutations['POSITION'] = mutations['POSITION'].astype(float)
+
+    bits = mutations.merge(bit_index.reset_index(),
+                           on=['POSITION', 'AA'], how='left')['BIT']
+
+    if missing is not None:
+        bits = bits.fillna(missing)
+    elif bits.isnull().any():
+        raise ValueError('Mutations not in bit index: '
+                         f'{mutations[bits.isnull()].values.tolist()}')
+
+    return bits.to_numpy(dtype=int)
+
+
+def _pack_bits(rows, bits, n_rows, n_bits):
+    import numpy as np
+
+    packed = np.zeros((n_rows, (n_bits + 7) // 8), dtype=np.uint8)
+    np.bitwise_or.at(packed, (rows, bits // 8),
+                     np.left_shift(1, bits % 8).astype(np.uint8))
+
+    return packed
+
+
+def pack_mutation_sets(position_df, bit_index=None, accessions=None):
+    """
+    Packs the (POSITION, AA) of each accession in {position_df}
+    (see melt_mutations_to_position) into a MutationSets.
+
+    Parameters
+    ----------
+    position_df : DataFrame
+
+    bit_index : DataFrame
+        From mutation_bit_index; pass the same bit index to pack sets
+        that are to be compared (default: built from {position_df})
+
+    accessions : DataFrame
+        Order info of the rows to pack (e.g., the accessions of another
+        MutationSets); accessions without mutations get an empty set
+        (default: the accessions in {position_df})
+
+    Returns
+    -------
+    MutationSets
+        Rows with a missing POSITION or AA are ignored; a mutation listed
+        more than once by an accession (e.g., E40D and E40D/E after filling
+        forward) is a single member of its set
+    """
+    import pandas as pd
+
+    if bit_index is None:
+        bit_index = mutation_bit_index(position_df)
+
+    if accessions is None:
+        order_info_cols = [col for col in ['PAT_MRN_ID', 'COLLECTED_DATE',
+                                           'ACCESSION']
+                           if col in position_df.columns]
+
+        accessions = position_df[order_info_cols]\
+            .drop_duplicates(subset='ACCESSION')\
+            .reset_index(drop=True)
+
+    mutations = position_df[['ACCESSION', 'POSITION', 'AA']].dropna()
+    rows = pd.Index(accessions['ACCESSION']).get_indexer(
+        mutations['ACCESSION'])
+
+    if (rows < 0).any():
+        raise ValueError('position_df has accessions not in {accessions}')
+    bits = _bits_of(bit_index, zip(mutations['POSITION'], mutations['AA']))
+
+    return MutationSets(accessions=accessions,
+                        bits=_pack_bits(rows, bits, n_rows=len(accessions),
+                                        n_bits=len(bit_index)),
+                        bit_index=bit_index)
+
+
+class ScoreTensor(namedtuple('ScoreTensor',
+                               ['positions', 'aas', 'arvs', 'values',
+                                'counts', 'dtypes', 'categories'])):
+    """
+    Stanford's simple (mutation) scores as a dense array.
+
+        positions   : Index of POSITION (axis 0 of {values})
+        aas         : Index of AA (axis 1 of {values})
+        arvs        : fields scored (axis 3 of {values}); every field of
+                      the scores but RULE, POSITION and AA
+        values      : float array [position, AA, duplicate, ARV]
+        counts      : int array [position, AA]; number of rules scoring
+                      each (POSITION, AA) -- usually 1, but the same
+                      mutation may be scored by more than one rule (e.g.,
+                      by both the NRTI and NNRTI files)
+        dtypes      : dtype of each field of the scores
+        categories  : values of non-numeric fields (e.g., RESISTANCE_TYPE),
+                      which are stored in {values} as codes
+    """
+    __slots__ = ()
+
+
+def compile_score_tensor(scores):
+    """
+    Compiles simple scores (see load_hivdb_scores) into a ScoreTensor.
+    """
+    import pandas as pd
+    import numpy as np
+
+    arvs = [i for i in scores.columns if i not in ['RULE', 'POSITION', 'AA']]
+
+    positions = pd.Index(pd.unique(scores['POSITION']))
+    aas = pd.Index(pd.unique(scores['AA']))
+
+    position_codes = positions.get_indexer(scores['POSITION'])
+    aa_codes = aas.get_indexer(scores['AA'])
+
+    # Rules scoring the same (POSITION, AA) are numbered in file order
+    duplicate = pd.Series(position_codes * len(aas) + aa_codes)\
+        .groupby(position_codes * len(aas) + aa_codes)\
+        .cumcount()\
+        .to_numpy()
+
+    counts = np.zeros((len(positions), len(aas)), dtype=int)
+    np.add.at(counts, (position_codes, aa_codes), 1)
+
+    values = np.full((len(positions), len(aas), max(counts.max(), 1),
+                      len(arvs)), np.NaN)
+    categories = dict()
+
+    for j, arv in enumerate(arvs):
+        if pd.api.types.is_numeric_dtype(scores[arv]):
+            arv_values = scores[arv].to_numpy(dtype=float)
+
+        else:
+            codes, categories[arv] = pd.factorize(scores[arv])
+            arv_values = np.where(codes >= 0, codes, np.NaN)
+
+        values[position_codes, aa_codes, duplicate, j] = arv_values
+
+    return ScoreTensor(positions=positions, aas=aas, arvs=arvs,
+                       values=values, counts=counts,
+                       dtypes=scores[arvs].dtypes.to_dict(),
+                       categories=categories)
+
+
+def score_positioned_mutations(position_df, scores):
+    """
+    Matches Stanford's mutation scores for each drug/ARV
+    with observed mutations (on POSITION and AA).
+
+    {scores} may be the simple scores (see load_hivdb_scores) or a
+    ScoreTensor compiled from them (see compile_score_tensor).
+    """
+    import pandas as pd
+    import numpy as np
+
+    if not isinstance(scores, ScoreTensor):
+        scores = compile_score_tensor(scores)
+
+    # Match Stanford's mutation scores for each drug/ARV with observed mutations
+    #   (insertions match on 'ins', deletions match on 'del')
+    #
+    # A single gather from the score tensor; equivalent to a left-merge of
+    #   each ARV's scores in turn (which was how this was once done), so
+    #   a mutation scored by k rules is repeated k-times *per ARV*
+    position_codes = scores.positions.get_indexer(position_df['POSITION'])
+    aa_codes = scores.aas.get_indexer(position_df['AA'])
+    matched = (position_codes >= 0) & (aa_codes >= 0)
+
+    counts = np.where(matched,
+                      scores.counts[position_codes, aa_codes], 0)
+    counts = np.maximum(counts, 1)
+
+    # Rows of the result for each mutation (one per combination of rules)
+    n_arvs = len(scores.arvs)
+    repeats = counts ** n_arvs
+    rows = np.repeat(np.arange(len(position_df)), repeats)
+    combination = np.arange(repeats.sum()) - \
+        np.repeat(np.cumsum(repeats) - repeats, repeats)
+
+    scores_df = position_df.iloc[rows].reset_index(drop=True)
+
+    for j, arv in enumerate(scores.arvs):
+        # First ARV varies slowest (as with successive merges)
+        duplicate = (combination // counts[rows] ** (n_arvs - 1 - j)) \
+            % counts[rows]
+
+        arv_values = np.where(
+            matched[rows],
+            scores.values[position_codes[rows], aa_codes[rows], duplicate, j],
+            np.NaN)
+
+        if arv in scores.categories:
+            # Decode (missing values decode to the trailing NaN)
+            categories = np.append(
+                scores.categories[arv].to_numpy(dtype=object), np.NaN)
+            arv_values = categories[np.where(
+                np.isnan(arv_values), -1, arv_values).astype(int)]
+
+        elif (pd.api.types.is_integer_dtype(scores.dtypes[arv]) and
+              not np.isnan(arv_values).any()):
+            arv_values = arv_values.astype(scores.dtypes[arv])
+
+        scores_df[arv] = arv_values
+
+    # LABEL MUTATIONS IDENTIFIED AS 'RESISTANCE-ASSOCIATED' BY MONOGRAM
+    # -----------------------------------------------------------------
+    # added after parent function was completed -- otherwise would have been added differently
+    # monogram_position_df = _gather_monogram_reported_mutations(mutations_df, loci)
+    # scores_df = scores_df.merge(monogram_position_df, how='left')
+
+    print()
+
+    return scores_df
+
+
+class MutationIndex(namedtuple('MutationIndex',
+                                 ['mutations', 'accession_codes', 'offsets',
+                                  'accessions'])):
+    """
+    Inverted index of the accessions in which each mutation was observed.
+
+        mutations       : DataFrame of distinct (MUTATION, AA)
+        accession_codes : sorted codes of the accessions with mutation [k]
+                          are accession_codes[offsets[k]:offsets[k + 1]]
+        offsets         : int array (one longer than {mutations})
+        accessions      : ACCESSION of each code
+    """
+    __slots__ = ()
+
+
+def index_accessions_by_mutation(position_df):
+    """
+    Builds a MutationIndex from a position (or scored) dataframe.
+    """
+    import pandas as pd
+    import numpy as np
+
+    accession_codes, accessions = pd.factorize(position_df['ACCESSION'])
+
+    observed = pd.DataFrame({'MUTATION': position_df['MUTATION'].to_numpy(),
+                             'AA': position_df['AA'].to_numpy(),
+                             'ACCESSION_CODE': accession_codes})\
+        .drop_duplicates()
+
+    mutation_codes = observed\
+        .groupby(['MUTATION', 'AA'], dropna=False, sort=False)\
+        .ngroup()\
+        .to_numpy()
+
+    # Group by mutation; sort accessions within each mutation
+    order = np.lexsort((observed['ACCESSION_CODE'].to_numpy(), mutation_codes))
+
+    mutations = observed[['MUTATION', 'AA']]\
+        .drop_duplicates()\
+        .reset_index(drop=True)
+
+    offsets = np.concatenate(
+        [[0], np.cumsum(np.bincount(mutation_codes,
+                                    minlength=len(mutations)))])
+
+    return MutationIndex(
+        mutations=mutations,
+        accession_codes=observed['ACCESSION_CODE'].to_numpy()[order],
+        offsets=offsets,
+        accessions=accessions)
+
+
+def match_mutation_index(mutation_index, positions, aas):
+    """
+    Returns the accessions with every component of a complex rule;
+    i.e., for each j, a MUTATION starting with {positions[j]} (e.g., 'M184')
+    and an AA among the letters of {aas[j]} (e.g., 'IV').
+
+    Each component is the union of the accessions of its matching
+    mutations; the rule is the intersection of its components.
+    """
+    matched = _match_mutation_codes(mutation_index, positions, aas)
+
+    return mutation_index.accessions[matched].to_list()
+
+
+def _match_mutation_codes(mutation_index, positions, aas):
+    import numpy as np
+
+    mutations = mutation_index.mutations
+    matched = None
+
+    for j in range(0, len(positions)):
+        component = mutations['MUTATION'].str.startswith(
+            positions[j], na=False) & mutations['AA'].str.contains(
+            f'[{aas[j]}]', regex=True, na=False)
+
+        component_codes = np.unique(np.concatenate(
+            [np.empty(0, dtype=int)] +
+            [mutation_index.accession_codes[
+                mutation_index.offsets[k]:mutation_index.offsets[k + 1]]
+             for k in np.flatnonzero(component.to_numpy())]))
+
+        if matched is None:
+            matched = component_codes
+        else:
+            matched = np.intersect1d(matched, component_codes,
+                                     assume_unique=True)
+
+        if len(matched) == 0:
+            break
+
+    if matched is None:
+        return np.empty(0, dtype=int)
+
+    return matched
+
+
+def tokenize_complex_rules(complex_rules):
+    """
+    Parses each complex rule (see load_hivdb_scores) into its components.
+
+    # RULE_ID   RULE            POSITIONS   RULE_POSITIONS  RULE_AAS
+    # ---------------------------------------------------------------
+    # 0         L74IV + M184V   L74-M184    [L74, M184]     [IV, V]
+    """
+    import re
+
+    rule_tokens = complex_rules[['RULE']].reset_index(drop=True)
+    rule_tokens.index.name = 'RULE_ID'
+
+    # Extract a '-' delimitted list of the positions
+    #   (exclude any/all amino acids involved in a mutation)
+    rule_tokens['POSITIONS'] = [
+        '-'.join([re.search('([A-Z][\d]+)', i).group(1).strip()
+                  for i in rule.split('+')])
+        for rule in rule_tokens['RULE']]
+
+    rule_tokens['RULE_POSITIONS'] = [
+        re.findall('([A-Z][\d][\d]?[\d]?)', rule)
+        for rule in rule_tokens['RULE']]
+    rule_tokens['RULE_AAS'] = [
+        re.findall('[\d][\d]?[\d]?([A-Z]+)', rule)
+        for rule in rule_tokens['RULE']]
+
+    return rule_tokens
+
+
+def calculate_total_resistance(position_df, complex_rules, rule_tokens=None):
+    """
+    Sums the simple scores of each test accession (max per position) and
+    the penalties of the complex rules that apply to it (max per
+    combination of positions) and categorizes the predicted resistance.
+
+    {rule_tokens} are the complex rules already parsed (see
+    tokenize_complex_rules and load_hivdb_ruleset).
+    """
+    import pandas as pd
+    from warnings import simplefilter
+
+    # Future Warning: Setting an item of incompatible dtype is deprecated
+    # This appears to be a bug in pandas 2.1.1
+    # See https://github.com/pandas-dev/pandas/issues/55025
+    simplefilter(action='ignore', category=FutureWarning)
+
+    # PerformanceWarning: DataFrame is highly fragmented.
+    # This new to pandas 2.0(+)
+    # See https://stackoverflow.com/questions/68292862
+    simplefilter(action="ignore", category=pd.errors.PerformanceWarning)
+
+    non_arv_cols = ['RULE', 'POSITION', 'AA', 'RESISTANCE_TYPE']
+    arv_cols = [col for col in complex_rules.columns
+                if col not in non_arv_cols]
+
+    complex_rules_df_max = _complex_rule_penalties(
+        position_df, complex_rules, arv_cols, rule_tokens=rule_tokens)
+
+    simple_scores_df = _simple_scores(position_df, arv_cols)
+
+    return _total_resistance(simple_scores_df, complex_rules_df_max)
+
+
+def _complex_rule_penalties(position_df, complex_rules, arv_cols,
+                            rule_tokens=None):
+    """
+    Max penalty of the complex rules that apply to each test accession,
+    per combination of positions (see calculate_total_resistance).
+    """
+    import pandas as pd
+    import numpy as np
+
+    # Accessions in which each mutation was observed (built once)
+    mutation_index = index_accessions_by_mutation(position_df)
+
+    # Parse each complex rule once (unless already parsed)
+    if rule_tokens is None:
+        rule_tokens = tokenize_complex_rules(complex_rules)
+
+    # Accessions to which each rule applies
+    rule_hits = [_match_mutation_codes(mutation_index, pos, aas)
+                 for pos, aas in zip(rule_tokens['RULE_POSITIONS'],
+                                     rule_tokens['RULE_AAS'])]
+
+    # Flat table of hits; one row per rule, per test accession
+    #   to which the rule applies
+    hits_df = pd.DataFrame({
+        'ACCESSION': mutation_index.accessions[
+            np.concatenate([np.empty(0, dtype=int)] + rule_hits)],
+        'RULE_ID': np.repeat(rule_tokens.index.to_numpy(),
+                             [len(hits) for hits in rule_hits])})
+
+    # Attach penalties (by rule; the last listed if a rule is duplicated)
+    #
+    # ACCESSION ABC AZT FTC 3TC TDF ... RULE            POSITIONS
+    # -----------------------------------------------------------
+    # 18-157409 15  0   0   0   0   ... L74IV + M184V   L74-M184
+    penalties = complex_rules[['RULE'] + arv_cols]\
+        .drop_duplicates(subset='RULE', keep='last')
+
+    complex_rules_df = hits_df\
+        .join(rule_tokens[['RULE', 'POSITIONS']], on='RULE_ID')\
+        .merge(penalties, on='RULE', how='left')\
+        [['ACCESSION'] + arv_cols + ['RULE', 'POSITIONS']]
+
+    # Take the max *complex* penalty at each position
+    #
+    # ACCESSION	    ABC	    AZT	    FTC	 ...   RULE	            POSITIONS
+    # -------------------------------------------------------------------
+    # 06-153017	    10.0	10.0	0.0	 ...   Q151M + M184IV	Q151-M184
+    # 09-135810	    10.0	10.0	0.0	 ...   Q151M + M184IV	Q151-M184
+    complex_rules_df_max = complex_rules_df\
+        .drop(columns='RULE')\
+        .groupby(['ACCESSION', 'POSITIONS'])\
+        .agg('max')\
+        .reset_index()
+
+    # Validate at
+    # https://hivdb.stanford.edu/hivdb/by-patterns/
+
+    return complex_rules_df_max
+
+
+def _simple_scores(position_df, arv_cols):
+    """
+    Sum of the max simple score at each position, per test accession
+    (see calculate_total_resistance).
+    """
+    # Take the max *simple* penalty at each position
+    # And sum all position-penalties within each test accession
+    #
+    # PAT_MRN_ID	COLLECTED_DATE	ACCESSION	ABC	AZT	FTC	...
+    # ----------------------------------------------------------------------
+    # 9415	        2013-06-28	    13-134628	0.0	0.0	0.0	...
+    # 33464	        2006-07-21	    06-132370	0.0	0.0	0.0	...
+    position_cols = ['PAT_MRN_ID', 'COLLECTED_DATE', 'ACCESSION', 'POSITION']
+    simple_scores_df = position_df[position_cols + arv_cols]\
+        .groupby(position_cols)\
+        .agg('max')\
+        .reset_index()\
+        .drop(columns='POSITION')\
+        .groupby(position_cols[0:3])\
+        .agg('sum')\
+        .reset_index()
+
+    return simple_scores_df
+
+
+def _total_resistance(simple_scores_df, complex_rules_df_max):
+    """
+    Joins simple scores and complex penalties, in long format, and
+    categorizes the total (see calculate_total_resistance).
+    """
+    # Transform *simple* scores from wide to long
+    #
+    # PAT_MRN_ID	COLLECTED_DATE	ACCESSION	ARV	    SIMPLE_SCORE
+    # --------------------------------------------------------------
+    # 9415	        2013-06-28	    13-134628	ABC	    0.0
+    # 33464	        2006-07-21	    06-132370	ABC	    0.0
+    simple_scores_df_melt = simple_scores_df\
+        .groupby(['PAT_MRN_ID', 'COLLECTED_DATE', 'ACCESSION'])\
+        .agg('sum')\
+        .reset_index()\
+        .melt(id_vars=['PAT_MRN_ID', 'COLLECTED_DATE', 'ACCESSION'],
+              var_name='ARV',
+              value_name='SIMPLE_SCORE')
+
+    # Transform *complex* scores from wide to long
+    #
+    # ACCESSION	    ARV	    COMPLEX_PENALTY
+    # -------------------------------------
+    # 02-126831	    ABC	    20.0
+    # 02-128088	    ABC	    0.0
+    complex_rules_df_melt = complex_rules_df_max\
+        .drop(columns='POSITIONS')\
+        .groupby('ACCESSION')\
+        .agg('sum')\
+        .reset_index()\
+        .melt(id_vars=['ACCESSION'],
+              var_name='ARV',
+              value_name='COMPLEX_PENALTY')
+
+    # Join *simple* and *complex* scores
+    total_scores_df = simple_scores_df_melt.merge(
+        complex_rules_df_melt,
+        left_on=['ACCESSION', 'ARV'], 
+        right_on=['ACCESSION', 'ARV'], how='outer')
+
+    # Total score = Simple score + Complex score
+    total_scores_df.fillna(0, inplace=True)
+    total_scores_df['TOTAL_SCORE'] = \
+        total_scores_df[['SIMPLE_SCORE', 'COMPLEX_PENALTY']].sum(axis=1,
+                                                                 skipna=True)
+
+    # Categorize Stanford predicted level of resistance
+    total_scores_df.loc[
+        total_scores_df['TOTAL_SCORE'].between(0, 9),
+        'RESISTANCE_CATEGORY'] = 'Suceptible'
+
+    total_scores_df.loc[
+        total_scores_df['TOTAL_SCORE'].between(10, 14),
+        'RESISTANCE_CATEGORY'] = 'Potential low-level'
+
+    total_scores_df.loc[
+        total_scores_df['TOTAL_SCORE'].between(15, 29),
+        'RESISTANCE_CATEGORY'] = 'Low'
+
+    total_scores_df.loc[
+        total_scores_df['TOTAL_SCORE'].between(30, 59),
+        'RESISTANCE_CATEGORY'] = 'Intermediate'
+
+    total_scores_df.loc[
+        total_scores_df['TOTAL_SCORE'] >= 60,
+        'RESISTANCE_CATEGORY'] = 'High'
+
+    return total_scores_df
+
+
+def _mutation_profiles(df, group_cols, member_cols):
+    """
+    Numbers the distinct profiles (sets of {member_cols} values) of the
+    groups of {df}.
+
+    Returns
+    -------
+    profiles : DataFrame
+        {group_cols} and PROFILE, one row per group; the first group with
+        each profile is its REPRESENTATIVE
+    """
+    import pandas as pd
+
+    members = df[group_cols].copy()
+    members['MEMBER'] = df[member_cols[0]].astype(str)
+    for col in member_cols[1:]:
+        members['MEMBER'] += '\t' + df[col].astype(str)
+
+    # Canonical signature; e.g., 'K103N\tN\nM184V\tV'
+    signatures = members\
+        .drop_duplicates()\
+        .sort_values(group_cols + ['MEMBER'])\
+        .groupby(group_cols, sort=False)['MEMBER']\
+        .agg('\n'.join)
+
+    profiles = signatures.index.to_frame(index=False)
+    profiles['PROFILE'] = pd.factorize(signatures)[0]
+    profiles['REPRESENTATIVE'] = ~profiles['PROFILE'].duplicated()
+
+    return profiles
+
+
+def calculate_total_resistance_by_profile(position_df, scores, complex_rules,
+                                          rule_tokens=None):
+    """
+    Same as calculate_total_resistance(score_positioned_mutations(
+    position_df, scores), complex_rules), but each distinct mutation profile
+    is scored, totalled and categorized once and the results are broadcast
+    to every test accession with that profile.
+
+    Many accessions share identical sets of mutations at a locus (e.g., the
+    same single DRM). A profile is the set of (POSITION, AA, MUTATION) of a
+    test accession, which decides both its simple scores and the complex
+    rules that apply to it. An accession with a missing PAT_MRN_ID,
+    COLLECTED_DATE or POSITION (or more than one PAT_MRN_ID or
+    COLLECTED_DATE) is a profile of its own, since calculate_total_resistance
+    totals it apart from the rest. The number of profiles scored and cache
+    hits are printed (and kept in the returned dataframe's
+    attrs['PROFILE_CACHE']).
+
+    Parameters
+    ----------
+    position_df : DataFrame
+        Unscored (see melt_mutations_to_position)
+
+    scores : DataFrame or ScoreTensor
+        Simple scores (see score_positioned_mutations)
+
+    complex_rules : DataFrame
+
+    rule_tokens : DataFrame
+        See tokenize_complex_rules
+    """
     import pandas as pd
     import numpy as np
-    import re
-    from collections import OrderedDict as o
 
-    from warnings import simplefilter
+    test_cols = ['PAT_MRN_ID', 'COLLECTED_DATE', 'ACCESSION']
+
+    # PROFILES
+    # --------
+    # Accessions that are their own profile are keyed on their ACCESSION
+    incomplete = position_df[test_cols + ['POSITION']].isnull().any(axis=1)
+    ambiguous = position_df\
+        .groupby('ACCESSION')[['PAT_MRN_ID', 'COLLECTED_DATE']]\
+        .nunique(dropna=False)\
+        .gt(1)\
+        .any(axis=1)
+    own_profile = position_df['ACCESSION'].isin(
+        position_df.loc[incomplete, 'ACCESSION']) | \
+        position_df['ACCESSION'].isin(ambiguous.index[ambiguous])
+
+    profile_df = position_df[['ACCESSION', 'POSITION', 'AA', 'MUTATION']]\
+        .assign(OWN_PROFILE=np.where(own_profile,
+                                     position_df['ACCESSION'].astype(str),
+                                     ''))
+    profiles = _mutation_profiles(
+        profile_df, ['ACCESSION'], ['OWN_PROFILE', 'POSITION', 'AA',
+                                    'MUTATION'])
+
+    # SCORE EACH PROFILE ONCE
+    # -----------------------
+    # (rows without an ACCESSION belong to no profile; scored as they are)
+    representatives = profiles[profiles['REPRESENTATIVE']]
+    representative_df = position_df[
+        position_df['ACCESSION'].isin(representatives['ACCESSION']) |
+        position_df['ACCESSION'].isnull()]
+
+    representative_totals_df = calculate_total_resistance(
+        score_positioned_mutations(representative_df, scores), complex_rules,
+        rule_tokens=rule_tokens)
+
+    # BROADCAST
+    # ---------
+    # Every other accession takes the totals and categories of its
+    #   profile's representative
+    representative_of = representatives.set_index('PROFILE')['ACCESSION']
+    others = profiles.loc[~profiles['REPRESENTATIVE'], ['ACCESSION']]
+    others['REPRESENTATIVE'] = profiles.loc[
+        ~profiles['REPRESENTATIVE'], 'PROFILE'].map(representative_of)
+
+    tests = position_df[test_cols].drop_duplicates(subset='ACCESSION')
+
+    broadcast_df = others\
+        .merge(representative_totals_df
+               .drop(columns=['PAT_MRN_ID', 'COLLECTED_DATE'])
+               .rename(columns={'ACCESSION': 'REPRESENTATIVE'}),
+               on='REPRESENTATIVE')\
+        .drop(columns='REPRESENTATIVE')\
+        .merge(tests, on='ACCESSION')
+
+    total_scores_df = pd.concat(
+        [representative_totals_df,
+         broadcast_df[representative_totals_df.columns]])
+
+    # In the order of calculate_total_resistance; by ARV then test for
+    #   tests with simple scores, followed by (ARV then accession) those
+    #   with only complex penalties
+    arv_order = pd.Categorical(
+        total_scores_df['ARV'],
+        categories=representative_totals_df['ARV'].unique(), ordered=True)
+    total_scores_df = total_scores_df.assign(ARV_ORDER=arv_order.codes)
+
+    simply_scored = total_scores_df['ACCESSION'].isin(
+        position_df.loc[~incomplete, 'ACCESSION'])
+    total_scores_df = pd.concat([
+        total_scores_df[simply_scored].sort_values(
+            ['ARV_ORDER'] + test_cols, kind='stable'),
+        total_scores_df[~simply_scored].sort_values(
+            ['ARV_ORDER', 'ACCESSION'], kind='stable')])\
+        .drop(columns='ARV_ORDER')\
+        .reset_index(drop=True)
+
+    # Cache statistics
+    profile_cache = {'TESTS': len(profiles),
+                     'PROFILES': len(representatives),
+                     'HITS': len(others)}
+
+    hit_rate = profile_cache['HITS'] / max(len(profiles), 1)
+    print(f"{profile_cache['PROFILES']} distinct profiles scored for "
+          f"{len(profiles)} tests ({profile_cache['HITS']} cache hits, "
+          f"{hit_rate:.1%})")
+
+    total_scores_df.attrs['PROFILE_CACHE'] = profile_cache
 
-    # Future Warning: Setting an item of incompatible dtype is deprecated
-    # This appears to be a bug in pandas 2.1.1
-    # See https://github.com/pandas-dev/pandas/issues/55025
-    simplefilter(action='ignore', category=FutureWarning)
+    return total_scores_df
 
-    # PerformanceWarning: DataFrame is highly fragmented.
-    # This new to pandas 2.0(+)
-    # See https://stackoverflow.com/questions/68292862
-    simplefilter(action="ignore", category=pd.errors.PerformanceWarning)
 
-    loci = loci.upper()
-    if loci.upper() not in ['RT', 'PI', 'PR', 'INSTI']:
-        raise ValueError('Loci argument must be one of [RT, PI/PR, INSTI]')
+def _extract_fold_change_as_dict(sample_text: str, test_type: str,
+                                 sections: dict = None) -> dict:
+    """
+    Extract fold change info from text of parsed PDF report.
+    The data elements always follow the same ordering though
+    some may be missing.
 
-    loci_list = loci + '_LIST'
-    if loci_list not in mutations_df.columns:
-        raise ValueError(f'DataFrame has no {loci_list} field.')
+    Parameters
+    ----------
+    sample_text : str
+        Text from parsed PDF report
 
-    # Make a copy of the mutations dataframe (one list per test/row)
-    df = mutations_df.copy()
+    test_type : str
 
-    print(f'Extracting positions of mutations within the {loci_list} locus.')
-    print('All values of "None" must be set to missing to allow ')
-    print('     filling mutations forward over time (within patient).')
-    print()
+    sections : dict
+        Output of index_report_sections (computed if not given)
 
-    # Keep only
-    #   (1) completed tests
-    #   (2) with a medical record number
-    #   (3) non-null list of loci-specific mutations (e.g., RT_list)
-    print('Dropped')
+    Returns
+    ----------
+    arv_fold_change_dict : dict
+        Keys are ARVs, Values are a dictionary
+    """
+    import re
 
-    have_mutations_list = (df[loci_list].notnull())
-    print(f'  - {len(df[~have_mutations_list])} without observed mutations at the {loci} locus')
-    df = df[have_mutations_list]
+    # Search only the drug table
+    sample_text = _section_text(sample_text, sections, 'DRUG_TABLE')
 
-    complete_test = (df['REPORT_COMPLETE'] == True)
-    print(f'  - {len(df[~complete_test])} incomplete test accessions')
-    df = df[complete_test]
+    # Empty ARV Fold Change dict
+    arv_fold_change_dict = {}
 
-    have_mrn = (df['PAT_MRN_ID'].notnull())
-    print(f'  - {len(df[~have_mrn])} test accessions with no MRN')
-    df = df[have_mrn]
-    print('')
+    ##################
+    # Phenosense-Entry
+    ##################
+    if test_type.upper() == 'PHENOSENSE-ENTRY':
+        # Enfuvirtide Fuzeon0.019434 0.51    ENF
+        ic50_fold_change =re.search(
+            '(?<=Enfuvirtide)[ ]*Fuzeon([\d.]+)[ ]+([\d.]+)[ ]*(?=ENF)',
+            sample_text)
 
-    order_info_cols = ['PAT_MRN_ID', 'COLLECTED_DATE', 'ACCESSION']
-    df = df[order_info_cols + [loci_list]]
+        if not ic50_fold_change:
+            arv_fold_change_dict['ENF'] = {
+                'IC50': None,
+                'FOLD_CHANGE': None,
+                'BIOLOGICAL_CUTOFF': None
+            }
+
+        # The upper bound for ENV sensitivity is a fold change of 6.48
+        # The lower bound (hyper-sensitivity) is 0.42
+        if ic50_fold_change:
+            arv_fold_change_dict['ENF'] = {
+                'IC50': float(ic50_fold_change.group(1).strip()),
+                'FOLD_CHANGE': float(ic50_fold_change.group(2).strip()),
+                'BIOLOGICAL_CUTOFF': 6.48
+            }
+
+    ######################
+    # All other test types
+    ######################
+    else:
+        fold_change_patterns = arv_pattern_registry(test_type)['FOLD_CHANGE']
 
-    # Split off patients with a single test
-    #   to reduce processing time in the step below,
-    #   which is required only for patients with multiple tests
-    have_multiple_tests = df \
-        .groupby('PAT_MRN_ID')['ACCESSION'] \
-        .transform('nunique') > 1
+        for attr, unboosted_pattern, boosted_pattern in fold_change_patterns:
+            # (('Ziagen', 'Abacavir', 'ABC', '1998-12-17'), ...)
 
-    single_test_df = df[~have_multiple_tests].copy()
-    # alphabetize/standardize the {loci_list} components
-    single_test_df[loci_list] = single_test_df[loci_list].apply(lambda x: ",".join(sorted(x.split(","))))
+            # Unboosted ARVs
+            unboosted = unboosted_pattern.search(sample_text)
 
-    # multiple_test_df = df[have_multiple_tests].copy()
-    # Patients never actually "lose" a mutation; it's just unobserved due to 
-    #   a combination of treatment-inhibition and between-strain-competition.
-    # Therefore, we want to fill mutations over time, within patient.
-    # However, mutations are currently in an unordered list.
-    # In order to create a standardized order of mutations,
-    #   we will first create columns from the entries in {loci-list}
+            if unboosted:
+                fold_change = unboosted.group(2)
 
-    # Removed in favor of Ordered Dict approach
-    # for i, row in multiple_test_df.iterrows():
-    #    for mutation in row[loci_list].split(','):
-    #        multiple_test_df.loc[i, mutation.strip()] = mutation.strip()
-    # multiple_test_df.drop(columns=loci_list, inplace=True)
+                # (lower, upper)
+                if '-' in unboosted.group(1):
+                    lower_cutoff, upper_cutoff = unboosted\
+                        .group(1).split('-')
 
-    # PAT_MRN_ID     COLLECTED_DT     ...     Q102K     C162S     T200T/A     R211K     V245E/K     M184M/V
-    # -----------------------------------------------------------------------------------------------------
-    #   0000000       2018-02-14      ...      NaN       NaN        NaN       R211K      NaN         NaN
-    #   0000000       2018-02-14      ...      NaN       NaN        NaN       R211K      NaN        M184M/V
+                    arv_fold_change_dict[attr[2]] = {
+                        'FOLD_CHANGE': fold_change.strip(),
+                        'LOWER_CUTOFF': lower_cutoff.strip(),
+                        'UPPER_CUTOFF': upper_cutoff.strip()
+                    }
 
-    # ... then we will fill forward over time (within patient)
-    # multiple_test_df.sort_values(['PAT_MRN_ID', 'COLLECTED_DATE'], inplace=True)
-    # mutation_dummy_cols = [i for i in multiple_test_df.columns if i not in order_info_cols]
+                # (single cutoff)
+                else:
+                    arv_fold_change_dict[attr[2]] = {
+                        'FOLD_CHANGE': fold_change.strip(),
+                        'BIOLOGICAL_CUTOFF': unboosted.group(1).strip()
+                        }
+
+            # Boosted ARVs include '/r' after brand name
+            boosted = boosted_pattern.search(sample_text)
+
+            if boosted:
+                fold_change = boosted.group(2)
+
+                # (lower, upper)
+                if '-' in boosted.group(1):
+                    lower_cutoff, upper_cutoff = boosted\
+                        .group(1).split('-')
+
+                    arv_fold_change_dict[f'{attr[2]}_r'] = {
+                        'FOLD_CHANGE': fold_change.strip(),
+                        'LOWER_CUTOFF': lower_cutoff.strip(),
+                        'UPPER_CUTOFF': upper_cutoff.strip()
+                        }
+
+                # (single cutoff)
+                else: 
+                    arv_fold_change_dict[f'{attr[2]}_r'] = {
+                        'FOLD_CHANGE': fold_change.strip(),
+                        'BIOLOGICAL_CUTOFF': boosted.group(1).strip()
+                        }
+
+    # Add resistance category to dict
+    for arv, attr in arv_fold_change_dict.items():
+        fold_change = arv_fold_change_dict[arv]['FOLD_CHANGE']
+
+        if '>' in attr['FOLD_CHANGE']:
+            attr['RESISTANCE_CAT'] = 'Resistant'
+
+        # Biological cutoffs are used for specific antiretrovirals
+        elif 'BIOLOGICAL_CUTOFF' in attr.keys():
+            if float(fold_change) > float(attr['BIOLOGICAL_CUTOFF']):
+                attr['RESISTANCE_CAT'] = 'Resistant'
 
-    # multiple_test_df[mutation_dummy_cols] = multiple_test_df \
-    #     .groupby('PAT_MRN_ID')[mutation_dummy_cols] \
-    #     .transform(lambda x: x.ffill())
-    # multiple_test_df.reset_index(drop=True, inplace=True)
+            elif float(fold_change) <= float(attr['BIOLOGICAL_CUTOFF']):
+                attr['RESISTANCE_CAT'] = 'Sensitive'
 
-    # ... and use the dummy columns to re-create the {loci-list} field
-    #   in a standardized order (per patient, overtime)
-    # for i, row in multiple_test_df.iterrows():
-        # that are not null
-    #    nonnull_mask = (row[mutation_dummy_cols].isnull() == False)
-    #    # re-create
-    #    multiple_test_df.loc[i, loci_list] = ','.join(row[mutation_dummy_cols][nonnull_mask].index.tolist()).strip()
+        # All others use clinical cutoffs
+        else:
+            if float(fold_change) > float(attr['UPPER_CUTOFF']):
+                attr['RESISTANCE_CAT'] = 'Resistant'
 
+            elif float(fold_change) <= float(attr['LOWER_CUTOFF']):
+                attr['RESISTANCE_CAT'] = 'Sensitive'
 
-    # Patients never actually "lose" a mutation; it's just unobserved due to 
-    #   a combination of treatment-inhibition and between-strain-competition.
-    # Therefore, we want to fill mutations over time, within patient.
-    # However, mutations are currently in an unordered list.
-    # Use an Ordered Dict{ } to standardize the order of mutations with the lists.
-    multiple_test_df = df[have_multiple_tests].copy()
-    multiple_test_df.sort_values(['PAT_MRN_ID', 'COLLECTED_DATE'], inplace=True)
-    multiple_test_df.reset_index(inplace=True, drop=True)
+            else:
+                attr['RESISTANCE_CAT'] = 'Partially Sensitive'
 
-    for i, row in multiple_test_df.iterrows():
-        if (i > 0) and (row['PAT_MRN_ID'] == multiple_test_df.loc[i-1]['PAT_MRN_ID']):
-            combined_list = multiple_test_df.loc[i-1][loci_list] + ',' + row[loci_list]
-            multiple_test_df.loc[i, loci_list] = combined_list
+        arv_fold_change_dict[arv] = attr
 
-    multiple_test_df.loc[:, loci_list] = [
-        ', '.join(o.fromkeys(x.split(','), 1))
-        for x in multiple_test_df[loci_list]]
+    return arv_fold_change_dict
 
-    # Recombine dataframes
-    position_df = pd.concat([single_test_df,
-                            multiple_test_df[order_info_cols + [loci_list]]])
-    position_df.reset_index(inplace=True, drop=True)
 
-    # Pivot from wide to long (create mutation dummies)
-    dummies_df = position_df[loci_list].str.split(",", expand=True)
+def _extract_ic50_as_dict(sample_text: str, sections: dict = None) -> dict:
+    import re
 
-    # 0	        1           2           ...
-    # ------------------------------------------
-    # V245V/M   D123E      np.NaN
+    sample_text = _section_text(sample_text, sections, 'IC50')
 
-    # Join (left) the dummies back into the position_df to get order info
-    position_df = position_df[order_info_cols] \
-        .merge(dummies_df, left_index=True, right_index=True, how='left')
+    drugs = re.search(
+        '(?<=Patient-specific)[ ]*Results[ ]*Drugs[ ]*([A-Za-z\d\s/]+?)(?=IC50)', sample_text)
+    # all digits and ">MAX" until start of Fold-change results
+    ic50 = re.search(
+        '(?<=IC50)[\D]*?([\d\s.>MAX]*)(?=F)', sample_text)
 
-    # Melt from wide to long
-    # LINE is currently redundant with ACCESSION (but used in a later step)
-    position_df = position_df.melt(id_vars=order_info_cols) \
-        .sort_values(['PAT_MRN_ID', 'COLLECTED_DATE', 'variable']) \
-        .rename(columns={'variable': 'LINE', 'value': 'MUTATION'})
+    ic50_dict = dict(zip(drugs.group(1).strip().split(' '),
+                         ic50.group(1).strip().split(' ')))
 
-    # remove any spaces at the begining of mutations (pre-cautinary)
-    position_df['MUTATION'] = position_df['MUTATION'].str.strip()
+    return ic50_dict
 
-    # Drop duplicates (artefact of filling mutations over time)
-    position_df.drop_duplicates(subset=['ACCESSION', 'MUTATION'], inplace=True)
 
-    # ACCESSION	    LINE	MUTATION
-    # ------------------------------
-    # 09-150972	    7	    V245V/M
-    # 09-150972     8 	    D123E
+def _extract_replication_capacity_tuple(sample_text: str,
+                                        sections: dict = None):
+    import re
 
-    # Drop all null values generated during the melting process
-    position_df = position_df.loc[position_df['MUTATION'].notnull()]
+    sample_text = _section_text(sample_text, sections, 'REPLICATION')
 
-    # Extract the position and amino acid from mutations
-    position_df['POSITION'] = position_df['MUTATION'].str.extract('[A-Z]([\d]+)')
-    position_df['AA'] = position_df['MUTATION'].str.extract('[\d]+([A-Z/\^]*)')
+    # Phenosense Integrase added the "Integrase" word to the text below
+    # (?=Replication)
+    # Nevertheless, the search phrase is specific enough that
+    #   it does not yield any false-positives
+    rep_capacity_and_bounds = re.search(
+        '(?<=Capacity)[ ]*=[ ]*([\d.]+)%\(Range[ ]*([\d.]+)%-([\d.]+)%\)',
+        sample_text)
 
-    # ACCESSION	    LINE	MUTATION	POSITION    AA
-    # ------------------------------------------------
-    # 09-150972	    7	    V245V/M	    245         V/M
-    # 09-150972     8 	    D123E	    123         E
+    if rep_capacity_and_bounds:
+        rep_capacity = float(rep_capacity_and_bounds.group(1).strip())/100
+        lower_bound = float(rep_capacity_and_bounds.group(2).strip())/100
+        upper_bound = float(rep_capacity_and_bounds.group(3).strip())/100
 
-    # Set aside insertions (e.g., T69T/S/SSS) and deletions (e.g., E/^, T/^)
-    #   in order to count the components of each substitution mixture
-    #
-    # T69T/S/SSS refers to an amino acid insertion between codons 67 and 70 in the
-    #   reverse transcriptase of HIV-1. By convention, it is assigned to codon 69.
-    insertion_mask = (position_df['MUTATION'].str.contains('[A-Z][A-Z]+'))
-    deletion_mask = (position_df['MUTATION'].str.contains('\^', na=False))
+        return (rep_capacity, lower_bound, upper_bound)
 
-    position_df.loc[insertion_mask, 'AA'] = 'ins'
-    position_df.loc[deletion_mask, 'AA'] = 'del'
-    # remove the '/^' from deletions
-    position_df.loc[deletion_mask, 'MUTATION'] = position_df.loc[deletion_mask]['MUTATION'].str.replace('\/.*', '', regex=True)
+    else:
+        return (None, None, None)
+
+
+def _reorder_phenotypic_columns(df):
+    # get list
+    cols = df.columns.to_list()
+
+    # order info
+    order_info = ['DOC_NAME', 'TEST_TYPE', 'REPORT_COMPLETE',
+                  'FAILURE_PHRASE', 'FULL_NAME',
+                  'PAT_MRN_ID', 'SSN', 'BIRTH_DATE', 'GENDER', 'ACCESSION',
+                  'ORDER_ID', 'REFERRING_PROV', 'COLLECTED_DATE',
+                  'RECEIVED_DATE', 'REPORTED_DATE', 'REPORT_STATUS',
+                  'MODE', 'REPLICATION_CAPACITY', 'REPLICATION_LOWER',
+                  'REPLICATION_UPPER']
+
+    order_info = [i for i in order_info if i in cols]
+
+    # ARV (resistance results) ordering
+    nrti = ['3TC', 'ABC', 'd4T', 'ddC', 'ddI', 'FTC', 'TFV', 'TAF', 'ZDV']
+    nnrti = ['DOR', 'DLV', 'EFV', 'ETR', 'NVP', 'RPV']
+    insti = ['BIC', 'CAB', 'DTG', 'EVG', 'RAL']
+    pi = ['AMP', 'AMPr', 'ATV', 'ATVr', 'DRV', 'DRVr', 'IDV', 'IDVr',
+          'LPV', 'LPVr', 'NFV', 'NFVr', 'RTV', 'RTVr', 'SQV', 'SQVr',
+          'TPV', 'TPVr']
+    fusion = ['ENF']
+    # trofile
+
+    nrti_cols = [i for i in nrti if i in cols]
+    nnrti_cols = [i for i in nnrti if i in cols]
+    insti_cols = [i for i in insti if i in cols]
+    pi_cols = [i for i in pi if i in cols]
+    fusion_cols = [i for i in fusion if i in cols]
+
+    # create re-ordered list of columns
+    cols_reordered = order_info + nrti_cols + nnrti_cols + pi_cols + insti_cols + fusion_cols
+    not_listed_error = [i for i in cols if i not in cols_reordered]
+
+    # apply it
+    df = df[cols_reordered + not_listed_error]
 
-    insertions_deletions = position_df['AA'].isin(['ins', 'del'])
+    return df
 
-    ins_del_df = position_df[insertions_deletions].copy()
-    # Remove insertions/deletions
-    position_df = position_df[~insertions_deletions].copy()
 
-    # Count the number of components in each substitution mixture
-    #   (one forward-slash per component)
-    position_df['MIXTURE_COMPONENTS'] = [
-        aa.count('/')+1 if '/' in aa else 1 for aa in position_df['MUTATION']]
+def _parse_phenotypic_report(path_to_pdf, test_type: str,
+                             scrape_kwargs: dict = None) -> tuple:
+    """
+    Scrapes a single phenotypic report and extracts its contents.
+
+    Parameters
+    ----------
+    path_to_pdf : PosixPath
 
-    position_df = position_df.loc[
-        np.repeat(position_df.index.values, position_df['MIXTURE_COMPONENTS'])]
+    test_type : str
 
-    # ACCESSION	    LINE	MUTATION	POSITION    AA      MIXTURE_COMPONENTS
-    # -------------------------------------------------------------------------
-    # 09-150972	    7	    V245V/M	    245         V/M             2
-    # 09-150972	    7	    V245V/M	    245         V/M             2   <<< Added
-    # 09-150972     8 	    D123E	    123         E               1
+    scrape_kwargs : dict
+        Passed to scrape_PDF_to_text (e.g., cache settings); see
+        _scrape_report
 
-    # drop the index (no longer meaningful after replication)
-    position_df.reset_index(drop=True, inplace=True)
+    Returns
+    -------
+    (record, fold_change_eav_df) : tuple
+        record is a dict of column names and values for one row of the
+        TEST dataframe; fold_change_eav_df is None for incomplete reports
+    """
+    # Parse PDF to text
+    sample_text, page_counts = _scrape_report(path_to_pdf, test_type,
+                                              scrape_kwargs=scrape_kwargs)
 
-    # Number the components of each mixture
-    # Must groupby LINE instead of POSITION since,
-    #   by filling mutations forward over time,
-    #   E40D and E40D/E may appear on the same accession
-    position_df['MIXTURE_POSITION'] = position_df.groupby(
-        ['ACCESSION', 'LINE', 'MIXTURE_COMPONENTS']).cumcount()
+    record, fold_change_eav_df = _extract_phenotypic_record(
+        sample_text, test_type, doc_name=path_to_pdf.name)
 
-    # LINE	MUTATION	POSITION    AA    MIXTURE_COMPONENTS    MIXTURE_POSITION
-    # --------------------------------------------------------------------------
-    # 7	    V245V/M	    245         V/M          2                   0
-    # 7	    V245V/M	    245         V/M          2                   1
-    # 8 	D123E	    123         E            1                   0
+    # Run metrics (removed by the caller)
+    if page_counts is not None:
+        record['_PAGE_COUNTS'] = page_counts
 
-    # Extract the component referenced by each position
-    # Extract the component referenced by each position
-    for i, row in position_df[position_df['MIXTURE_COMPONENTS'] >= 2].iterrows():
+    return record, fold_change_eav_df
 
-        if row['MIXTURE_POSITION'] == 0:
-            position_df.loc[i, 'AA'] = re.search(
-                '([A-Z])[/d][A-Z]', row['MUTATION']).group(1).strip()
 
-        else:
-            this_aa = re.search(
-                '[A-Z]/'*(int(row['MIXTURE_POSITION'])) + '([A-Z])', row['MUTATION'])
+def _extract_phenotypic_record(sample_text: str, test_type: str,
+                               doc_name: str, sections: dict = None) -> tuple:
+    """
+    Extracts one row of the TEST dataframe (and the report's rows of
+    the EAV dataframe) from scraped text.
+    """
+    import pandas as pd
 
-            if this_aa:
-                position_df.loc[i, 'AA'] = this_aa.group(1).strip()
-            else:
-                # Debugging
-                raise ValueError(i, row['MUTATION'], int(row['MIXTURE_POSITION']))
+    # Locate the report's sections (once, for all extractors)
+    if sections is None:
+        sections = index_report_sections(sample_text)
+
+    # Extract order info
+    order_info_dict = _extract_order_info_as_dict(sample_text=sample_text,
+                                                  genotypic=False,
+                                                  sections=sections)
+
+    record = {'TEST_TYPE': test_type.upper(),
+              'DOC_NAME': doc_name}
+    record.update(order_info_dict)
+
+    # If report is not marked "incomplete"
+    #   gather oberserved mutations
+    failure_phrase, _ = find_failure_phrase(sample_text=sample_text)
+    report_complete = failure_phrase is None
+    record['REPORT_COMPLETE'] = report_complete
+    record['FAILURE_PHRASE'] = failure_phrase
+
+    fold_change_eav_df = None
+
+    if report_complete:
+        fold_change_dict = _extract_fold_change_as_dict(
+            sample_text=sample_text, test_type=test_type, sections=sections)
+
+        # Entity-attribute-value (EAV) format
+        # One row per drug
+        #
+        # ARV   CUTOFF	FOLD_CHANGE	LOWER_CUTOFF	RESISTANCE_CAT	UPPER_CUTOFF
+        # ----------------------------------------------------------------------
+        # 3TC   3.5         9.74        NaN             Resistant	    NaN
+        # ABC   NaN         1.87        4.5             Sensitiive	    6.5
+        fold_change_eav_df = pd.melt(
+            pd.DataFrame(fold_change_dict).reset_index(),
+            id_vars='index', var_name='ARV')\
+            .pivot(index='ARV', columns='index', values='value')
+
+        #################################################
+        # IC50
+        #
+        # Was extacted in step above for Phenosense-Entry
+        #################################################
+        if not test_type.upper() == 'PHENOSENSE-ENTRY':
+            try:
+                ic50_dict = _extract_ic50_as_dict(sample_text=sample_text,
+                                                  sections=sections)
+
+                # Insert IC50 into EAV dataframe
+                for arv, ic50 in ic50_dict.items():
+                    fold_change_eav_df.loc[arv, 'IC50'] = ic50
+                    # IC50 value applies to the unboosted drug
+                    # Only lower/upper cutoff values change with boosting
+                    # So apply the value to both boosteda and unboosted
+                    fold_change_eav_df.loc[f'{arv}_r', 'IC50'] = ic50
+
+                # Remove rows where IC50 added but no fold-change reported
+                # For example, when only boosted DRV was reported drop
+                #   the row for unboosted DRV added by the above loop
+                fold_change_eav_df = fold_change_eav_df[
+                    fold_change_eav_df['RESISTANCE_CAT'].notnull()]
+
+            except ValueError:
+                pass
+
+        # Move 'ARV' field out of index
+        fold_change_eav_df['DOC_NAME'] = doc_name
+        fold_change_eav_df.reset_index(inplace=True)
+
+        # Insert resistance determination into TEST record
+        for arv, fold_change_attributes in fold_change_dict.items():
+            record[arv] = fold_change_attributes['RESISTANCE_CAT']
+
+        ###################################
+        # Replication Capacity
+        #
+        # Not reported for Phenosense-Entry
+        ###################################
+        if not test_type.upper() == 'PHENOSENSE-ENTRY':
+            # if not re.search('Replication capacity cannot be reported',
+            #                 sample_text):
+            try:
+                rep_capacity = _extract_replication_capacity_tuple(
+                    sample_text=sample_text, sections=sections)
+
+                # Insert replication capacity into TEST record
+                record['REPLICATION_CAPACITY'] = rep_capacity[0]
+                record['REPLICATION_LOWER'] = rep_capacity[1]
+                record['REPLICATION_UPPER'] = rep_capacity[2]
+
+            except ValueError:
+                pass
+
+    return record, fold_change_eav_df
+
+
+def parse_phenotypic_reports(path_to_zips, test_type, workers=1,
+                             cache_dir=None, compress_cache=False,
+                             max_cache_bytes=None, stream=False,
+                             incremental=False, queue_depth=None,
+                             timeout=None, isolate=False,
+                             checkpoint_every=None, resume=False,
+                             dedupe=False, page_limit=False, stop=None):
+    """
+    Returns two dataframes;
 
-    # LINE	MUTATION	POSITION    AA    MIXTURE_COMPONENTS    MIXTURE_POSITION
-    # --------------------------------------------------------------------------
-    # 7	    V245V/M	    245         V  **        2                   0
-    # 7	    V245V/M	    245         M  **        2                   1
-    # 8 	D123E	    123         E            1                   0
+    (1) Test dataframe contains one row per test accession/order
+
+    (2) EAV (entity-attribute-value) dataframe contains
+        one row per ARV, per test accession
+
+        # ARV   CUTOFF	FOLD_CHANGE	...	RESISTANCE_CAT  ...
+        # -------------------------------------------------
+        # 3TC   3.5         9.74    ...     Resistant   ...
+        # ABC   NaN         1.87    ...     Sensitiive  ...
 
-    # Drop the mixture columns (no longer needed)
-    position_df.drop(
-        columns=['MIXTURE_COMPONENTS', 'MIXTURE_POSITION'], inplace=True)
+    Parameters
+    ----------
+    path_to_zips : PosixPath
 
-    # Join back in the insertions and deletions that were removed earlier
-    position_df = pd.concat([position_df, ins_del_df], axis=0, sort=False)
-    position_df['POSITION'] = position_df['POSITION'].astype('float')
+    test_type : str
+        One of [Phenosense, Phenosense-GT,
+                Phenosense-Integrase, Phenosense-Entry]
+
+    workers : int
+        Number of processes used to scrape and extract reports
+        (1 = serial); output is identical regardless
+
+    cache_dir : PosixPath
+        Directory of the scraped-text cache (None = no caching)
+
+    compress_cache : bool
+        Write new cache entries gzip-compressed
+
+    max_cache_bytes : int
+        Evict least-recently-used cache entries beyond this size
+        at the end of the run (None = unbounded)
+
+    stream : bool
+        Read reports directly out of the .zip archives
+        rather than extracting them to disk
+
+    incremental : bool
+        Parse only reports that are new or changed since the last
+        incremental run (per the manifest kept in parsed-reports/)
+        and append them to the previously parsed results
+
+    queue_depth : int
+        Prefetch reports in a background thread and keep at most this
+        many in memory at each stage (None = read reports as they are
+        scraped); see _map_reports
+
+    timeout : float
+        Seconds allowed to scrape and extract each report, in a worker
+        process that is replaced if the report hangs. Reports that time
+        out or fail are skipped and listed in test_df.attrs['QUARANTINE']
+        (as records). None = no deadline
+
+    isolate : bool
+        Quarantine failing reports as above but without a deadline; implied
+        by a {timeout}. With neither, a failing report stops the run
+
+    checkpoint_every : int
+        Save parsed records to parsed-reports/phenotypic-checkpoint.pkl
+        every this many reports (None = no checkpoint); the checkpoint is
+        removed once the run completes
+
+    resume : bool
+        Resume an interrupted run; reports in its checkpoint (by DOC_NAME)
+        are not parsed again. The dataframes returned are identical to
+        those of an uninterrupted run. The run must be resumed with the
+        {dedupe}, {page_limit}, {stop}, {isolate} and {timeout} it was
+        started with (otherwise ValueError)
+
+    dedupe : bool or str
+        Parse only one of each set of duplicate reports; True = identical
+        bytes, 'accession' = also the same accession key (see
+        deduplicate_reports). The map of every DOC_NAME to the report
+        parsed in its place is kept in test_df.attrs['DUPLICATES'] (as
+        records)
+
+    page_limit : bool
+        Scrape at most page_budgets[test_type] pages of each report, as for
+        parse_genotypic_reports; pages scraped and saved are kept in
+        test_df.attrs['PAGES']
+
+    stop : function
+        Stop callback to use instead of required_sections_seen
+        (implies page_limit); picklable if workers > 1
+    """
+    from src.utils import extract_from_zips, prune_text_cache
+    import pandas as pd
+    import warnings
 
-    position_df.sort_values(
-        ['PAT_MRN_ID', 'COLLECTED_DATE', 'POSITION', 'LINE'], inplace=True)
-    position_df.reset_index(inplace=True, drop=True)
+    # Future Warning: Setting an item of incompatible dtype is deprecated
+    # This appears to be a bug in pandas 2.1.1
+    # See https://github.com/pandas-dev/pandas/issues/55025
+    warnings.simplefilter(action='ignore', category=FutureWarning)
 
-    return position_df
+    allowable_test_types = ['PHENOSENSE', 'PHENOSENSE-GT',
+                            'PHENOSENSE-INTEGRASE', 'PHENOSENSE-ENTRY']
+    if test_type.upper() not in allowable_test_types:
+        raise ValueError(f'Invalid test type ({allowable_test_types})')
 
+    # Extract PDF reports from Zip files
+    if incremental:
+        report_paths, manifest = _select_unparsed_reports(
+            path_to_zips, parser='phenotypic', stream=stream)
+
+        # Nothing new (or, on a first run, no reports at all)
+        if len(report_paths) == 0:
+            print(f"0 new {test_type} records parsed")
+            tables = _update_parsed_tables(
+                path_to_zips, parser='phenotypic', manifest=manifest,
+                tables=[None, None], doc_names=[])
+            return tuple(tables)
 
-def score_positioned_mutations(position_df, scores):
+    else:
+        report_paths = extract_from_zips(path_to_zips, stream=stream)
+        manifest = None
+
+    # Parse each distinct report once
+    #   (nor again those parsed by earlier incremental runs)
+    report_paths, duplicates, manifest = _deduplicate_report_paths(
+        report_paths, dedupe=dedupe, workers=workers, manifest=manifest)
+
+    # Every new report duplicates one parsed by an earlier run
+    if incremental and len(report_paths) == 0:
+        print(f"0 new {test_type} records parsed")
+        tables = _update_parsed_tables(
+            path_to_zips, parser='phenotypic', manifest=manifest,
+            tables=[None, None], doc_names=_duplicate_names(duplicates))
+        return tuple(tables)
+
+    if checkpoint_every or resume:
+        checkpoint_path = _parsed_reports_paths(
+            path_to_zips, parser='phenotypic')['checkpoint']
+        checkpoint_options = _checkpoint_options(
+            dedupe=dedupe, page_limit=page_limit, stop=stop,
+            isolate=isolate, timeout=timeout)
+    else:
+        checkpoint_path, checkpoint_options = None, None
 
-    # Match Stanford's mutation scores for each drug/ARV with observed mutations
-    #   (insertions match on 'ins', deletions match on 'del')
-    scores_df = position_df.copy()
-    for arv in [i for i in scores.columns if i not in ['RULE', 'POSITION', 'AA']]:
-        scores_df = scores_df.merge(scores[['POSITION', 'AA', arv]], 
-                                    on=['POSITION', 'AA'], how='left')
+    # Empty list (to fill with one dict per report)
+    # The TEST dataframe is built only once, after the loop
+    #   (growing a dataframe cell-by-cell is quadratic in the number of rows)
+    records = list()
 
-    # LABEL MUTATIONS IDENTIFIED AS 'RESISTANCE-ASSOCIATED' BY MONOGRAM
-    # -----------------------------------------------------------------
-    # added after parent function was completed -- otherwise would have been added differently
-    # monogram_position_df = _gather_monogram_reported_mutations(mutations_df, loci)
-    # scores_df = scores_df.merge(monogram_position_df, how='left')
+    # Empty list (to fill with dataframes)
+    # With multi-row dataframes it is more efficient to concatenate a list
+    #   due to the overhead of recreating the dataframe's index
+    eav_df_list = list()
 
-    print()
+    # Loop over PDF's
+    scrape_kwargs = {'cache_dir': cache_dir, 'compress_cache': compress_cache,
+                     'page_limit': page_limit or stop is not None,
+                     'stop': stop}
+    quarantine = list()
+    page_counts = list()
+    results = _map_reports(_parse_phenotypic_report, report_paths,
+                           test_type=test_type, workers=workers,
+                           queue_depth=queue_depth, timeout=timeout,
+                           isolate=isolate, quarantine=quarantine,
+                           checkpoint_path=checkpoint_path,
+                           checkpoint_every=checkpoint_every, resume=resume,
+                           checkpoint_options=checkpoint_options,
+                           scrape_kwargs=scrape_kwargs)
+
+    for result in results:
+        # Quarantined reports have no record
+        if result is None:
+            continue
+
+        record, fold_change_eav_df = result
+        records.append(record)
+
+        if '_PAGE_COUNTS' in record:
+            page_counts.append(record.pop('_PAGE_COUNTS'))
+
+        # Append to list of EAV dataframes
+        if fold_change_eav_df is not None:
+            eav_df_list.append(fold_change_eav_df)
 
-    return scores_df
+    df = pd.DataFrame.from_records(records)
 
+    # Bound the size of the scraped-text cache
+    if cache_dir is not None and max_cache_bytes is not None:
+        prune_text_cache(cache_dir, max_cache_bytes)
 
-def calculate_total_resistance(position_df, complex_rules):
-    import pandas as pd
-    import re
-    from warnings import simplefilter
+    df = _finalize_phenotypic_df(df=df)
 
-    # Future Warning: Setting an item of incompatible dtype is deprecated
-    # This appears to be a bug in pandas 2.1.1
-    # See https://github.com/pandas-dev/pandas/issues/55025
-    simplefilter(action='ignore', category=FutureWarning)
+    # Combine EAV dataframes
+    eav_df = pd.concat(eav_df_list)
+    eav_df.reset_index(inplace=True, drop=True)
 
-    # PerformanceWarning: DataFrame is highly fragmented.
-    # This new to pandas 2.0(+)
-    # See https://stackoverflow.com/questions/68292862
-    simplefilter(action="ignore", category=pd.errors.PerformanceWarning)
+    print(f"{len(records)} {test_type} records parsed")
+    quarantine_df = _quarantine_table(quarantine)
+    page_metrics = _page_metrics(page_counts)
+
+    # Append to (or replace within) the results of previous runs
+    #   (quarantined reports are left out of the manifest to be retried)
+    if incremental:
+        manifest = manifest[~manifest['DOC_NAME'].isin(
+            quarantine_df['DOC_NAME'])]
+        df, eav_df = _update_parsed_tables(
+            path_to_zips, parser='phenotypic', manifest=manifest,
+            tables=[df, eav_df],
+            doc_names=(df['DOC_NAME'].to_list() +
+                       _duplicate_names(duplicates)))
+
+    # The run is complete
+    if checkpoint_path is not None:
+        checkpoint_path.unlink(missing_ok=True)
+
+    df.attrs['QUARANTINE'] = quarantine_df.to_dict('records')
+    df.attrs['DUPLICATES'] = duplicates
+    df.attrs['PAGES'] = page_metrics
 
-    non_arv_cols = ['RULE', 'POSITION', 'AA', 'RESISTANCE_TYPE']
-    arv_cols = [col for col in complex_rules.columns
-                if col not in non_arv_cols]
+    return df, eav_df
 
-    # Total Scores (copy to modify)
-    simple_scores_df = position_df.copy()
-
-    # Rescore dict
-    # {Rule: {ARV: penalty}, ...}
-    # {'G118R + E138AKT': {'BIC': 10, 'CAB': 10, 'DTG': 10, 'EVG': 10}, ... }
-    arv_rescore_dict = complex_rules[arv_cols].to_dict('records')
-    arv_rescore_dict = dict(zip(complex_rules['RULE'], arv_rescore_dict))
-
-    # List to hold single-row dataframes
-    test_df_list = []
-
-    # For complex rule ...
-    for i, row in complex_rules.iterrows():
-        pos = re.findall('([A-Z][\d][\d]?[\d]?)', row['RULE'])
-        aas = re.findall('[\d][\d]?[\d]?([A-Z]+)', row['RULE'])
-
-        # Initialize a list (not required; here for clarity)
-        accessions_list = list()
-
-        # For each component of rule [i] ...
-        for j in range(0, len(pos)):
-            # Get all accession IDs where first component of rule [i] found
-            if j == 0:
-                accessions_list = position_df[
-                    position_df['MUTATION'].str.startswith(pos[j]) &
-                    position_df['AA'].str.contains(f'[{aas[j]}]', regex=True)
-                    ]['ACCESSION'].to_list()
-
-            # Get all accession IDs where 
-            #   remaining components [j >0] of rule [i] found
-            else:
-                # Recursively update the accession_list[ ]
-                accessions_list = position_df[
-                    position_df['ACCESSION'].isin(accessions_list) &
-                    position_df['MUTATION'].str.startswith(pos[j]) &
-                    position_df['AA'].str.contains(f'[{aas[j]}]', regex=True)
-                    ]['ACCESSION'].to_list()
-
-        # For each test accession to which the rule applies ...
-        for test in set(accessions_list):
-            # Create a single row dataframe
-            #
-            # ACCESSION ABC AZT FTC 3TC TDF ... RULE
-            # -----------------------------------------------
-            # 18-157409 15  0   0   0   0   ... L74IV + M184V
-            test_df = pd.DataFrame(
-                index=[test],
-                data=arv_rescore_dict[row['RULE']]).reset_index()
-            test_df.rename(columns={'index': 'ACCESSION'}, inplace=True)
-            test_df['RULE'] = row['RULE']
-            # Append to the growing list
-            test_df_list.append(test_df)
-
-    # Create DataFrame from list of dataframes
-    complex_rules_df = pd.concat(test_df_list)
-    complex_rules_df.reset_index(inplace=True, drop=True)
-
-    # For each rule observed ...
-    for i, row in complex_rules_df.iterrows():
-        # Extract a '-' delimitted list of the positions
-        #   (exclude any/all amino acids involved in a mutation)
-        positions = [re.search('([A-Z][\d]+)', i)
-                     .group(1).strip() for i in row['RULE'].split('+')]
-        complex_rules_df.loc[i, 'POSITIONS'] = '-'.join(positions)
 
-    # Take the max *complex* penalty at each position
-    #
-    # ACCESSION	    ABC	    AZT	    FTC	 ...   RULE	            POSITIONS
-    # -------------------------------------------------------------------
-    # 06-153017	    10.0	10.0	0.0	 ...   Q151M + M184IV	Q151-M184
-    # 09-135810	    10.0	10.0	0.0	 ...   Q151M + M184IV	Q151-M184
-    complex_rules_df_max = complex_rules_df\
-        .drop(columns='RULE')\
-        .groupby(['ACCESSION', 'POSITIONS'])\
-        .agg('max')\
-        .reset_index()
+# Extractor families that apply to each test type
+#   Phenosense-GT reports carry both loci-specific mutation lists
+#   (genotypic) and fold change/IC50/replication capacity (phenotypic)
+extractor_families = {'GENESEQ': ['GENOTYPIC'],
+                      'GENOSURE-MG': ['GENOTYPIC'],
+                      'GENOSURE-PRIME': ['GENOTYPIC'],
+                      'GENOSURE-ARCHIVE': ['GENOTYPIC'],
+                      'PHENOSENSE': ['PHENOTYPIC'],
+                      'PHENOSENSE-GT': ['GENOTYPIC', 'PHENOTYPIC'],
+                      'PHENOSENSE-INTEGRASE': ['PHENOTYPIC'],
+                      'PHENOSENSE-ENTRY': ['PHENOTYPIC']}
+
+
+# Product names as printed on each type of report
+# More specific names come first (e.g., every Phenosense-GT report
+#   also reads "PhenoSense"); a report is classified by the first product
+#   name in its text (see classify_report)
+test_type_signatures = [('PHENOSENSE-GT', 'PhenoSense[ ]?GT'),
+                        ('PHENOSENSE-INTEGRASE', 'PhenoSense[ ]?Integrase'),
+                        ('PHENOSENSE-ENTRY', 'PhenoSense[ ]?Entry'),
+                        ('GENOSURE-PRIME', 'GenoSure[ ]?PRIme'),
+                        ('GENOSURE-ARCHIVE', 'GenoSure[ ]?Archive'),
+                        ('GENOSURE-MG', 'GenoSure[ ]?MG'),
+                        ('GENESEQ', 'GeneSeq'),
+                        ('PHENOSENSE', 'PhenoSense')]
+
+
+@lru_cache(maxsize=None)
+def _compile_test_type_signatures(signatures: tuple):
+    import re
 
-    # Validate at
-    # https://hivdb.stanford.edu/hivdb/by-patterns/
+    # One alternation of named groups (e.g., PHENOSENSE_GT) so that a
+    #   single pass over the text finds every product name
+    return re.compile('|'.join(f"(?P<{test_type.replace('-', '_')}>{pattern})"
+                               for test_type, pattern in signatures),
+                      flags=re.IGNORECASE)
 
-    # Take the max *simple* penalty at each position
-    # And sum all position-penalties within each test accession
-    #
-    # PAT_MRN_ID	COLLECTED_DATE	ACCESSION	ABC	AZT	FTC	...
-    # ----------------------------------------------------------------------
-    # 9415	        2013-06-28	    13-134628	0.0	0.0	0.0	...
-    # 33464	        2006-07-21	    06-132370	0.0	0.0	0.0	...
-    position_cols = ['PAT_MRN_ID', 'COLLECTED_DATE', 'ACCESSION', 'POSITION']
-    simple_scores_df = simple_scores_df[position_cols + arv_cols]\
-        .groupby(position_cols)\
-        .agg('max')\
-        .reset_index()\
-        .drop(columns='POSITION')\
-        .groupby(position_cols[0:3])\
-        .agg('sum')\
-        .reset_index()
 
-    # Transform *simple* scores from wide to long
-    #
-    # PAT_MRN_ID	COLLECTED_DATE	ACCESSION	ARV	    SIMPLE_SCORE
-    # --------------------------------------------------------------
-    # 9415	        2013-06-28	    13-134628	ABC	    0.0
-    # 33464	        2006-07-21	    06-132370	ABC	    0.0
-    simple_scores_df_melt = simple_scores_df\
-        .groupby(['PAT_MRN_ID', 'COLLECTED_DATE', 'ACCESSION'])\
-        .agg('sum')\
-        .reset_index()\
-        .melt(id_vars=['PAT_MRN_ID', 'COLLECTED_DATE', 'ACCESSION'],
-              var_name='ARV',
-              value_name='SIMPLE_SCORE')
+def classify_report(sample_text: str):
+    """
+    Identifies the type of test from the text of a report.
 
-    # Transform *complex* scores from wide to long
-    #
-    # ACCESSION	    ARV	    COMPLEX_PENALTY
-    # -------------------------------------
-    # 02-126831	    ABC	    20.0
-    # 02-128088	    ABC	    0.0
-    complex_rules_df_melt = complex_rules_df_max\
-        .drop(columns='POSITIONS')\
-        .groupby('ACCESSION')\
-        .agg('sum')\
-        .reset_index()\
-        .melt(id_vars=['ACCESSION'],
-              var_name='ARV',
-              value_name='COMPLEX_PENALTY')
+    The product name in the report's title (the first in the text) decides;
+    boilerplate further down may mention other products (e.g., a GeneSeq
+    report recommending PhenoSense GT). Where names overlap the more
+    specific one is taken.
 
-    # Join *simple* and *complex* scores
-    total_scores_df = simple_scores_df_melt.merge(
-        complex_rules_df_melt,
-        left_on=['ACCESSION', 'ARV'], 
-        right_on=['ACCESSION', 'ARV'], how='outer')
+    Parameters
+    ----------
+    sample_text : str
+        Text from parsed PDF report
 
-    # Total score = Simple score + Complex score
-    total_scores_df.fillna(0, inplace=True)
-    total_scores_df['TOTAL_SCORE'] = \
-        total_scores_df[['SIMPLE_SCORE', 'COMPLEX_PENALTY']].sum(axis=1,
-                                                                 skipna=True)
+    Returns
+    ----------
+    test_type : str
+        One of the test types in extractor_families
+        (None if no product name is found)
+    """
+    signatures = tuple(test_type_signatures)
+    pattern = _compile_test_type_signatures(signatures)
+
+    # Left-most match; at any one position the alternation tries the
+    #   more specific names first
+    first = pattern.search(sample_text)
+
+    if first is None:
+        return None
+
+    return first.lastgroup.replace('_', '-')
+
+
+# Most pages scraped of each type of report in page-limited mode
+#   Everything extracted is expected on the first pages (order info, drug
+#   table, mutation lists, IC50, replication capacity and the algorithm
+#   comment); the rest of a report is boilerplate and references
+# Not yet measured against the full archive of reports, hence page-limited
+#   scraping is off unless asked for (page_limit=True)
+page_budgets = {'GENESEQ': 3,
+                'GENOSURE-MG': 3,
+                'GENOSURE-PRIME': 3,
+                'GENOSURE-ARCHIVE': 3,
+                'PHENOSENSE': 3,
+                'PHENOSENSE-GT': 4,
+                'PHENOSENSE-INTEGRASE': 3,
+                'PHENOSENSE-ENTRY': 3}
+
+
+# Section anchors (see _find_section_anchors) of the text read by each
+#   extractor; its section begins at (or, for the drug table of genotypic
+#   reports, ends at) these anchors
+#   FIRST_LIST (not LIST) since drug-class labels in the drug table
+#   (e.g., ' PI ', ' IN ') read as LIST anchors
+#   ALGORITHM is the canned algorithm-version comment (searched for in the
+#   whole report by _extract_order_info_as_dict)
+extractor_section_anchors = {
+    'ORDER_INFO': ['REFERENCE', 'GENERIC'],
+    'ALGORITHM_VERSION': ['ALGORITHM'],
+    'DRMS': ['GENERIC', 'FIRST_LIST'],
+    'MUTATION_LISTS': ['FIRST_LIST'],
+    'FOLD_CHANGE': ['GENERIC'],
+    'IC50': ['IC50'],
+    'REPLICATION': ['CAPACITY']}
+
+
+# Extractors applied to each type of report (see _extract_genotypic_record
+#   and _extract_phenotypic_record)
+#   Phenosense-GT reports have no drug-level mutations nor algorithm comment
+#   Phenosense-Entry reports have no replication capacity; their IC50 is
+#   read from the drug table (with the fold change)
+report_extractors = {
+    'GENESEQ': ['ORDER_INFO', 'ALGORITHM_VERSION', 'DRMS', 'MUTATION_LISTS'],
+    'GENOSURE-MG': ['ORDER_INFO', 'ALGORITHM_VERSION', 'DRMS',
+                    'MUTATION_LISTS'],
+    'GENOSURE-PRIME': ['ORDER_INFO', 'ALGORITHM_VERSION', 'DRMS',
+                       'MUTATION_LISTS'],
+    'GENOSURE-ARCHIVE': ['ORDER_INFO', 'ALGORITHM_VERSION', 'DRMS',
+                         'MUTATION_LISTS'],
+    'PHENOSENSE': ['ORDER_INFO', 'FOLD_CHANGE', 'IC50', 'REPLICATION'],
+    'PHENOSENSE-GT': ['ORDER_INFO', 'MUTATION_LISTS', 'FOLD_CHANGE', 'IC50',
+                      'REPLICATION'],
+    'PHENOSENSE-INTEGRASE': ['ORDER_INFO', 'FOLD_CHANGE', 'IC50',
+                             'REPLICATION'],
+    'PHENOSENSE-ENTRY': ['ORDER_INFO', 'FOLD_CHANGE']}
+
+
+# Section anchors of the text read from each type of report
+required_section_anchors = {
+    test_type: list(dict.fromkeys(anchor
+                                  for extractor in extractors
+                                  for anchor in
+                                  extractor_section_anchors[extractor]))
+    for test_type, extractors in report_extractors.items()}
+
+
+def required_sections_seen(sample_text: str, test_type: str = None) -> bool:
+    """
+    Stop callback for page-limited scraping (see scrape_PDF_to_text);
+    True once every section extracted from a {test_type} report has begun
+    on a page before the last one scraped. A section may run on to the
+    next page, so scraping ends one page after the last section begins.
+
+    Failure phrases (see find_failure_phrase) have no anchor of their own;
+    one printed after the last required section (the algorithm comment of
+    genotypic reports, the replication capacity of phenotypic reports) is
+    missed, hence page-limited scraping is off by default.
+
+    If {test_type} is None it is identified from the text so far;
+    see classify_report.
+    """
+    # Pages end with a form feed
+    complete_pages = sample_text[:sample_text.rstrip('\f').rfind('\f') + 1]
 
-    # Categorize Stanford predicted level of resistance
-    total_scores_df.loc[
-        total_scores_df['TOTAL_SCORE'].between(0, 9),
-        'RESISTANCE_CATEGORY'] = 'Suceptible'
+    if test_type is None:
+        test_type = classify_report(complete_pages)
 
-    total_scores_df.loc[
-        total_scores_df['TOTAL_SCORE'].between(10, 14),
-        'RESISTANCE_CATEGORY'] = 'Potential low-level'
+        if test_type is None:
+            return False
 
-    total_scores_df.loc[
-        total_scores_df['TOTAL_SCORE'].between(15, 29),
-        'RESISTANCE_CATEGORY'] = 'Low'
+    anchors = _find_section_anchors(complete_pages)
 
-    total_scores_df.loc[
-        total_scores_df['TOTAL_SCORE'].between(30, 59),
-        'RESISTANCE_CATEGORY'] = 'Intermediate'
+    return all(anchors[anchor]
+               for anchor in required_section_anchors[test_type.upper()])
 
-    total_scores_df.loc[
-        total_scores_df['TOTAL_SCORE'] >= 60,
-        'RESISTANCE_CATEGORY'] = 'High'
 
-    return total_scores_df
+def _scrape_report(path_to_pdf, test_type: str = None,
+                   scrape_kwargs: dict = None) -> tuple:
+    """
+    Scrapes a single report (for the _parse_*_report functions).
 
+    {scrape_kwargs} are passed to scrape_PDF_to_text, except for
+    'page_limit' (scrape at most page_budgets[test_type] pages) and 'stop'
+    (stop callback; default required_sections_seen for {test_type}).
 
-def parse_phenotypic_reports(path_to_zips, test_type):
+    Returns
+    -------
+    (sample_text, page_counts) : tuple
+        page_counts is None unless page-limited
     """
-    Returns two dataframes;
+    from src.utils import scrape_PDF_to_text, page_budgets
+    from functools import partial
 
-    (1) Test dataframe contains one row per test accession/order
+    scrape_kwargs = dict(scrape_kwargs or {})
+    page_limit = scrape_kwargs.pop('page_limit', False)
+    stop = scrape_kwargs.pop('stop', None)
 
-    (2) EAV (entity-attribute-value) dataframe contains
-        one row per ARV, per test accession
+    if not page_limit:
+        return scrape_PDF_to_text(path_to_pdf, **scrape_kwargs), None
 
-        # ARV   CUTOFF	FOLD_CHANGE	...	RESISTANCE_CAT  ...
-        # -------------------------------------------------
-        # 3TC   3.5         9.74    ...     Resistant   ...
-        # ABC   NaN         1.87    ...     Sensitiive  ...
-    """
-    from src.utils import extract_from_zips, scrape_PDF_to_text
-    from ipypb import track
-    import pandas as pd
-    import numpy as np
-    import re
-    import warnings
+    # Unknown test type; as many pages as any report needs
+    if test_type is None:
+        max_pages = max(page_budgets.values())
+    else:
+        max_pages = page_budgets[test_type.upper()]
 
-    def _mark_report_as_complete(sample_text):
-        import re
+    if stop is None:
+        stop = partial(required_sections_seen, test_type=test_type)
 
-        report_complete = True
+    page_counts = dict()
+    sample_text = scrape_PDF_to_text(path_to_pdf, max_pages=max_pages,
+                                     stop=stop, page_counts=page_counts,
+                                     **scrape_kwargs)
 
-        phrases = ['common causes of assay failure',
-                   'unable to perform testing',
-                   'quantity not sufficient',
-                   'inadequate specimen volume',
-                   'low sample volume',
-                   'is not ready to report',
-                   'canceled per client',
-                   'insufficient HIV-infected cells',
-                   'duplicate order',
-                   'could not be obtained',
-                   'could not be completed',
-                   'this sample should not be used',
-                   'inappropriately collected',
-                   'resubmit a new specimen',
-                   'resubmit a new sample',
-                   'unsuccessful testing of this sample'
-                   ]
+    return sample_text, page_counts
 
-        for phrase in phrases:
-            if report_complete:
-                if re.search(phrase, sample_text, flags=re.IGNORECASE):
-                    report_complete = False
-            else:
-                pass
 
-        return report_complete
+def _page_metrics(page_counts):
+    """
+    Totals the page counts of a page-limited run (printing a summary);
+    an empty dict if the run was not page-limited.
+    """
+    if not page_counts:
+        return dict()
 
-    def _extract_order_info_as_dict(sample_text: str) -> dict:
-        """
-        Extract order info from text of parsed PDF report.
-        The data elements always follow the same ordering though
-        some may be missing.
-
-        Parameters
-        ----------
-        sample_text : str
-            Text from parsed PDF report
-
-        Returns
-        ----------
-        order_info_dict : dict
-        """
-        import re
-        import numpy as np
+    pages = sum(counts['PAGES'] for counts in page_counts)
+    pages_scraped = sum(counts['PAGES_SCRAPED'] for counts in page_counts)
 
-        # Get phrasing used for MRN
-        if re.search('Medical Record #', sample_text):
-            mrn_prefix = 'Medical Record #'
-        else:
-            mrn_prefix = 'Patient ID'
+    print(f"{pages_scraped} of {pages} pages scraped "
+          f"({pages - pages_scraped} saved)")
 
-        # Get phrasing used for Lab Order ID
-        if re.search("ID/Order #", sample_text):
-            prov_suffix = 'Reference Lab ID/Order #'
-        else:
-            prov_suffix = 'Reference Lab ID'
-
-        full_name = re.search(
-            'Patient Name[:\s]*([A-Za-z -/.]*?)(?=DOB)', sample_text)
-        birth_date = re.search(
-            'DOB[:\s]*([A-Za-z0-9-/]*?)[ ]*(?=Patient ID)', sample_text)
-        mrn = re.search(
-            f'{mrn_prefix}[:\s]*([\d]*?)[ \D]*(?=Gender)', sample_text)
-
-        # occassionally Monogram placed the SSN in place of the PAT_MRN_ID
-        ssn = re.search(
-            f'{mrn_prefix}[:\s]*(\d\d\d-\d\d-\d\d\d\d)[ \D]*(?=Gender)',
-            sample_text)
-        if ssn:
-            mrn = None
-
-        gender = re.search(
-            'Gender[:\s]*([A-Za-z]*?)[ ]*(?=Monogram)', sample_text)
-        test_accession = re.search(
-            'Accession[:\s#]*([A-Za-z0-9-/_]*?)[ ]*(?=Date)', sample_text)
-        # Dates follow the format:  17-MAY-2016 11:20 PT
-        collection_date = re.search(
-            'Date Collected[:\s]*([A-Za-z0-9-/]*?)[ ][0-9][0-9]:', sample_text)
-        received_date = re.search(
-            'Date Received[:\s]*([A-Za-z0-9-/]*?)[ ][0-9][0-9]:', sample_text)
-        reported_date = re.search(
-            'Date Reported[:\s]*([A-Za-z0-9-/]*?)[ ][0-9][0-9]:', sample_text)
-        # Mode in [F, M, W]
-        test_mode = re.search(
-            'Mode[:\s]*([A-Z,]*?)[ ]*(?=Report)', sample_text)
-        report_status = re.search(
-            'Report Status[:\s]*([A-Z]*?)[ ]*(?=Referring)', sample_text)
-        # Referring Physician
-        referring_prov = re.search(
-            f'Referring Physician[:\s]*([A-Za-z\s\d,]*?)(?={prov_suffix})',
-            sample_text)
-        # keep only first two names (do not keep address, if present)
-        if referring_prov:
-            referring_prov = re.search(
-                '([A-Za-z]*[ ][A-Za-z]*)', referring_prov.group(1))
-        # Order ID should not contain letters
-        # ... in the early days the hospital floor was substituted
-        order_id = re.search(
-            f'{prov_suffix}[:\s]*([0-9]*?)[ _A-Z-:]', sample_text)
+    return {'REPORTS': len(page_counts), 'PAGES': pages,
+            'PAGES_SCRAPED': pages_scraped,
+            'PAGES_SAVED': pages - pages_scraped}
 
-        val_list = [full_name, birth_date, mrn, ssn, gender, test_accession,
-                    collection_date, received_date, reported_date, test_mode,
-                    report_status, referring_prov, order_id]
 
-        row_values = [v.group(1).strip()
-                      .title() if v else np.NaN for v in val_list]
+def _ingest_report(path_to_pdf, test_type: str = None,
+                   scrape_kwargs: dict = None) -> tuple:
+    """
+    Scrapes a single report once and extracts its contents with every
+    extractor family that applies to {test_type}.
 
-        col_names = ['FULL_NAME', 'BIRTH_DATE', 'PAT_MRN_ID', 'SSN', 'GENDER',
-                     'ACCESSION', 'COLLECTED_DATE', 'RECEIVED_DATE',
-                     'REPORTED_DATE', 'MODE', 'REPORT_STATUS',
-                     'REFERRING_PROV', 'ORDER_ID']
+    If {test_type} is None it is identified from the report's text;
+    see classify_report.
 
-        order_info_dict = dict(zip(col_names, row_values))
+    Returns
+    -------
+    (genotypic_record, phenotypic_record, fold_change_eav_df) : tuple
+        None for families that do not apply (all None if the
+        report could not be classified)
+    """
+    # Parse PDF to text
+    sample_text, page_counts = _scrape_report(path_to_pdf, test_type,
+                                              scrape_kwargs=scrape_kwargs)
 
-        return order_info_dict
+    genotypic_record = None
+    phenotypic_record, fold_change_eav_df = None, None
 
-    def _extract_fold_change_as_dict(sample_text: str, test_type: str) -> dict:
-        """
-        Extract fold change info from text of parsed PDF report.
-        The data elements always follow the same ordering though
-        some may be missing.
-
-        Parameters
-        ----------
-        sample_text : str
-            Text from parsed PDF report
-
-        Returns
-        ----------
-        arv_fold_change_dict : dict
-            Keys are ARVs, Values are a dictionary
-        """
-        from src.utils import arv_master_dict
-        import re
-
-        # Empty ARV Fold Change dict
-        arv_fold_change_dict = {}
-
-        ##################
-        # Phenosense-Entry
-        ##################
-        if test_type.upper() == 'PHENOSENSE-ENTRY':
-            # Enfuvirtide Fuzeon0.019434 0.51    ENF
-            ic50_fold_change =re.search(
-                '(?<=Enfuvirtide)[ ]*Fuzeon([\d.]+)[ ]+([\d.]+)[ ]*(?=ENF)',
-                sample_text)
-
-            if not ic50_fold_change:
-                arv_fold_change_dict['ENF'] = {
-                    'IC50': None,
-                    'FOLD_CHANGE': None,
-                    'BIOLOGICAL_CUTOFF': None
-                }
-
-            # The upper bound for ENV sensitivity is a fold change of 6.48
-            # The lower bound (hyper-sensitivity) is 0.42
-            if ic50_fold_change:
-                arv_fold_change_dict['ENF'] = {
-                    'IC50': float(ic50_fold_change.group(1).strip()),
-                    'FOLD_CHANGE': float(ic50_fold_change.group(2).strip()),
-                    'BIOLOGICAL_CUTOFF': 6.48
-                }
-
-        ######################
-        # All other test types
-        ######################
-        else:
-            for art_class, art_list in arv_master_dict.items():
-                # {'NRTI': [('Ziagen', 'Abacavir', 'ABC', '1998-12-17'), ...],
-                #  'NNRTI': [('Pifeltro', 'Doravirine', 'DOR', '2018-08-30')
-                #   ...
-                for attr in art_list:
-
-                    # Switch for Phenosense-GT tests (different ending)
-                    if test_type.upper() == 'PHENOSENSE-GT':
-                        suffix = '[ YN]+?'
-                    else:
-                        suffix = f'[ ]*?(?={attr[2]})'
-
-                    # Capture groups
-                    g1 = '([\d.\s-]+)'
-                    g2 = '([\d.>MAX]+?)'
-
-                    # Unboosted ARVs
-                    unboosted = re.search(
-                        f'{attr[1]}[ ]+{attr[0]}[ ]*\({g1}\)[ ]*?{g2}{suffix}',
-                        sample_text)
-
-                    if unboosted:
-                        fold_change = unboosted.group(2)
-
-                        # (lower, upper)
-                        if '-' in unboosted.group(1):
-                            lower_cutoff, upper_cutoff = unboosted\
-                                .group(1).split('-')
-
-                            arv_fold_change_dict[attr[2]] = {
-                                'FOLD_CHANGE': fold_change.strip(),
-                                'LOWER_CUTOFF': lower_cutoff.strip(),
-                                'UPPER_CUTOFF': upper_cutoff.strip()
-                            }
-
-                        # (single cutoff)
-                        else:
-                            arv_fold_change_dict[attr[2]] = {
-                                'FOLD_CHANGE': fold_change.strip(),
-                                'BIOLOGICAL_CUTOFF': unboosted.group(1).strip()
-                                }
-
-                    # Boosted ARVs include '/r' after brand name
-                    boosted = re.search(
-                        f'{attr[0]}[ ]*\/[ ]r[ ]*\({g1}\)[ ]*?{g2}{suffix}',
-                        sample_text)
-
-                    if boosted:
-                        fold_change = boosted.group(2)
-
-                        # (lower, upper)
-                        if '-' in boosted.group(1):
-                            lower_cutoff, upper_cutoff = boosted\
-                                .group(1).split('-')
-
-                            arv_fold_change_dict[f'{attr[2]}_r'] = {
-                                'FOLD_CHANGE': fold_change.strip(),
-                                'LOWER_CUTOFF': lower_cutoff.strip(),
-                                'UPPER_CUTOFF': upper_cutoff.strip()
-                                }
-
-                        # (single cutoff)
-                        else: 
-                            arv_fold_change_dict[f'{attr[2]}_r'] = {
-                                'FOLD_CHANGE': fold_change.strip(),
-                                'BIOLOGICAL_CUTOFF': boosted.group(1).strip()
-                                }
-
-        # Add resistance category to dict
-        for arv, attr in arv_fold_change_dict.items():
-            fold_change = arv_fold_change_dict[arv]['FOLD_CHANGE']
-
-            if '>' in attr['FOLD_CHANGE']:
-                attr['RESISTANCE_CAT'] = 'Resistant'
+    if test_type is None:
+        test_type = classify_report(sample_text)
 
-            # Biological cutoffs are used for specific antiretrovirals
-            elif 'BIOLOGICAL_CUTOFF' in attr.keys():
-                if float(fold_change) > float(attr['BIOLOGICAL_CUTOFF']):
-                    attr['RESISTANCE_CAT'] = 'Resistant'
+        if test_type is None:
+            return genotypic_record, phenotypic_record, fold_change_eav_df
 
-                elif float(fold_change) <= float(attr['BIOLOGICAL_CUTOFF']):
-                    attr['RESISTANCE_CAT'] = 'Sensitive'
+    # Section offsets are shared by both extractor families
+    sections = index_report_sections(sample_text)
 
-            # All others use clinical cutoffs
-            else:
-                if float(fold_change) > float(attr['UPPER_CUTOFF']):
-                    attr['RESISTANCE_CAT'] = 'Resistant'
+    families = extractor_families[test_type.upper()]
 
-                elif float(fold_change) <= float(attr['LOWER_CUTOFF']):
-                    attr['RESISTANCE_CAT'] = 'Sensitive'
+    if 'GENOTYPIC' in families:
+        genotypic_record = _extract_genotypic_record(
+            sample_text, test_type, doc_name=path_to_pdf.name,
+            sections=sections)
 
-                else:
-                    attr['RESISTANCE_CAT'] = 'Partially Sensitive'
+    if 'PHENOTYPIC' in families:
+        phenotypic_record, fold_change_eav_df = _extract_phenotypic_record(
+            sample_text, test_type, doc_name=path_to_pdf.name,
+            sections=sections)
 
-            arv_fold_change_dict[arv] = attr
+    # Run metrics (removed by the caller), counted once per report
+    if page_counts is not None:
+        (genotypic_record or phenotypic_record)['_PAGE_COUNTS'] = page_counts
 
-        return arv_fold_change_dict
+    return genotypic_record, phenotypic_record, fold_change_eav_df
 
-    def _extract_ic50_as_dict(sample_text: str) -> dict:
-        import re
 
-        drugs = re.search(
-            '(?<=Patient-specific)[ ]*Results[ ]*Drugs[ ]*([A-Za-z\d\s/]+?)(?=IC50)', sample_text)
-        # all digits and ">MAX" until start of Fold-change results
-        ic50 = re.search(
-            '(?<=IC50)[\D]*?([\d\s.>MAX]*)(?=F)', sample_text)
+def ingest_reports(path_to_zips, test_type=None, workers=1, cache_dir=None,
+                   compress_cache=False, max_cache_bytes=None, stream=False,
+                   queue_depth=None, timeout=None, isolate=False,
+                   dedupe=False, page_limit=False, stop=None):
+    """
+    Scrapes each report once and returns every table that applies to
+    {test_type};
 
-        ic50_dict = dict(zip(drugs.group(1).strip().split(' '),
-                             ic50.group(1).strip().split(' ')))
+    (1) Genotypic dataframe (as from parse_genotypic_reports)
 
-        return ic50_dict
+    (2) Test dataframe (as from parse_phenotypic_reports)
 
-    def _extract_replication_capacity_tuple(sample_text: str):
-        # Phenosense Integrase added the "Integrase" word to the text below
-        # (?=Replication)
-        # Nevertheless, the search phrase is specific enough that
-        #   it does not yield any false-positives
-        rep_capacity_and_bounds = re.search(
-            '(?<=Capacity)[ ]*=[ ]*([\d.]+)%\(Range[ ]*([\d.]+)%-([\d.]+)%\)',
-            sample_text)
+    (3) EAV dataframe (as from parse_phenotypic_reports)
 
-        if rep_capacity_and_bounds:
-            rep_capacity = float(rep_capacity_and_bounds.group(1).strip())/100
-            lower_bound = float(rep_capacity_and_bounds.group(2).strip())/100
-            upper_bound = float(rep_capacity_and_bounds.group(3).strip())/100
+    Tables for extractor families that do not apply to {test_type} are
+    None; e.g., only Phenosense-GT returns all three.
 
-            return (rep_capacity, lower_bound, upper_bound)
+    With test_type=None each report's test type is identified from its
+    text (see classify_report) so that a mixed set of archives is parsed
+    in a single call; TEST_TYPE then varies by row and a table is None
+    only if no report needed it. Reports that cannot be classified are
+    skipped (with a warning naming them).
 
-        else:
-            return (None, None, None)
-
-    def _reorder_dataframe_columns(df) -> pd.DataFrame:
-        # get list
-        cols = df.columns.to_list()
-
-        # order info
-        order_info = ['DOC_NAME', 'TEST_TYPE', 'REPORT_COMPLETE', 'FULL_NAME',
-                      'PAT_MRN_ID', 'SSN', 'BIRTH_DATE', 'GENDER', 'ACCESSION',
-                      'ORDER_ID', 'REFERRING_PROV', 'COLLECTED_DATE',
-                      'RECEIVED_DATE', 'REPORTED_DATE', 'REPORT_STATUS',
-                      'MODE', 'REPLICATION_CAPACITY', 'REPLICATION_LOWER',
-                      'REPLICATION_UPPER']
-
-        order_info = [i for i in order_info if i in cols]
-
-        # ARV (resistance results) ordering
-        nrti = ['3TC', 'ABC', 'd4T', 'ddC', 'ddI', 'FTC', 'TFV', 'TAF', 'ZDV']
-        nnrti = ['DOR', 'DLV', 'EFV', 'ETR', 'NVP', 'RPV']
-        insti = ['BIC', 'CAB', 'DTG', 'EVG', 'RAL']
-        pi = ['AMP', 'AMPr', 'ATV', 'ATVr', 'DRV', 'DRVr', 'IDV', 'IDVr',
-              'LPV', 'LPVr', 'NFV', 'NFVr', 'RTV', 'RTVr', 'SQV', 'SQVr',
-              'TPV', 'TPVr']
-        fusion = ['ENF']
-        # trofile
-
-        nrti_cols = [i for i in nrti if i in cols]
-        nnrti_cols = [i for i in nnrti if i in cols]
-        insti_cols = [i for i in insti if i in cols]
-        pi_cols = [i for i in pi if i in cols]
-        fusion_cols = [i for i in fusion if i in cols]
-
-        # create re-ordered list of columns
-        cols_reordered = order_info + nrti_cols + nnrti_cols + pi_cols + insti_cols + fusion_cols
-        not_listed_error = [i for i in cols if i not in cols_reordered]
-
-        # apply it
-        df = df[cols_reordered + not_listed_error]
-
-        return df
+    {path_to_zips} may be a directory or a list of directories
+    (e.g., one per test type). Other parameters are as for
+    parse_genotypic_reports; the quarantined reports (if a {timeout} is
+    given or isolate=True), the duplicate map (if deduplicating) and the
+    page counts (if page-limited) are kept in the attrs['QUARANTINE'],
+    attrs['DUPLICATES'] and attrs['PAGES'] of each table returned.
+    Page-limited scraping of reports of unknown test type uses the largest
+    of the page budgets.
+    A report re-delivered in another of the directories is a duplicate.
+    """
+    from src.utils import extract_from_zips, prune_text_cache
+    from pathlib import Path
+    import pandas as pd
+    import warnings
 
     # Future Warning: Setting an item of incompatible dtype is deprecated
     # This appears to be a bug in pandas 2.1.1
     # See https://github.com/pandas-dev/pandas/issues/55025
     warnings.simplefilter(action='ignore', category=FutureWarning)
 
-    allowable_test_types = ['PHENOSENSE', 'PHENOSENSE-GT',
-                            'PHENOSENSE-INTEGRASE', 'PHENOSENSE-ENTRY']
-    if test_type.upper() not in allowable_test_types:
+    allowable_test_types = list(extractor_families)
+    if test_type is not None and test_type.upper() not in allowable_test_types:
         raise ValueError(f'Invalid test type ({allowable_test_types})')
 
     # Extract PDF reports from Zip files
-    report_paths = extract_from_zips(path_to_zips)
+    if isinstance(path_to_zips, (str, Path)):
+        path_to_zips = [path_to_zips]
 
-    # Empty TEST dataframe (to fill)
-    # Many single-row insertions
-    df = pd.DataFrame()
+    report_paths = list()
+    for path in path_to_zips:
+        report_paths.extend(extract_from_zips(path, stream=stream))
 
-    # Empty list (to fill with dataframes)
-    # With multi-row dataframes it is more efficient to concatenate a list
-    #   due to the overhead of recreating the dataframe's index
+    # Parse each distinct report once
+    report_paths, duplicates, _ = _deduplicate_report_paths(
+        report_paths, dedupe=dedupe, workers=workers)
+
+    genotypic_records = list()
+    phenotypic_records = list()
     eav_df_list = list()
 
     # Loop over PDF's
-    for i in track(range(0, len(report_paths)), label='Records'):
-
-        # Parse PDF to text
-        sample_text = scrape_PDF_to_text(report_paths[i])
-
-        # Extract order info
-        order_info_dict = _extract_order_info_as_dict(sample_text=sample_text)
-
-        # Insert order info into dataframe
-        df.loc[i, 'TEST_TYPE'] = test_type.upper()
-        df.loc[i, 'DOC_NAME'] = report_paths[i].name
-
-        for attribute, value in order_info_dict.items():
-            df.loc[i, attribute] = value
-
-        # If report is not marked "incomplete"
-        #   gather oberserved mutations
-        report_complete = _mark_report_as_complete(sample_text=sample_text)
-        df.loc[i, 'REPORT_COMPLETE'] = report_complete
-
-        if report_complete:
-            fold_change_dict = _extract_fold_change_as_dict(
-                sample_text=sample_text, test_type=test_type)
-
-            # Entity-attribute-value (EAV) format
-            # One row per drug
-            #
-            # ARV   CUTOFF	FOLD_CHANGE	LOWER_CUTOFF	RESISTANCE_CAT	UPPER_CUTOFF
-            # ----------------------------------------------------------------------
-            # 3TC   3.5         9.74        NaN             Resistant	    NaN
-            # ABC   NaN         1.87        4.5             Sensitiive	    6.5
-            fold_change_eav_df = pd.melt(
-                pd.DataFrame(fold_change_dict).reset_index(),
-                id_vars='index', var_name='ARV')\
-                .pivot(index='ARV', columns='index', values='value')
-
-            #################################################
-            # IC50
-            #
-            # Was extacted in step above for Phenosense-Entry
-            #################################################
-            if not test_type.upper() == 'PHENOSENSE-ENTRY':
-                try:
-                    ic50_dict = _extract_ic50_as_dict(sample_text=sample_text)
-
-                    # Insert IC50 into EAV dataframe
-                    for arv, ic50 in ic50_dict.items():
-                        fold_change_eav_df.loc[arv, 'IC50'] = ic50
-                        # IC50 value applies to the unboosted drug
-                        # Only lower/upper cutoff values change with boosting
-                        # So apply the value to both boosteda and unboosted
-                        fold_change_eav_df.loc[f'{arv}_r', 'IC50'] = ic50
-
-                    # Remove rows where IC50 added but no fold-change reported
-                    # For example, when only boosted DRV was reported drop
-                    #   the row for unboosted DRV added by the above loop
-                    fold_change_eav_df = fold_change_eav_df[
-                        fold_change_eav_df['RESISTANCE_CAT'].notnull()]
-
-                except ValueError:
-                    pass
-
-            # Move 'ARV' field out of index
-            #   and append to list of EAV dataframes
-            fold_change_eav_df['DOC_NAME'] = report_paths[i].name
-            fold_change_eav_df.reset_index(inplace=True)
-            eav_df_list.append(fold_change_eav_df)
+    scrape_kwargs = {'cache_dir': cache_dir, 'compress_cache': compress_cache,
+                     'page_limit': page_limit or stop is not None,
+                     'stop': stop}
+    quarantine = list()
+    page_counts = list()
+    results = _map_reports(_ingest_report, report_paths,
+                           test_type=test_type, workers=workers,
+                           queue_depth=queue_depth, timeout=timeout,
+                           isolate=isolate, quarantine=quarantine,
+                           scrape_kwargs=scrape_kwargs)
 
-            # Insert resistance determination into TEST dataframe
-            for arv, fold_change_attributes in fold_change_dict.items():
-                df.loc[i, arv] = fold_change_attributes['RESISTANCE_CAT']
-
-            ###################################
-            # Replication Capacity
-            #
-            # Not reported for Phenosense-Entry
-            ###################################
-            if not test_type.upper() == 'PHENOSENSE-ENTRY':
-                # if not re.search('Replication capacity cannot be reported',
-                #                 sample_text):
-                try:
-                    rep_capacity = _extract_replication_capacity_tuple(
-                        sample_text=sample_text)
+    unclassified = list()
 
-                    # Insert replication capacity into TEST dataframe
-                    df.loc[i, 'REPLICATION_CAPACITY'] = rep_capacity[0]
-                    df.loc[i, 'REPLICATION_LOWER'] = rep_capacity[1]
-                    df.loc[i, 'REPLICATION_UPPER'] = rep_capacity[2]
+    for report_path, result in zip(report_paths, results):
+        # Quarantined reports have no record
+        if result is None:
+            continue
 
-                except ValueError:
-                    pass
+        genotypic_record, phenotypic_record, fold_change_eav_df = result
 
-        # Reorder columns (aesthetic)
-        df = _reorder_dataframe_columns(df=df)
+        if genotypic_record is None and phenotypic_record is None:
+            unclassified.append(report_path.name)
 
-    # Combine EAV dataframes
-    eav_df = pd.concat(eav_df_list)
-    eav_df.reset_index(inplace=True, drop=True)
+        for record in [genotypic_record, phenotypic_record]:
+            if record is not None and '_PAGE_COUNTS' in record:
+                page_counts.append(record.pop('_PAGE_COUNTS'))
 
-    # Re-sort TEST dataframe by patient
-    df.sort_values(['PAT_MRN_ID', 'ACCESSION'], inplace=True)
-    df.reset_index(drop=True, inplace=True)
+        if genotypic_record is not None:
+            genotypic_records.append(genotypic_record)
 
-    # Set '' (artefact of regular expression) to missing
-    for col in [i for i in df.columns if df[i].dtype == 'O']:
-        df.loc[df[col] == '', col] = np.NaN
+        if phenotypic_record is not None:
+            phenotypic_records.append(phenotypic_record)
 
-    # Dates
-    for date_col in ['BIRTH_DATE', 'COLLECTED_DATE',
-                     'RECEIVED_DATE', 'REPORTED_DATE']:
-        df[date_col] = pd.to_datetime(df[date_col], format='mixed')
+        if fold_change_eav_df is not None:
+            eav_df_list.append(fold_change_eav_df)
 
-    # MRN can be up to 8 characters (if not starting with '0')
-    #   ... but if < 7 it is zero-padded to 7 characters
-    # Will need to perform manual chart review for missing MRNs
-    mrn_length = df['PAT_MRN_ID'].str.len()
-    leading_zero = df['PAT_MRN_ID'].str.startswith('0')
+    # Bound the size of the scraped-text cache
+    if cache_dir is not None and max_cache_bytes is not None:
+        prune_text_cache(cache_dir, max_cache_bytes)
 
-    df.loc[(mrn_length > 8) & (leading_zero),
-           'MRN_OUTDATED'] = df['PAT_MRN_ID'].str.slice(1, )
-    df.loc[(mrn_length > 8), 'PAT_MRN_ID'] = np.NaN
+    if unclassified:
+        warnings.warn(f'{len(unclassified)} reports of unknown test type '
+                      f'were skipped: {unclassified}')
 
-    df.loc[(mrn_length == 8) & (leading_zero),
-           'PAT_MRN_ID'] = df['PAT_MRN_ID'].str.slice(1, )
-    df.loc[(mrn_length == 8), 'MRN_OUTDATED'] = 1
+    if test_type is not None:
+        families = extractor_families[test_type.upper()]
 
-    df.loc[mrn_length < 7, 'PAT_MRN_ID'] = df['PAT_MRN_ID'].str.zfill(7)
+    else:
+        families = [family for family, records in
+                    [('GENOTYPIC', genotypic_records),
+                     ('PHENOTYPIC', phenotypic_records)] if records]
 
-    print(f"{i+1} {test_type} records parsed")
+    genotypic_df, phenotypic_df, eav_df = None, None, None
 
-    return df, eav_df
+    if 'GENOTYPIC' in families:
+        genotypic_df = _finalize_genotypic_df(
+            df=pd.DataFrame.from_records(genotypic_records))
+
+    if 'PHENOTYPIC' in families:
+        phenotypic_df = _finalize_phenotypic_df(
+            df=pd.DataFrame.from_records(phenotypic_records))
+
+        # Combine EAV dataframes
+        eav_df = pd.concat(eav_df_list)
+        eav_df.reset_index(inplace=True, drop=True)
+
+    print(f"{len(report_paths) - len(unclassified) - len(quarantine)} "
+          f"{test_type or 'mixed'} records parsed")
+    quarantine_df = _quarantine_table(quarantine)
+    page_metrics = _page_metrics(page_counts)
+
+    for table in [genotypic_df, phenotypic_df, eav_df]:
+        if table is not None:
+            table.attrs['QUARANTINE'] = quarantine_df.to_dict('records')
+            table.attrs['DUPLICATES'] = duplicates
+            table.attrs['PAGES'] = page_metrics
+
+    return genotypic_df, phenotypic_df, eav_df
@@ -0,0 +1,426 @@
+"""
+Reference implementations of the position melt, scoring and totals, as
+they were before they were optimized (kept verbatim, but for the raw
+strings), to check that the optimized functions in src.utils give the
+same results.
+"""
+
+
+def melt_loci_specific_mutations_to_position(mutations_df, loci):
+    import pandas as pd
+    import numpy as np
+    import re
+    from collections import OrderedDict as o
+
+    from warnings import simplefilter
+
+    # Future Warning: Setting an item of incompatible dtype is deprecated
+    # This appears to be a bug in pandas 2.1.1
+    # See https://github.com/pandas-dev/pandas/issues/55025
+    simplefilter(action='ignore', category=FutureWarning)
+
+    # PerformanceWarning: DataFrame is highly fragmented.
+    # This new to pandas 2.0(+)
+    # See https://stackoverflow.com/questions/68292862
+    simplefilter(action="ignore", category=pd.errors.PerformanceWarning)
+
+    loci = loci.upper()
+    if loci.upper() not in ['RT', 'PI', 'PR', 'INSTI']:
+        raise ValueError('Loci argument must be one of [RT, PI/PR, INSTI]')
+
+    loci_list = loci + '_LIST'
+    if loci_list not in mutations_df.columns:
+        raise ValueError(f'DataFrame has no {loci_list} field.')
+
+    # Make a copy of the mutations dataframe (one list per test/row)
+    df = mutations_df.copy()
+
+    print(f'Extracting positions of mutations within the {loci_list} locus.')
+    print('All values of "None" must be set to missing to allow ')
+    print('     filling mutations forward over time (within patient).')
+    print()
+
+    # Keep only
+    #   (1) completed tests
+    #   (2) with a medical record number
+    #   (3) non-null list of loci-specific mutations (e.g., RT_list)
+    print('Dropped')
+
+    have_mutations_list = (df[loci_list].notnull())
+    print(f'  - {len(df[~have_mutations_list])} without observed mutations at the {loci} locus')
+    df = df[have_mutations_list]
+
+    complete_test = (df['REPORT_COMPLETE'] == True)
+    print(f'  - {len(df[~complete_test])} incomplete test accessions')
+    df = df[complete_test]
+
+    have_mrn = (df['PAT_MRN_ID'].notnull())
+    print(f'  - {len(df[~have_mrn])} test accessions with no MRN')
+    df = df[have_mrn]
+    print('')
+
+    order_info_cols = ['PAT_MRN_ID', 'COLLECTED_DATE', 'ACCESSION']
+    df = df[order_info_cols + [loci_list]]
+
+    # Split off patients with a single test
+    #   to reduce processing time in the step below,
+    #   which is required only for patients with multiple tests
+    have_multiple_tests = df \
+        .groupby('PAT_MRN_ID')['ACCESSION'] \
+        .transform('nunique') > 1
+
+    single_test_df = df[~have_multiple_tests].copy()
+    # alphabetize/standardize the {loci_list} components
+    single_test_df[loci_list] = single_test_df[loci_list].apply(lambda x: ",".join(sorted(x.split(","))))
+
+    # Patients never actually "lose" a mutation; it's just unobserved due to 
+    #   a combination of treatment-inhibition and between-strain-competition.
+    # Therefore, we want to fill mutations over time, within patient.
+    # However, mutations are currently in an unordered list.
+    # Use an Ordered Dict{ } to standardize the order of mutations with the lists.
+    multiple_test_df = df[have_multiple_tests].copy()
+    multiple_test_df.sort_values(['PAT_MRN_ID', 'COLLECTED_DATE'], inplace=True)
+    multiple_test_df.reset_index(inplace=True, drop=True)
+
+    for i, row in multiple_test_df.iterrows():
+        if (i > 0) and (row['PAT_MRN_ID'] == multiple_test_df.loc[i-1]['PAT_MRN_ID']):
+            combined_list = multiple_test_df.loc[i-1][loci_list] + ',' + row[loci_list]
+            multiple_test_df.loc[i, loci_list] = combined_list
+
+    multiple_test_df.loc[:, loci_list] = [
+        ', '.join(o.fromkeys(x.split(','), 1))
+        for x in multiple_test_df[loci_list]]
+
+    # Recombine dataframes
+    position_df = pd.concat([single_test_df,
+                            multiple_test_df[order_info_cols + [loci_list]]])
+    position_df.reset_index(inplace=True, drop=True)
+
+    # Pivot from wide to long (create mutation dummies)
+    dummies_df = position_df[loci_list].str.split(",", expand=True)
+
+    # 0	        1           2           ...
+    # ------------------------------------------
+    # V245V/M   D123E      np.NaN
+
+    # Join (left) the dummies back into the position_df to get order info
+    position_df = position_df[order_info_cols] \
+        .merge(dummies_df, left_index=True, right_index=True, how='left')
+
+    # Melt from wide to long
+    # LINE is currently redundant with ACCESSION (but used in a later step)
+    position_df = position_df.melt(id_vars=order_info_cols) \
+        .sort_values(['PAT_MRN_ID', 'COLLECTED_DATE', 'variable']) \
+        .rename(columns={'variable': 'LINE', 'value': 'MUTATION'})
+
+    # remove any spaces at the begining of mutations (pre-cautinary)
+    position_df['MUTATION'] = position_df['MUTATION'].str.strip()
+
+    # Drop duplicates (artefact of filling mutations over time)
+    position_df.drop_duplicates(subset=['ACCESSION', 'MUTATION'], inplace=True)
+
+    # ACCESSION	    LINE	MUTATION
+    # ------------------------------
+    # 09-150972	    7	    V245V/M
+    # 09-150972     8 	    D123E
+
+    # Drop all null values generated during the melting process
+    position_df = position_df.loc[position_df['MUTATION'].notnull()]
+
+    # Extract the position and amino acid from mutations
+    position_df['POSITION'] = position_df['MUTATION'].str.extract(r'[A-Z]([\d]+)')
+    position_df['AA'] = position_df['MUTATION'].str.extract(r'[\d]+([A-Z/\^]*)')
+
+    # ACCESSION	    LINE	MUTATION	POSITION    AA
+    # ------------------------------------------------
+    # 09-150972	    7	    V245V/M	    245         V/M
+    # 09-150972     8 	    D123E	    123         E
+
+    # Set aside insertions (e.g., T69T/S/SSS) and deletions (e.g., E/^, T/^)
+    #   in order to count the components of each substitution mixture
+    #
+    # T69T/S/SSS refers to an amino acid insertion between codons 67 and 70 in the
+    #   reverse transcriptase of HIV-1. By convention, it is assigned to codon 69.
+    insertion_mask = (position_df['MUTATION'].str.contains('[A-Z][A-Z]+'))
+    deletion_mask = (position_df['MUTATION'].str.contains(r'\^', na=False))
+
+    position_df.loc[insertion_mask, 'AA'] = 'ins'
+    position_df.loc[deletion_mask, 'AA'] = 'del'
+    # remove the '/^' from deletions
+    position_df.loc[deletion_mask, 'MUTATION'] = position_df.loc[deletion_mask]['MUTATION'].str.replace(r'\/.*', '', regex=True)
+
+    insertions_deletions = position_df['AA'].isin(['ins', 'del'])
+
+    ins_del_df = position_df[insertions_deletions].copy()
+    # Remove insertions/deletions
+    position_df = position_df[~insertions_deletions].copy()
+
+    # Count the number of components in each substitution mixture
+    #   (one forward-slash per component)
+    position_df['MIXTURE_COMPONENTS'] = [
+        aa.count('/')+1 if '/' in aa else 1 for aa in position_df['MUTATION']]
+
+    position_df = position_df.loc[
+        np.repeat(position_df.index.values, position_df['MIXTURE_COMPONENTS'])]
+
+    # ACCESSION	    LINE	MUTATION	POSITION    AA      MIXTURE_COMPONENTS
+    # -------------------------------------------------------------------------
+    # 09-150972	    7	    V245V/M	    245         V/M             2
+    # 09-150972	    7	    V245V/M	    245         V/M             2   <<< Added
+    # 09-150972     8 	    D123E	    123         E               1
+
+    # drop the index (no longer meaningful after replication)
+    position_df.reset_index(drop=True, inplace=True)
+
+    # Number the components of each mixture
+    # Must groupby LINE instead of POSITION since,
+    #   by filling mutations forward over time,
+    #   E40D and E40D/E may appear on the same accession
+    position_df['MIXTURE_POSITION'] = position_df.groupby(
+        ['ACCESSION', 'LINE', 'MIXTURE_COMPONENTS']).cumcount()
+
+    # LINE	MUTATION	POSITION    AA    MIXTURE_COMPONENTS    MIXTURE_POSITION
+    # --------------------------------------------------------------------------
+    # 7	    V245V/M	    245         V/M          2                   0
+    # 7	    V245V/M	    245         V/M          2                   1
+    # 8 	D123E	    123         E            1                   0
+
+    # Extract the component referenced by each position
+    # Extract the component referenced by each position
+    for i, row in position_df[position_df['MIXTURE_COMPONENTS'] >= 2].iterrows():
+
+        if row['MIXTURE_POSITION'] == 0:
+            position_df.loc[i, 'AA'] = re.search(
+                '([A-Z])[/d][A-Z]', row['MUTATION']).group(1).strip()
+
+        else:
+            this_aa = re.search(
+                '[A-Z]/'*(int(row['MIXTURE_POSITION'])) + '([A-Z])', row['MUTATION'])
+
+            if this_aa:
+                position_df.loc[i, 'AA'] = this_aa.group(1).strip()
+            else:
+                # Debugging
+                raise ValueError(i, row['MUTATION'], int(row['MIXTURE_POSITION']))
+
+    # LINE	MUTATION	POSITION    AA    MIXTURE_COMPONENTS    MIXTURE_POSITION
+    # --------------------------------------------------------------------------
+    # 7	    V245V/M	    245         V  **        2                   0
+    # 7	    V245V/M	    245         M  **        2                   1
+    # 8 	D123E	    123         E            1                   0
+
+    # Drop the mixture columns (no longer needed)
+    position_df.drop(
+        columns=['MIXTURE_COMPONENTS', 'MIXTURE_POSITION'], inplace=True)
+
+    # Join back in the insertions and deletions that were removed earlier
+    position_df = pd.concat([position_df, ins_del_df], axis=0, sort=False)
+    position_df['POSITION'] = position_df['POSITION'].astype('float')
+
+    position_df.sort_values(
+        ['PAT_MRN_ID', 'COLLECTED_DATE', 'POSITION', 'LINE'], inplace=True)
+    position_df.reset_index(inplace=True, drop=True)
+
+    return position_df
+
+
+def score_positioned_mutations(position_df, scores):
+
+    # Match Stanford's mutation scores for each drug/ARV with observed mutations
+    #   (insertions match on 'ins', deletions match on 'del')
+    scores_df = position_df.copy()
+    for arv in [i for i in scores.columns if i not in ['RULE', 'POSITION', 'AA']]:
+        scores_df = scores_df.merge(scores[['POSITION', 'AA', arv]], 
+                                    on=['POSITION', 'AA'], how='left')
+
+    # LABEL MUTATIONS IDENTIFIED AS 'RESISTANCE-ASSOCIATED' BY MONOGRAM
+    # -----------------------------------------------------------------
+    # added after parent function was completed -- otherwise would have been added differently
+    # monogram_position_df = _gather_monogram_reported_mutations(mutations_df, loci)
+    # scores_df = scores_df.merge(monogram_position_df, how='left')
+
+    print()
+
+    return scores_df
+
+
+def calculate_total_resistance(position_df, complex_rules):
+    import pandas as pd
+    import re
+    from warnings import simplefilter
+
+    # Future Warning: Setting an item of incompatible dtype is deprecated
+    # This appears to be a bug in pandas 2.1.1
+    # See https://github.com/pandas-dev/pandas/issues/55025
+    simplefilter(action='ignore', category=FutureWarning)
+
+    # PerformanceWarning: DataFrame is highly fragmented.
+    # This new to pandas 2.0(+)
+    # See https://stackoverflow.com/questions/68292862
+    simplefilter(action="ignore", category=pd.errors.PerformanceWarning)
+
+    non_arv_cols = ['RULE', 'POSITION', 'AA', 'RESISTANCE_TYPE']
+    arv_cols = [col for col in complex_rules.columns
+                if col not in non_arv_cols]
+
+    # Total Scores (copy to modify)
+    simple_scores_df = position_df.copy()
+
+    # Rescore dict
+    # {Rule: {ARV: penalty}, ...}
+    # {'G118R + E138AKT': {'BIC': 10, 'CAB': 10, 'DTG': 10, 'EVG': 10}, ... }
+    arv_rescore_dict = complex_rules[arv_cols].to_dict('records')
+    arv_rescore_dict = dict(zip(complex_rules['RULE'], arv_rescore_dict))
+
+    # List to hold single-row dataframes
+    test_df_list = []
+
+    # For complex rule ...
+    for i, row in complex_rules.iterrows():
+        pos = re.findall(r'([A-Z][\d][\d]?[\d]?)', row['RULE'])
+        aas = re.findall(r'[\d][\d]?[\d]?([A-Z]+)', row['RULE'])
+
+        # Initialize a list (not required; here for clarity)
+        accessions_list = list()
+
+        # For each component of rule [i] ...
+        for j in range(0, len(pos)):
+            # Get all accession IDs where first component of rule [i] found
+            if j == 0:
+                accessions_list = position_df[
+                    position_df['MUTATION'].str.startswith(pos[j]) &
+                    position_df['AA'].str.contains(f'[{aas[j]}]', regex=True)
+                    ]['ACCESSION'].to_list()
+
+            # Get all accession IDs where 
+            #   remaining components [j >0] of rule [i] found
+            else:
+                # Recursively update the accession_list[ ]
+                accessions_list = position_df[
+                    position_df['ACCESSION'].isin(accessions_list) &
+                    position_df['MUTATION'].str.startswith(pos[j]) &
+                    position_df['AA'].str.contains(f'[{aas[j]}]', regex=True)
+                    ]['ACCESSION'].to_list()
+
+        # For each test accession to which the rule applies ...
+        for test in set(accessions_list):
+            # Create a single row dataframe
+            #
+            # ACCESSION ABC AZT FTC 3TC TDF ... RULE
+            # -----------------------------------------------
+            # 18-157409 15  0   0   0   0   ... L74IV + M184V
+            test_df = pd.DataFrame(
+                index=[test],
+                data=arv_rescore_dict[row['RULE']]).reset_index()
+            test_df.rename(columns={'index': 'ACCESSION'}, inplace=True)
+            test_df['RULE'] = row['RULE']
+            # Append to the growing list
+            test_df_list.append(test_df)
+
+    # Create DataFrame from list of dataframes
+    complex_rules_df = pd.concat(test_df_list)
+    complex_rules_df.reset_index(inplace=True, drop=True)
+
+    # For each rule observed ...
+    for i, row in complex_rules_df.iterrows():
+        # Extract a '-' delimitted list of the positions
+        #   (exclude any/all amino acids involved in a mutation)
+        positions = [re.search(r'([A-Z][\d]+)', i)
+                     .group(1).strip() for i in row['RULE'].split('+')]
+        complex_rules_df.loc[i, 'POSITIONS'] = '-'.join(positions)
+
+    # Take the max *complex* penalty at each position
+    #
+    # ACCESSION	    ABC	    AZT	    FTC	 ...   RULE	            POSITIONS
+    # -------------------------------------------------------------------
+    # 06-153017	    10.0	10.0	0.0	 ...   Q151M + M184IV	Q151-M184
+    # 09-135810	    10.0	10.0	0.0	 ...   Q151M + M184IV	Q151-M184
+    complex_rules_df_max = complex_rules_df\
+        .drop(columns='RULE')\
+        .groupby(['ACCESSION', 'POSITIONS'])\
+        .agg('max')\
+        .reset_index()
+
+    # Validate at
+    # https://hivdb.stanford.edu/hivdb/by-patterns/
+
+    # Take the max *simple* penalty at each position
+    # And sum all position-penalties within each test accession
+    #
+    # PAT_MRN_ID	COLLECTED_DATE	ACCESSION	ABC	AZT	FTC	...
+    # ----------------------------------------------------------------------
+    # 9415	        2013-06-28	    13-134628	0.0	0.0	0.0	...
+    # 33464	        2006-07-21	    06-132370	0.0	0.0	0.0	...
+    position_cols = ['PAT_MRN_ID', 'COLLECTED_DATE', 'ACCESSION', 'POSITION']
+    simple_scores_df = simple_scores_df[position_cols + arv_cols]\
+        .groupby(position_cols)\
+        .agg('max')\
+        .reset_index()\
+        .drop(columns='POSITION')\
+        .groupby(position_cols[0:3])\
+        .agg('sum')\
+        .reset_index()
+
+    # Transform *simple* scores from wide to long
+    #
+    # PAT_MRN_ID	COLLECTED_DATE	ACCESSION	ARV	    SIMPLE_SCORE
+    # --------------------------------------------------------------
+    # 9415	        2013-06-28	    13-134628	ABC	    0.0
+    # 33464	        2006-07-21	    06-132370	ABC	    0.0
+    simple_scores_df_melt = simple_scores_df\
+        .groupby(['PAT_MRN_ID', 'COLLECTED_DATE', 'ACCESSION'])\
+        .agg('sum')\
+        .reset_index()\
+        .melt(id_vars=['PAT_MRN_ID', 'COLLECTED_DATE', 'ACCESSION'],
+              var_name='ARV',
+              value_name='SIMPLE_SCORE')
+
+    # Transform *complex* scores from wide to long
+    #
+    # ACCESSION	    ARV	    COMPLEX_PENALTY
+    # -------------------------------------
+    # 02-126831	    ABC	    20.0
+    # 02-128088	    ABC	    0.0
+    complex_rules_df_melt = complex_rules_df_max\
+        .drop(columns='POSITIONS')\
+        .groupby('ACCESSION')\
+        .agg('sum')\
+        .reset_index()\
+        .melt(id_vars=['ACCESSION'],
+              var_name='ARV',
+              value_name='COMPLEX_PENALTY')
+
+    # Join *simple* and *complex* scores
+    total_scores_df = simple_scores_df_melt.merge(
+        complex_rules_df_melt,
+        left_on=['ACCESSION', 'ARV'], 
+        right_on=['ACCESSION', 'ARV'], how='outer')
+
+    # Total score = Simple score + Complex score
+    total_scores_df.fillna(0, inplace=True)
+    total_scores_df['TOTAL_SCORE'] = \
+        total_scores_df[['SIMPLE_SCORE', 'COMPLEX_PENALTY']].sum(axis=1,
+                                                                 skipna=True)
+
+    # Categorize Stanford predicted level of resistance
+    total_scores_df.loc[
+        total_scores_df['TOTAL_SCORE'].between(0, 9),
+        'RESISTANCE_CATEGORY'] = 'Suceptible'
+
+    total_scores_df.loc[
+        total_scores_df['TOTAL_SCORE'].between(10, 14),
+        'RESISTANCE_CATEGORY'] = 'Potential low-level'
+
+    total_scores_df.loc[
+        total_scores_df['TOTAL_SCORE'].between(15, 29),
+        'RESISTANCE_CATEGORY'] = 'Low'
+
+    total_scores_df.loc[
+        total_scores_df['TOTAL_SCORE'].between(30, 59),
+        'RESISTANCE_CATEGORY'] = 'Intermediate'
+
+    total_scores_df.loc[
+        total_scores_df['TOTAL_SCORE'] >= 60,
+        'RESISTANCE_CATEGORY'] = 'High'
+
+    return total_scores_df
@@ -0,0 +1,194 @@
+import os
+from zipfile import ZipFile, ZIP_DEFLATED
+
+import pytest
+
+
+def _make_pdf(pages):
+    """A minimal PDF with one line of Helvetica text per page."""
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>',
+               '<< /Type /Pages /Kids [{}] /Count {} >>'.format(
+                   ' '.join(f'{4 + 2 * i} 0 R' for i in range(len(pages))),
+                   len(pages)),
+               '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+
+    for i, text in enumerate(pages):
+        text = text.replace('(', '\\(').replace(')', '\\)')
+        content = f'BT /F1 8 Tf 20 750 Td ({text}) Tj ET'
+        objects.append('<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       '/Resources << /Font << /F1 3 0 R >> >> '
+                       f'/Contents {5 + 2 * i} 0 R >>')
+        objects.append(f'<< /Length {len(content)} >>\nstream\n{content}\n'
+                       'endstream')
+
+    pdf, offsets = b'%PDF-1.4\n', []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+
+    xref = len(pdf)
+    pdf += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    pdf += b''.join(f'{offset:010d} 00000 n \n'.encode() for offset in offsets)
+    pdf += (f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n'
+            f'startxref\n{xref}\n%%EOF\n').encode()
+
+    return pdf
+
+
+def _header(product, n):
+    return (f'{product} Patient Name: DOE, JOHN{n} DOB: 01-JAN-1970 Patient '
+            f'ID: {1000000 + n} Gender: M Monogram Accession #: '
+            f'18-{100000 + n} Date Collected: {1 + n % 28:02d}-MAY-2016 11:20 '
+            'PT Date Received: 18-MAY-2016 11:20 PT Date Reported: '
+            '20-MAY-2016 11:20 PT Mode: F Report Status: FINAL Referring '
+            'Physician: Jane Smith Reference Lab ID/Order #: 998877 X HIV-1 '
+            'Subtype: B Generic ')
+
+
+RT_LISTS = ['M184V, K103N', 'None', 'K65R', 'V245V/M, D123E', 'M41L, T215Y']
+
+
+def _geneseq_pages(n):
+    """Pages of the n-th of a series of distinct GeneSeq reports."""
+    return [_header('GeneSeq HIV', n) +
+            'Abacavir Ziagen M184V, L74I ABC Efavirenz Sustiva K103N EFV ',
+            f' RT {RT_LISTS[n % len(RT_LISTS)]} PR None IN None Comments ',
+            'Resistance is assessed by a proprietary algorithm '
+            f'(version {10 + n % 3}) ']
+
+
+def _phenosense_pages(n):
+    """Pages of the n-th of a series of distinct PhenoSense reports."""
+    return [_header('PhenoSense HIV', n) +
+            f'Lamivudine Epivir (3.5) {1 + n}.74 3TC Abacavir Ziagen '
+            f'(4.5-6.5) 1.8{n % 10} ABC Efavirenz Sustiva (3.0) 0.9 EFV ',
+            ' Patient-specific Results Drugs 3TC ABC EFV IC50 1.2 0.5 0.01 '
+            'Fold ',
+            f' Replication Capacity = {40 + n}%(Range 30%-60%) ']
+
+
+def _deliver(zip_path, reports, mtime=None):
+    """Writes {reports} (DOC_NAME -> pages) to a .zip archive of PDFs."""
+    with ZipFile(zip_path, 'w', compression=ZIP_DEFLATED) as zipObj:
+        for doc_name, pages in reports.items():
+            zipObj.writestr(doc_name, _make_pdf(pages))
+
+    if mtime is not None:
+        os.utime(zip_path, (mtime, mtime))
+
+
+@pytest.fixture
+def make_pdf():
+    return _make_pdf
+
+
+@pytest.fixture
+def geneseq_pages():
+    return _geneseq_pages
+
+
+@pytest.fixture
+def phenosense_pages():
+    return _phenosense_pages
+
+
+@pytest.fixture
+def deliver():
+    return _deliver
+
+
+# Stanford HIVdb scores; {file prefix: (ARVs, simple rules, complex rules)}
+HIVDB_SCORES = {
+    'nrti': (['ABC', 'FTC', '3TC', 'TFV', 'ZDV'],
+             ['M184V', 'M184I', 'L74I', 'K65R', 'Q151M', 'T215Y', 'T215F',
+              'M41L', 'K70R', 'A62V', 'E40D', 'D123E', 'V245M'],
+             ['M184IV + L74IV', 'Q151M + M184IV', 'M41L + T215FY',
+              'K65R + M184V', 'M41L + K70R + T215FY']),
+    'nnrti': (['EFV', 'ETR', 'NVP', 'RPV', 'DOR'],
+              ['K103N', 'Y181C', 'V245M', 'V245E', 'A62V'],
+              ['K103N + Y181C']),
+    'pi': (['ATV', 'DRV', 'LPV'],
+           ['L10I', 'V82A', 'I54V', 'M46I', 'L90M', 'D30N'],
+           ['I54V + V82A', 'L10I + L90M', 'M46I + I54V + V82A']),
+    'insti': (['BIC', 'DTG', 'EVG', 'RAL', 'CAB'],
+              ['G118R', 'E138K', 'G140S', 'Q148H', 'N155H', 'T97A'],
+              ['G118R + E138AKT', 'E138AKT + G140ACS', 'G140S + Q148HKR'])}
+
+
+def _write_hivdb_scores(hivdb):
+    """Writes the scores (and comments) of each file prefix to {hivdb}."""
+    for prefix, (arvs, simple_rules, complex_rules) in HIVDB_SCORES.items():
+        for rule_type, header, rules in [
+                ('simple', 'Rule', simple_rules),
+                ('complex', 'Combination Rule', complex_rules)]:
+            # Scores of 0 to 60 (in steps of 5), varying by rule and ARV
+            rows = [f'{header},' + ','.join(arvs)] + [
+                f'{rule},' + ','.join(str(5 * ((i * 7 + j * 3) % 13))
+                                      for j, _ in enumerate(arvs))
+                for i, rule in enumerate(rules)]
+            hivdb.joinpath(f'{prefix}-scores-{rule_type}.csv').write_text(
+                '\n'.join(rows) + '\n')
+
+        hivdb.joinpath(f'{prefix}-comments.csv').write_text(
+            'header\nMutation,Type,Comment\n' + ''.join(
+                f'{rule},Major,"{rule} is a comment"\n'
+                for rule in simple_rules))
+
+
+# Genotypic tests; mutations recur (in any order) across tests and
+#   patients, and patients with more than one test carry mutations forward
+GENOTYPIC_TESTS = [
+    # PAT_MRN_ID, COLLECTED_DATE, ACCESSION, REPORT_COMPLETE,
+    #   RT_LIST, PR_LIST, INSTI_LIST
+    ('1001', '2015-03-02', '15-100001', True,
+     'M184V,K103N', 'L10I,V82A', None),
+    ('1001', '2016-07-19', '16-100002', True,
+     'K103N,Y181C', 'I54V', 'G140S,Q148H'),
+    ('1001', '2017-01-05', '17-100003', True,
+     'M41L,T215Y/F,K70R', None, 'N155H'),
+    ('1002', '2015-05-11', '15-100004', True,
+     'K103N,M184V', 'V82A,L10I', None),
+    ('1003', '2016-02-23', '16-100005', True,
+     'M184V,K103N', 'L10I,V82A', 'G118R,E138K'),
+    ('1004', '2016-08-30', '16-100006', True,
+     'V245V/M,D123E,T69T/S/SSS', 'D30N', 'G118R,E138K'),
+    ('1004', '2016-08-30', '16-100007', True,
+     'E44E/^,M184M/V/I', 'L90M,L10I', 'T97A'),
+    ('1005', '2017-09-14', '17-100008', True,
+     'K65R,M184V', 'M46I,I54V,V82A', 'G140S,Q148H'),
+    ('1006', '2018-04-01', '18-100009', True,
+     'K65R,M184V', 'M46I,I54V,V82A', 'G140S,Q148H'),
+    ('1007', '2018-06-12', '18-100010', True,
+     'Q151M,M184I,L74I', None, None),
+    ('1008', '2018-06-13', '18-100011', False,
+     'M184V', 'L10I', None),
+    (None, '2018-06-14', '18-100012', True,
+     'K103N', 'V82A', 'T97A'),
+    ('1009', '2019-01-22', '19-100013', True,
+     None, None, None),
+    ('1010', '2019-02-03', '19-100014', True,
+     'E40D,E40D/E,A62V', 'L10I,L90M', 'E138K'),
+]
+
+
+def _genotypic_df():
+    import pandas as pd
+
+    return pd.DataFrame(
+        GENOTYPIC_TESTS,
+        columns=['PAT_MRN_ID', 'COLLECTED_DATE', 'ACCESSION',
+                 'REPORT_COMPLETE', 'RT_LIST', 'PR_LIST', 'INSTI_LIST'])
+
+
+@pytest.fixture
+def hivdb_dir(tmp_path):
+    hivdb = tmp_path / 'hivdb'
+    hivdb.mkdir()
+    _write_hivdb_scores(hivdb)
+
+    return hivdb
+
+
+@pytest.fixture
+def mutations_df():
+    return _genotypic_df()
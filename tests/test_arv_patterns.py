@@ -0,0 +1,52 @@
+from src.utils import (_extract_drms_as_dict, arv_master_dict,
+                       arv_pattern_registry)
+
+
+LENACAPAVIR = ('Sunlenca', 'Lenacapavir', 'LEN', '2022-12-22')
+
+SAMPLE_TEXT = ('Abacavir Ziagen M184V, L74I ABC Efavirenz Sustiva K103N EFV '
+               'Lenacapavir Sunlenca M66I LEN ')
+
+
+def _drugs(registry):
+    return [art_attributes[2] for art_attributes, _, _ in registry['DRMS']]
+
+
+def test_registry_compiled_once():
+    assert arv_pattern_registry('geneseq') is arv_pattern_registry('GENESEQ')
+
+
+def test_registry_rebuilt_when_class_added(monkeypatch):
+    registry = arv_pattern_registry('GENESEQ')
+    assert 'LEN' not in _extract_drms_as_dict(SAMPLE_TEXT)
+
+    monkeypatch.setitem(arv_master_dict, 'CAI', [LENACAPAVIR])
+
+    assert arv_pattern_registry('GENESEQ') is not registry
+    assert _drugs(arv_pattern_registry('GENESEQ'))[-1] == 'LEN'
+    assert _extract_drms_as_dict(SAMPLE_TEXT)['LEN'] == 'M66I'
+
+    # ... and again once the class is removed
+    monkeypatch.undo()
+    assert arv_pattern_registry('GENESEQ') is registry
+
+
+def test_registry_rebuilt_when_drug_edited(monkeypatch):
+    registry = arv_pattern_registry('PHENOSENSE')
+
+    # Extended in place
+    arv_master_dict['NRTI'].append(LENACAPAVIR)
+    try:
+        assert 'LEN' in _drugs(arv_pattern_registry('PHENOSENSE'))
+    finally:
+        arv_master_dict['NRTI'].remove(LENACAPAVIR)
+    assert arv_pattern_registry('PHENOSENSE') is registry
+
+    monkeypatch.setitem(arv_master_dict, 'NRTI', [
+        ('Ziagen', 'Abacavir', 'ABC', '2000-01-01')
+        if art_attributes[2] == 'ABC' else art_attributes
+        for art_attributes in arv_master_dict['NRTI']])
+    assert arv_pattern_registry('PHENOSENSE') is not registry
+
+    monkeypatch.undo()
+    assert arv_pattern_registry('PHENOSENSE') is registry
@@ -0,0 +1,105 @@
+from zipfile import ZipFile
+
+import pandas as pd
+import pytest
+
+from src.utils import (_parsed_reports_paths, parse_genotypic_reports,
+                       parse_phenotypic_reports)
+
+
+PARSERS = {'genotypic': (parse_genotypic_reports, 'geneseq'),
+           'phenotypic': (parse_phenotypic_reports, 'phenosense')}
+
+parsers = pytest.mark.parametrize('parser, pages', [
+    ('genotypic', 'geneseq_pages'), ('phenotypic', 'phenosense_pages')])
+
+
+def _reports(pages):
+    return {f'18-{n:06d}_F.PDF': pages(n) for n in range(10)}
+
+
+def _interrupt(path_to_zips, deliver, pages, parser):
+    """
+    Starts a checkpointed run that stops at its last report (not a PDF),
+    then delivers that report again as a PDF.
+    """
+    parse_reports, test_type = PARSERS[parser]
+    reports = _reports(pages)
+    path_to_zips.mkdir()
+
+    deliver(path_to_zips / 'delivery.zip',
+            {doc_name: doc_pages for doc_name, doc_pages in reports.items()
+             if doc_name != '18-000009_F.PDF'})
+    with ZipFile(path_to_zips / 'delivery.zip', 'a') as zipObj:
+        zipObj.writestr('18-000009_F.PDF', b'not a PDF')
+
+    with pytest.raises(Exception):
+        parse_reports(path_to_zips, test_type, stream=True,
+                      checkpoint_every=2)
+
+    assert _parsed_reports_paths(path_to_zips, parser)['checkpoint'].exists()
+
+    deliver(path_to_zips / 'delivery.zip', reports)
+
+
+def _as_tuple(parsed):
+    return parsed if isinstance(parsed, tuple) else (parsed,)
+
+
+@parsers
+def test_resumed_run_same_as_uninterrupted(tmp_path, deliver, request,
+                                           capsys, parser, pages):
+    parse_reports, test_type = PARSERS[parser]
+    pages = request.getfixturevalue(pages)
+
+    _interrupt(tmp_path / 'resumed', deliver, pages, parser)
+    capsys.readouterr()
+    resumed = parse_reports(tmp_path / 'resumed', test_type, stream=True,
+                            resume=True)
+
+    # The reports before the interruption were not parsed again
+    assert '8 checkpointed records resumed' in capsys.readouterr().out
+    assert not _parsed_reports_paths(
+        tmp_path / 'resumed', parser)['checkpoint'].exists()
+
+    (tmp_path / 'uninterrupted').mkdir()
+    deliver(tmp_path / 'uninterrupted' / 'delivery.zip', _reports(pages))
+    uninterrupted = parse_reports(tmp_path / 'uninterrupted', test_type,
+                                  stream=True)
+
+    for resumed_df, uninterrupted_df in zip(_as_tuple(resumed),
+                                            _as_tuple(uninterrupted)):
+        assert len(resumed_df) > 0
+        pd.testing.assert_frame_equal(resumed_df, uninterrupted_df)
+
+
+def _interrupt_run(quarantine):
+    raise KeyboardInterrupt
+
+
+@parsers
+@pytest.mark.parametrize('options, resumed_with', [
+    ({}, {'page_limit': True}),
+    ({'page_limit': True}, {}),
+    ({}, {'dedupe': True}),
+    ({}, {'isolate': True}),
+    ({'timeout': 60}, {'timeout': 120})])
+def test_resumed_with_other_options(tmp_path, deliver, request, monkeypatch,
+                                    parser, pages, options, resumed_with):
+    parse_reports, test_type = PARSERS[parser]
+    deliver(tmp_path / 'delivery.zip',
+            _reports(request.getfixturevalue(pages)))
+
+    # Interrupted once every report is checkpointed
+    monkeypatch.setattr('src.utils._quarantine_table', _interrupt_run)
+    with pytest.raises(KeyboardInterrupt):
+        parse_reports(tmp_path, test_type, stream=True, checkpoint_every=2,
+                      **options)
+    monkeypatch.undo()
+
+    with pytest.raises(ValueError, match='checkpoint of a run with options'):
+        parse_reports(tmp_path, test_type, stream=True, resume=True,
+                      **resumed_with)
+
+    # ... but may be with the same options
+    parse_reports(tmp_path, test_type, stream=True, resume=True, **options)
@@ -0,0 +1,19 @@
+from src.utils import classify_report
+
+
+def test_title_decides_over_boilerplate():
+    sample_text = ('GeneSeq HIV Patient Name: DOE, JOHN ... Comments: '
+                   'consider ordering PhenoSense GT for a phenotype')
+
+    assert classify_report(sample_text) == 'GENESEQ'
+
+
+def test_more_specific_product_name():
+    assert classify_report('PhenoSense GT Patient Name: DOE, JOHN') == \
+        'PHENOSENSE-GT'
+    assert classify_report('PhenoSense HIV Patient Name: DOE, JOHN') == \
+        'PHENOSENSE'
+
+
+def test_no_product_name():
+    assert classify_report('Patient Name: DOE, JOHN') is None
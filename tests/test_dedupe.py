@@ -0,0 +1,47 @@
+from itertools import permutations
+
+import pandas as pd
+
+from src.utils import (PrefetchedReport, _deduplicate_report_paths,
+                       deduplicate_reports)
+
+
+REPORTS = [PrefetchedReport('C.PDF', b'same'),
+           PrefetchedReport('A.PDF', b'same'),
+           PrefetchedReport('D.PDF', b'other'),
+           PrefetchedReport('B.PDF', b'same')]
+
+
+def test_parsed_report_does_not_depend_on_listing_order():
+    for report_paths in permutations(REPORTS):
+        unique_report_paths, duplicates_df = deduplicate_reports(
+            list(report_paths))
+
+        assert [report.name for report in unique_report_paths] == \
+            ['A.PDF', 'D.PDF']
+        assert duplicates_df.set_index('DOC_NAME')['PARSED_AS'].to_dict() == \
+            {'A.PDF': 'A.PDF', 'B.PDF': 'A.PDF', 'C.PDF': 'A.PDF',
+             'D.PDF': 'D.PDF'}
+
+
+def test_duplicates_of_earlier_runs_are_not_parsed():
+    # The first (incremental) run parsed A.PDF
+    report_paths, _, manifest = _deduplicate_report_paths(
+        [REPORTS[1]], dedupe=True,
+        manifest=pd.DataFrame({'DOC_NAME': ['A.PDF'], 'CRC': [1]}))
+
+    assert manifest['CONTENT_HASH'].notna().all()
+
+    # A later delivery re-sends it as C.PDF, along with new report D.PDF
+    manifest = pd.concat([manifest, pd.DataFrame(
+        {'DOC_NAME': ['C.PDF', 'D.PDF'], 'CRC': [1, 2]})])
+
+    report_paths, duplicates, manifest = _deduplicate_report_paths(
+        [REPORTS[0], REPORTS[2]], dedupe=True, manifest=manifest)
+
+    assert [report.name for report in report_paths] == ['D.PDF']
+    assert manifest.set_index('DOC_NAME')['PARSED_AS'].to_dict() == \
+        {'A.PDF': 'A.PDF', 'C.PDF': 'A.PDF', 'D.PDF': 'D.PDF'}
+    assert {(duplicate['DOC_NAME'], duplicate['MATCH'])
+            for duplicate in duplicates if duplicate['MATCH'] == 'CONTENT'} \
+        == {('C.PDF', 'CONTENT')}
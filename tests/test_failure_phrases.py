@@ -0,0 +1,40 @@
+import re
+
+import pytest
+
+from src.utils import (_mark_report_as_complete, failure_phrases,
+                       find_failure_phrase)
+
+
+def _complete_as_before(sample_text):
+    # One search per phrase, as the parsers once did
+    return not any(re.search(phrase, sample_text, flags=re.IGNORECASE)
+                   for phrase in failure_phrases)
+
+
+@pytest.mark.parametrize('phrase', failure_phrases)
+def test_each_phrase_found(phrase):
+    sample_text = f'GeneSeq HIV Comments: The {phrase.upper()}. RT None'
+
+    assert find_failure_phrase(sample_text) == \
+        (phrase, sample_text.index(phrase.upper()))
+    assert _mark_report_as_complete(sample_text) is False
+    assert _complete_as_before(sample_text) is False
+
+
+def test_leftmost_phrase_found():
+    # Listed after 'common causes of assay failure', but found first
+    sample_text = ('GeneSeq HIV The sample could not be completed. See '
+                   'common causes of assay failure.')
+
+    assert find_failure_phrase(sample_text) == \
+        ('could not be completed', sample_text.index('could not'))
+
+
+def test_complete_report():
+    sample_text = ('GeneSeq HIV Abacavir Ziagen M184V, L74I ABC RT M184V '
+                   'PR None IN None')
+
+    assert find_failure_phrase(sample_text) == (None, None)
+    assert _mark_report_as_complete(sample_text) is True
+    assert _complete_as_before(sample_text) is True
@@ -0,0 +1,49 @@
+import pytest
+
+from src.utils import load_hivdb_ruleset
+
+
+def _write_locus(hivdb, prefix, drugs, mutation):
+    header = ','.join(drugs)
+    scores = ','.join('10' for _ in drugs)
+
+    hivdb.joinpath(f'{prefix}-scores-simple.csv').write_text(
+        f'Rule,{header}\n{mutation},{scores}\n')
+    hivdb.joinpath(f'{prefix}-scores-complex.csv').write_text(
+        f'Combination Rule,{header}\n{mutation} + {mutation},{scores}\n')
+    hivdb.joinpath(f'{prefix}-comments.csv').write_text(
+        f'header\nMutation,Type,Comment\n{mutation},Major,"A comment"\n')
+
+
+@pytest.fixture
+def hivdb(tmp_path):
+    _write_locus(tmp_path, 'nrti', ['ABC', '3TC'], 'M184V')
+    _write_locus(tmp_path, 'nnrti', ['EFV', 'NVP'], 'K103N')
+    _write_locus(tmp_path, 'pi', ['ATV', 'DRV'], 'V82A')
+
+    return tmp_path
+
+
+def test_missing_locus_left_out(hivdb):
+    with pytest.warns(UserWarning, match='INSTI left out'):
+        ruleset = load_hivdb_ruleset(hivdb)
+
+    assert 'RT' in ruleset and 'PR' in ruleset
+    assert 'INSTI' not in ruleset
+
+
+def test_no_loci(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_hivdb_ruleset(tmp_path)
+
+
+def test_unreadable_ruleset_recompiled(hivdb):
+    _write_locus(hivdb, 'insti', ['BIC', 'DTG'], 'G118R')
+    ruleset = load_hivdb_ruleset(hivdb)
+
+    hivdb.joinpath('hivdb-ruleset.pkl').write_bytes(b'not a pickle')
+    with pytest.warns(UserWarning, match='could not be read'):
+        recompiled = load_hivdb_ruleset(hivdb)
+
+    assert recompiled['SOURCE_HASHES'] == ruleset['SOURCE_HASHES']
+    assert recompiled['INSTI']['SIMPLE'].equals(ruleset['INSTI']['SIMPLE'])
@@ -0,0 +1,47 @@
+from src.utils import (_parsed_reports_paths, parse_genotypic_reports,
+                       parse_phenotypic_reports)
+
+
+def test_first_run_without_reports(tmp_path, deliver):
+    deliver(tmp_path / 'delivery-1.zip', {})
+
+    df = parse_genotypic_reports(tmp_path, 'geneseq', incremental=True)
+    test_df, eav_df = parse_phenotypic_reports(tmp_path, 'phenosense',
+                                               incremental=True)
+
+    assert df.empty and test_df.empty and eav_df.empty
+    for parser in ['genotypic', 'phenotypic']:
+        assert _parsed_reports_paths(tmp_path, parser)['manifest'].exists()
+
+
+def test_nothing_new_after_first_run(tmp_path, deliver, geneseq_pages):
+    deliver(tmp_path / 'delivery-1.zip',
+            {f'{n}.PDF': geneseq_pages(n) for n in range(3)}, mtime=1_000_000)
+
+    first = parse_genotypic_reports(tmp_path, 'geneseq', incremental=True)
+    assert len(first) == 3
+
+    again = parse_genotypic_reports(tmp_path, 'geneseq', incremental=True)
+    assert again.equals(first)
+
+    # A later delivery is appended
+    deliver(tmp_path / 'delivery-2.zip', {'3.PDF': geneseq_pages(3)},
+            mtime=2_000_000)
+    df = parse_genotypic_reports(tmp_path, 'geneseq', incremental=True)
+
+    assert sorted(df['DOC_NAME']) == ['0.PDF', '1.PDF', '2.PDF', '3.PDF']
+    assert df.equals(parse_genotypic_reports(tmp_path, 'geneseq'))
+
+
+def test_phenotypic_nothing_new_after_first_run(tmp_path, deliver,
+                                                 phenosense_pages):
+    deliver(tmp_path / 'delivery-1.zip',
+            {f'{n}.PDF': phenosense_pages(n) for n in range(3)})
+
+    first = parse_phenotypic_reports(tmp_path, 'phenosense',
+                                     incremental=True)
+    assert len(first[0]) == 3 and len(first[1]) > 0
+
+    again = parse_phenotypic_reports(tmp_path, 'phenosense',
+                                     incremental=True)
+    assert again[0].equals(first[0]) and again[1].equals(first[1])
@@ -0,0 +1,99 @@
+import pandas as pd
+import pytest
+
+import src.utils
+from conftest import _header
+from src.utils import (ingest_reports, parse_genotypic_reports,
+                       parse_phenotypic_reports)
+
+
+def _phenosense_gt_pages(n):
+    """Pages of the n-th of a series of distinct PhenoSense GT reports."""
+    return [_header('PhenoSense GT', n) +
+            f'Lamivudine Epivir (3.5) {1 + n}.74 Y Abacavir Ziagen '
+            f'(4.5-6.5) 1.8{n % 10} N Efavirenz Sustiva (3.0) 0.9 N ',
+            ' Patient-specific Results Drugs 3TC ABC EFV IC50 1.2 0.5 0.01 '
+            'Fold ',
+            f' Replication Capacity = {40 + n}%(Range 30%-60%) ',
+            ' RT M184V, K103N PR None IN None Comments ']
+
+
+@pytest.fixture
+def phenosense_gt_pages():
+    return _phenosense_gt_pages
+
+
+def _deliver_series(path_to_zips, deliver, pages, first=0):
+    path_to_zips.mkdir(exist_ok=True)
+    deliver(path_to_zips / f'delivery-{first}.zip',
+            {f'18-{n:06d}_F.PDF': pages(n) for n in range(first, first + 5)})
+
+    return path_to_zips
+
+
+@pytest.mark.parametrize('test_type, pages, tables', [
+    ('GENESEQ', 'geneseq_pages', ['GENOTYPIC']),
+    ('PHENOSENSE', 'phenosense_pages', ['PHENOTYPIC']),
+    ('PHENOSENSE-GT', 'phenosense_gt_pages', ['GENOTYPIC', 'PHENOTYPIC'])])
+def test_ingest_same_as_parsers(tmp_path, deliver, request, test_type,
+                                pages, tables):
+    path_to_zips = _deliver_series(tmp_path, deliver,
+                                   request.getfixturevalue(pages))
+
+    df, test_df, eav_df = ingest_reports(path_to_zips, test_type,
+                                         stream=True)
+
+    if 'GENOTYPIC' in tables:
+        pd.testing.assert_frame_equal(
+            df, parse_genotypic_reports(path_to_zips, test_type,
+                                        stream=True))
+    else:
+        assert df is None
+
+    if 'PHENOTYPIC' in tables:
+        parsed_test_df, parsed_eav_df = parse_phenotypic_reports(
+            path_to_zips, test_type, stream=True)
+
+        assert len(eav_df) > 0
+        pd.testing.assert_frame_equal(test_df, parsed_test_df)
+        pd.testing.assert_frame_equal(eav_df, parsed_eav_df)
+    else:
+        assert test_df is None and eav_df is None
+
+
+def test_each_report_scraped_once(tmp_path, deliver, monkeypatch,
+                                  phenosense_gt_pages):
+    path_to_zips = _deliver_series(tmp_path, deliver, phenosense_gt_pages)
+
+    scraped = list()
+    scrape = src.utils._scrape_PDF_bytes_to_text
+
+    def _counted_scrape(pdf_bytes, **kwargs):
+        scraped.append(pdf_bytes)
+        return scrape(pdf_bytes, **kwargs)
+
+    monkeypatch.setattr('src.utils._scrape_PDF_bytes_to_text',
+                        _counted_scrape)
+    ingest_reports(path_to_zips, 'phenosense-gt', stream=True)
+
+    assert len(scraped) == len(set(scraped)) == 5
+
+
+def test_mixed_archives(tmp_path, deliver, geneseq_pages, phenosense_pages):
+    geneseq_path = _deliver_series(tmp_path / 'geneseq', deliver,
+                                   geneseq_pages)
+    phenosense_path = _deliver_series(tmp_path / 'phenosense', deliver,
+                                      phenosense_pages, first=5)
+
+    # Both series in one directory
+    _deliver_series(tmp_path / 'mixed', deliver, geneseq_pages)
+    _deliver_series(tmp_path / 'mixed', deliver, phenosense_pages, first=5)
+
+    df, test_df, eav_df = ingest_reports(tmp_path / 'mixed', stream=True)
+    parsed_test_df, parsed_eav_df = parse_phenotypic_reports(
+        phenosense_path, 'PHENOSENSE', stream=True)
+
+    pd.testing.assert_frame_equal(
+        df, parse_genotypic_reports(geneseq_path, 'GENESEQ', stream=True))
+    pd.testing.assert_frame_equal(test_df, parsed_test_df)
+    pd.testing.assert_frame_equal(eav_df, parsed_eav_df)
@@ -0,0 +1,68 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from src.utils import _map_reports
+
+
+def _parse_report(path_to_pdf, test_type):
+    if path_to_pdf.name == 'raises.pdf':
+        raise ValueError('unreadable')
+    if path_to_pdf.name == 'exits.pdf':
+        os._exit(3)
+
+    return path_to_pdf.name
+
+
+REPORTS = [Path(name) for name in ['a.pdf', 'raises.pdf', 'b.pdf',
+                                   'exits.pdf', 'c.pdf']]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_isolated_without_timeout(workers):
+    quarantine = list()
+    results = list(_map_reports(_parse_report, REPORTS, 'GENESEQ',
+                                workers=workers, isolate=True,
+                                quarantine=quarantine))
+
+    assert results == ['a.pdf', None, 'b.pdf', None, 'c.pdf']
+    assert sorted((entry['DOC_NAME'], entry['EXCEPTION'])
+                  for entry in quarantine) == \
+        [('exits.pdf', 'Worker exited'),
+         ('raises.pdf', 'ValueError: unreadable')]
+
+
+def test_not_isolated_by_default():
+    with pytest.raises(ValueError):
+        list(_map_reports(_parse_report, REPORTS[:2], 'GENESEQ'))
+
+
+def _log_and_parse(path_to_pdf, test_type, log_path):
+    import time
+
+    with open(log_path, 'a') as log:
+        log.write(f'{path_to_pdf.name}\n')
+
+    # The first report is slow; the rest are quick
+    if path_to_pdf.name == '00.pdf':
+        time.sleep(0.5)
+
+    return path_to_pdf.name
+
+
+def test_slow_report_holds_back_a_bounded_number(tmp_path):
+    from functools import partial
+
+    log_path = tmp_path / 'started.txt'
+    reports = [Path(f'{i:02d}.pdf') for i in range(20)]
+
+    results = _map_reports(partial(_log_and_parse, log_path=log_path),
+                           reports, 'GENESEQ', workers=2, isolate=True)
+
+    # While the first report is parsed no more than one other is started
+    assert next(results) == '00.pdf'
+    assert len(log_path.read_text().split()) <= 2
+
+    assert [next(results)] + list(results) == \
+        [report.name for report in reports[1:]]
@@ -0,0 +1,140 @@
+from collections import OrderedDict
+from itertools import cycle
+
+import pandas as pd
+import pytest
+
+import baseline
+from conftest import GENOTYPIC_TESTS
+from src.utils import (_carry_forward_mutations,
+                       melt_loci_specific_mutations_to_position,
+                       melt_mutations_to_position, mutation_token_table,
+                       parse_mutation_token)
+
+
+loci = pytest.mark.parametrize('locus', ['RT', 'PR', 'INSTI'])
+
+
+@loci
+def test_mixtures_split_as_before(mutations_df, locus):
+    position_df = melt_loci_specific_mutations_to_position(mutations_df, locus)
+
+    pd.testing.assert_frame_equal(
+        position_df,
+        baseline.melt_loci_specific_mutations_to_position(mutations_df,
+                                                          locus))
+
+
+def test_mixture_components():
+    mutations_df = pd.DataFrame({
+        'PAT_MRN_ID': ['1001'], 'COLLECTED_DATE': ['2018-06-12'],
+        'ACCESSION': ['18-100001'], 'REPORT_COMPLETE': [True],
+        'RT_LIST': ['V245V/M,M184M/V/I,T69T/S/SSS,E44E/^,D123E']})
+
+    position_df = melt_loci_specific_mutations_to_position(mutations_df, 'RT')
+
+    assert position_df[['MUTATION', 'AA']].values.tolist() == [
+        ['E44E', 'del'], ['T69T/S/SSS', 'ins'], ['D123E', 'E'],
+        ['M184M/V/I', 'M'], ['M184M/V/I', 'V'], ['M184M/V/I', 'I'],
+        ['V245V/M', 'V'], ['V245V/M', 'M']]
+
+
+def _carried_forward_as_before(patients, mutation_lists):
+    # As in baseline.melt_loci_specific_mutations_to_position
+    df = pd.DataFrame({'PAT_MRN_ID': patients, 'RT_LIST': mutation_lists})
+
+    for i, row in df.iterrows():
+        if (i > 0) and (row['PAT_MRN_ID'] == df.loc[i-1]['PAT_MRN_ID']):
+            combined_list = df.loc[i-1]['RT_LIST'] + ',' + row['RT_LIST']
+            df.loc[i, 'RT_LIST'] = combined_list
+
+    return [', '.join(OrderedDict.fromkeys(x.split(','), 1))
+            for x in df['RT_LIST']]
+
+
+def test_carry_forward_same_as_before():
+    # Patients with one to six tests; mutations recur within and across
+    #   patients (and within a list)
+    mutations = cycle(['M184V', 'K103N', 'Y181C', 'M184V', 'K65R', 'M41L',
+                       'T215Y', 'K103N', 'V245V/M'])
+    patients, mutation_lists = [], []
+    for patient in range(6):
+        for test in range(patient + 1):
+            patients.append(str(1000 + patient))
+            mutation_lists.append(','.join(
+                next(mutations) for _ in range(1 + (patient + test) % 4)))
+
+    assert _carry_forward_mutations(patients, mutation_lists) == \
+        _carried_forward_as_before(patients, mutation_lists)
+
+
+def test_carry_forward_within_patient():
+    assert _carry_forward_mutations(
+        ['1001', '1001', '1001', '1002'],
+        ['M184V,K103N', 'K103N,Y181C', 'M41L', 'K103N']) == \
+        ['M184V, K103N', 'M184V, K103N, Y181C', 'M184V, K103N, Y181C, M41L',
+         'K103N']
+
+
+def _parsed_as_before(mutations):
+    # As in baseline.melt_loci_specific_mutations_to_position
+    #   (before mixtures are split into components)
+    position_df = pd.DataFrame({'MUTATION': mutations})
+    position_df['POSITION'] = position_df['MUTATION']\
+        .str.extract(r'[A-Z]([\d]+)')[0].astype(float)
+    position_df['AA'] = position_df['MUTATION']\
+        .str.extract(r'[\d]+([A-Z/\^]*)')
+
+    insertion_mask = (position_df['MUTATION'].str.contains('[A-Z][A-Z]+'))
+    deletion_mask = (position_df['MUTATION'].str.contains(r'\^', na=False))
+
+    position_df.loc[insertion_mask, 'AA'] = 'ins'
+    position_df.loc[deletion_mask, 'AA'] = 'del'
+    position_df.loc[deletion_mask, 'MUTATION'] = position_df.loc[
+        deletion_mask]['MUTATION'].str.replace(r'\/.*', '', regex=True)
+
+    return position_df
+
+
+def test_tokens_parsed_as_before():
+    mutations = pd.unique(pd.Series(
+        [mutation for test in GENOTYPIC_TESTS for mutation_list in test[4:]
+         if mutation_list for mutation in mutation_list.split(',')]))
+
+    token_table = mutation_token_table(mutations)
+    parsed_df = _parsed_as_before(mutations)
+
+    assert token_table.index.to_list() == list(mutations)
+    assert token_table['MUTATION'].to_list() == \
+        parsed_df['MUTATION'].to_list()
+    assert token_table['POSITION'].to_list() == \
+        parsed_df['POSITION'].to_list()
+    assert token_table['AA'].to_list() == parsed_df['AA'].to_list()
+    assert token_table['INSERTION_DELETION'].to_list() == \
+        parsed_df['AA'].isin(['ins', 'del']).to_list()
+
+
+def test_tokens_parsed_once(mutations_df):
+    melt_loci_specific_mutations_to_position(mutations_df, 'RT')
+    misses = parse_mutation_token.cache_info().misses
+
+    melt_loci_specific_mutations_to_position(mutations_df, 'RT')
+
+    assert parse_mutation_token.cache_info().misses == misses
+
+
+def test_all_loci_melted_as_one_at_a_time(mutations_df):
+    position_dfs = melt_mutations_to_position(mutations_df)
+    long_df = melt_mutations_to_position(mutations_df, long_format=True)
+
+    assert list(position_dfs) == ['RT', 'PR', 'INSTI']
+    for locus, position_df in position_dfs.items():
+        one_locus_df = baseline.melt_loci_specific_mutations_to_position(
+            mutations_df, locus)
+
+        pd.testing.assert_frame_equal(position_df, one_locus_df)
+        pd.testing.assert_frame_equal(
+            long_df[long_df['LOCUS'] == locus]
+            .drop(columns='LOCUS')
+            .reset_index(drop=True),
+            one_locus_df)
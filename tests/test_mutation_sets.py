@@ -0,0 +1,29 @@
+import pandas as pd
+
+from src.utils import pack_mutation_sets
+
+
+def _mutation_sets():
+    position_df = pd.DataFrame({'PAT_MRN_ID': ['0', '0', '1'],
+                                'COLLECTED_DATE': ['2018-02-14'] * 3,
+                                'ACCESSION': ['A', 'A', 'B'],
+                                'POSITION': [41.0, 184.0, 184.0],
+                                'AA': ['L', 'V', 'V']})
+
+    return pack_mutation_sets(position_df)
+
+
+def test_contains():
+    mutation_sets = _mutation_sets()
+
+    assert mutation_sets.contains([(184, 'V')]).tolist() == [True, True]
+    assert mutation_sets.contains([(41, 'L'), (184, 'V')]).tolist() == \
+        [True, False]
+
+
+def test_contains_unseen_mutation():
+    mutation_sets = _mutation_sets()
+
+    assert mutation_sets.contains([(999, 'Z')]).tolist() == [False, False]
+    assert mutation_sets.contains([(184, 'V'), (999, 'Z')]).tolist() == \
+        [False, False]
@@ -0,0 +1,158 @@
+from functools import partial
+
+from src.utils import (_extract_genotypic_record, _extract_phenotypic_record,
+                       _scrape_PDF_bytes_to_text, index_report_sections,
+                       required_sections_seen)
+
+
+# A GeneSeq report whose drug table is labelled by drug class (' PI ',
+#   ' IN ' read as mutation-list anchors) and runs on to a second page
+GENESEQ_PAGES = [
+    'GeneSeq HIV Patient Name: DOE, JOHN DOB: 01-JAN-1970 Patient ID: '
+    '1234567 Gender: M Monogram Accession #: 18-157409 Date Collected: '
+    '17-MAY-2016 11:20 PT Date Received: 18-MAY-2016 11:20 PT Date '
+    'Reported: 20-MAY-2016 11:20 PT Mode: F Report Status: FINAL Referring '
+    'Physician: Jane Smith Reference Lab ID/Order #: 998877 X HIV-1 '
+    'Subtype: B Generic NRTI Abacavir Ziagen M184V ABC Lamivudine Epivir '
+    'M184V 3TC',
+    ' PI Darunavir Prezista / r None DRV IN Dolutegravir Tivicay None DTG ',
+    ' RT M184V, K103N PR None Comments ',
+    'Resistance is assessed by a proprietary algorithm (version 12) ',
+    'References 1',
+    'References 2']
+
+
+def test_drug_class_labels_do_not_end_scraping(make_pdf):
+    pdf = make_pdf(GENESEQ_PAGES)
+    full_text = _scrape_PDF_bytes_to_text(pdf)
+
+    page_counts = {}
+    text = _scrape_PDF_bytes_to_text(
+        pdf, max_pages=6, page_counts=page_counts,
+        stop=partial(required_sections_seen, test_type='geneseq'))
+
+    # One page beyond the algorithm comment
+    assert page_counts == {'PAGES': 6, 'PAGES_SCRAPED': 5}
+
+    record = _extract_genotypic_record(text, 'geneseq', doc_name='A.PDF')
+    full_record = _extract_genotypic_record(full_text, 'geneseq',
+                                            doc_name='A.PDF')
+
+    assert record == full_record
+    assert record['RT_LIST'] == 'M184V, K103N'
+    assert record['ALGORITHM_VERSION'] == '12'
+
+
+def test_required_sections_seen_waits_for_mutation_lists():
+    pages = [page + '\f' for page in GENESEQ_PAGES]
+
+    # Drug-class labels alone (the lists are yet to come)
+    assert not required_sections_seen(''.join(pages[:3]), 'geneseq')
+
+    # Lists seen but not the algorithm comment
+    assert not required_sections_seen(''.join(pages[:4]), 'geneseq')
+
+    assert required_sections_seen(''.join(pages[:5]), 'geneseq')
+    assert required_sections_seen(''.join(pages[:5]))
+
+
+HEADER = ('Patient Name: DOE, JOHN DOB: 01-JAN-1970 Patient ID: 1234567 '
+          'Gender: M Monogram Accession #: 18-157409 Date Collected: '
+          '17-MAY-2016 11:20 PT Date Received: 18-MAY-2016 11:20 PT Date '
+          'Reported: 20-MAY-2016 11:20 PT Mode: F Report Status: FINAL '
+          'Referring Physician: Jane Smith Reference Lab ID/Order #: 998877 X '
+          'HIV-1 Subtype: B Generic ')
+
+PHENOSENSE_PAGES = [
+    'PhenoSense HIV ' + HEADER + 'Lamivudine Epivir (3.5) 9.74 3TC Abacavir '
+    'Ziagen (4.5-6.5) 1.87 ABC',
+    ' Darunavir Prezista / r (10-90) 2.1 DRV Efavirenz Sustiva (3.0) 0.9 EFV ',
+    ' Patient-specific Results Drugs 3TC ABC DRV EFV IC50 1.2 0.5 0.03 0.01 '
+    'Fold ',
+    ' Replication Capacity = 45%(Range 30%-60%) ',
+    'References 1',
+    'References 2',
+    'References 3']
+
+PHENOSENSE_GT_PAGES = [
+    'PhenoSense GT ' + HEADER + 'Lamivudine Epivir (3.5) 9.74 Y Abacavir '
+    'Ziagen (4.5-6.5) 1.87 N',
+    ' Darunavir Prezista / r (10-90) 2.1 N Efavirenz Sustiva (3.0) 0.9 N ',
+    ' Patient-specific Results Drugs 3TC ABC DRV EFV IC50 1.2 0.5 0.03 0.01 '
+    'Fold ',
+    ' Replication Capacity = 45%(Range 30%-60%) ',
+    ' RT: M184V, K103N PR: None IN: E138K Comments ',
+    'References 1',
+    'References 2']
+
+PHENOSENSE_ENTRY_PAGES = [
+    'PhenoSense Entry ' + HEADER,
+    'Enfuvirtide Fuzeon0.019434 0.51    ENF ',
+    'References 1',
+    'References 2',
+    'References 3']
+
+
+def _scrape_page_limited(make_pdf, pages, test_type):
+    pdf = make_pdf(pages)
+
+    page_counts = {}
+    text = _scrape_PDF_bytes_to_text(
+        pdf, max_pages=len(pages), page_counts=page_counts,
+        stop=partial(required_sections_seen, test_type=test_type))
+
+    return text, _scrape_PDF_bytes_to_text(pdf), page_counts
+
+
+def _assert_same_phenotypic_record(text, full_text, test_type):
+    record, eav_df = _extract_phenotypic_record(text, test_type, 'A.PDF')
+    full_record, full_eav_df = _extract_phenotypic_record(full_text,
+                                                          test_type, 'A.PDF')
+
+    assert record == full_record
+    assert eav_df.equals(full_eav_df)
+
+    return record, eav_df
+
+
+def test_phenosense_stops_after_replication_capacity(make_pdf):
+    text, full_text, page_counts = _scrape_page_limited(
+        make_pdf, PHENOSENSE_PAGES, 'phenosense')
+
+    assert page_counts == {'PAGES': 7, 'PAGES_SCRAPED': 5}
+
+    record, eav_df = _assert_same_phenotypic_record(text, full_text,
+                                                    'phenosense')
+    assert 'EFV' in record
+    assert set(eav_df['ARV']) >= {'3TC', 'ABC', 'EFV'}
+    assert eav_df['IC50'].notnull().any()
+
+
+def test_phenosense_gt_stops_after_mutation_lists(make_pdf):
+    text, full_text, page_counts = _scrape_page_limited(
+        make_pdf, PHENOSENSE_GT_PAGES, 'phenosense-gt')
+
+    assert page_counts == {'PAGES': 7, 'PAGES_SCRAPED': 6}
+
+    _assert_same_phenotypic_record(text, full_text, 'phenosense-gt')
+
+    record = _extract_genotypic_record(text, 'phenosense-gt', 'A.PDF')
+    assert record == _extract_genotypic_record(full_text, 'phenosense-gt',
+                                               'A.PDF')
+    assert record['RT_LIST'] == 'M184V, K103N'
+
+
+def test_phenosense_entry_stops_after_drug_table(make_pdf):
+    # No IC50 section nor replication capacity to wait for
+    text, full_text, page_counts = _scrape_page_limited(
+        make_pdf, PHENOSENSE_ENTRY_PAGES, 'phenosense-entry')
+
+    assert page_counts == {'PAGES': 5, 'PAGES_SCRAPED': 2}
+
+    # The drug table (from which both IC50 and fold change are read) is
+    #   scraped in full
+    start, end = index_report_sections(text)['DRUG_TABLE']
+    full_start, _ = index_report_sections(full_text)['DRUG_TABLE']
+
+    assert full_text[full_start:].startswith(text[start:end].rstrip('\f'))
+    assert 'Enfuvirtide Fuzeon0.019434 0.51' in text[start:end]
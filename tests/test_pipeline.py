@@ -0,0 +1,60 @@
+import time
+
+import pandas as pd
+import pytest
+
+from src.utils import (_prefetch_reports, parse_genotypic_reports,
+                       parse_phenotypic_reports)
+
+
+class _CountedReport:
+    """A report whose reads are counted."""
+    reads = 0
+
+    def __init__(self, name):
+        self.name = name
+
+    def read_bytes(self):
+        _CountedReport.reads += 1
+        return self.name.encode()
+
+
+def test_prefetched_in_order_and_bounded():
+    _CountedReport.reads = 0
+    reports = [_CountedReport(f'{n}.PDF') for n in range(50)]
+
+    prefetched = _prefetch_reports(reports, queue_depth=4)
+    first = next(prefetched)
+    time.sleep(0.5)
+
+    # The one consumed, those queued and the one waiting to be queued
+    assert _CountedReport.reads <= 1 + 4 + 1
+
+    assert [first] + list(prefetched) == [
+        (report.name, report.name.encode()) for report in reports]
+
+
+def _as_tuple(parsed):
+    return parsed if isinstance(parsed, tuple) else (parsed,)
+
+
+@pytest.mark.parametrize('parse_reports, test_type, pages', [
+    (parse_genotypic_reports, 'geneseq', 'geneseq_pages'),
+    (parse_phenotypic_reports, 'phenosense', 'phenosense_pages')])
+@pytest.mark.parametrize('workers, stream', [
+    (1, False), (1, True), (2, False), (2, True)])
+def test_pipelined_run_same_as_unpipelined(tmp_path, deliver, request,
+                                           parse_reports, test_type, pages,
+                                           workers, stream):
+    pages = request.getfixturevalue(pages)
+    deliver(tmp_path / 'delivery.zip',
+            {f'18-{n:06d}_F.PDF': pages(n) for n in range(12)})
+
+    unpipelined = parse_reports(tmp_path, test_type, stream=stream)
+    pipelined = parse_reports(tmp_path, test_type, stream=stream,
+                              workers=workers, queue_depth=2)
+
+    for pipelined_df, unpipelined_df in zip(_as_tuple(pipelined),
+                                            _as_tuple(unpipelined)):
+        assert len(pipelined_df) > 0
+        pd.testing.assert_frame_equal(pipelined_df, unpipelined_df)
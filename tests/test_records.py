@@ -0,0 +1,74 @@
+import pandas as pd
+
+from src.utils import (PrefetchedReport, _finalize_genotypic_df,
+                       _finalize_phenotypic_df, _parse_genotypic_report,
+                       _parse_phenotypic_report, _reorder_genotypic_columns,
+                       _reorder_phenotypic_columns, parse_genotypic_reports,
+                       parse_phenotypic_reports)
+
+
+def _failed_pages(n):
+    # Fewer drugs (so records have different fields) and no mutations
+    return [f'GeneSeq HIV Patient Name: DOE, JANE{n} DOB: 01-JAN-1980 '
+            f'Patient ID: {2000000 + n} Gender: F Monogram Accession #: '
+            f'18-{200000 + n} Date Collected: 02-JUN-2016 11:20 PT '
+            'Report Status: FINAL Generic ',
+            'The sample could not be completed due to low viral load ']
+
+
+def _built_cell_by_cell(records, reorder_columns):
+    # As the parsers once built their dataframes
+    df = pd.DataFrame()
+
+    for i, record in enumerate(records):
+        for attribute, value in record.items():
+            df.loc[i, attribute] = value
+
+        df = reorder_columns(df=df)
+
+    # ... leaving REPORT_COMPLETE as object and 'nan' in missing drug fields
+    df['REPORT_COMPLETE'] = df['REPORT_COMPLETE'].astype(bool)
+
+    return df.replace('nan', float('nan'))
+
+
+def _reports(pages):
+    reports = {f'18-{n:06d}_F.PDF': pages(n) for n in range(6)}
+    reports.update({f'18-{n:06d}_F.PDF': _failed_pages(n)
+                    for n in range(6, 8)})
+
+    return reports
+
+
+def test_genotypic_records_same_as_cell_by_cell(tmp_path, make_pdf, deliver,
+                                                geneseq_pages):
+    reports = _reports(geneseq_pages)
+    deliver(tmp_path / 'delivery.zip', reports)
+
+    records = [_parse_genotypic_report(
+        PrefetchedReport(doc_name, make_pdf(pages)), 'GENESEQ')
+        for doc_name, pages in reports.items()]
+    assert not all(record.keys() == records[0].keys() for record in records)
+
+    pd.testing.assert_frame_equal(
+        parse_genotypic_reports(tmp_path, 'geneseq', stream=True),
+        _finalize_genotypic_df(
+            _built_cell_by_cell(records, _reorder_genotypic_columns)))
+
+
+def test_phenotypic_records_same_as_cell_by_cell(tmp_path, make_pdf, deliver,
+                                                 phenosense_pages):
+    reports = _reports(phenosense_pages)
+    deliver(tmp_path / 'delivery.zip', reports)
+
+    results = [_parse_phenotypic_report(
+        PrefetchedReport(doc_name, make_pdf(pages)), 'PHENOSENSE')
+        for doc_name, pages in reports.items()]
+
+    test_df, _ = parse_phenotypic_reports(tmp_path, 'phenosense',
+                                               stream=True)
+
+    pd.testing.assert_frame_equal(
+        test_df,
+        _finalize_phenotypic_df(_built_cell_by_cell(
+            [record for record, _ in results], _reorder_phenotypic_columns)))
@@ -0,0 +1,86 @@
+import pytest
+
+from src.utils import (_extract_genotypic_record, _extract_phenotypic_record,
+                       _scrape_PDF_bytes_to_text, index_report_sections)
+from test_page_limit import (GENESEQ_PAGES, PHENOSENSE_GT_PAGES,
+                             PHENOSENSE_PAGES)
+
+
+HEADER = ('Patient Name: DOE, JOHN DOB: 01-JAN-1970 Patient ID: 1234567 '
+          'Reference Lab ID/Order #: 998877 X HIV-1 Subtype: B Generic ')
+
+
+def test_drug_table_runs_past_mutation_lists():
+    sample_text = (HEADER + 'NRTI Abacavir Ziagen M184V ABC PI Darunavir '
+                   'Prezista / r None DRV RT M184V, K103N PR None IN None '
+                   'Comments')
+    sections = index_report_sections(sample_text)
+
+    assert sections['DRUG_TABLE'] == (sample_text.index('Generic'),
+                                      len(sample_text))
+
+
+def test_drug_table_without_mutation_lists_ends_with_report():
+    # PhenoSense reports have no mutation lists; drug-class labels
+    #   (' PI ') are not lists
+    sample_text = (HEADER + 'NRTI Lamivudine Epivir (3.5) 9.74 3TC '
+                   'PI Darunavir Prezista / r (10-90) 2.1 DRV '
+                   'Patient-specific Results Drugs 3TC DRV IC50 1.2 0.03 '
+                   'Replication Capacity = 45%')
+    sections = index_report_sections(sample_text)
+
+    assert sections['DRUG_TABLE'] == (sample_text.index('Generic'),
+                                      len(sample_text))
+
+
+def _report_texts(make_pdf, pages):
+    # As scraped by pdfminer (line breaks, page breaks); {pages} is a
+    #   list of pages or a builder of the n-th of a series of reports
+    if callable(pages):
+        return [_scrape_PDF_bytes_to_text(make_pdf(pages(n)))
+                for n in range(5)]
+
+    return [_scrape_PDF_bytes_to_text(make_pdf(pages))]
+
+
+def _whole_report(sample_text):
+    # Every extractor searches the whole report
+    return {section: (0, len(sample_text))
+            for section in index_report_sections(sample_text)}
+
+
+@pytest.mark.parametrize('test_type, pages', [
+    ('geneseq', 'geneseq_pages'),
+    ('geneseq', GENESEQ_PAGES),
+    ('phenosense-gt', PHENOSENSE_GT_PAGES)])
+def test_genotypic_extractors_find_the_same_in_sections(
+        request, make_pdf, test_type, pages):
+    if isinstance(pages, str):
+        pages = request.getfixturevalue(pages)
+
+    for sample_text in _report_texts(make_pdf, pages):
+        record = _extract_genotypic_record(sample_text, test_type, 'A.PDF')
+
+        assert record == _extract_genotypic_record(
+            sample_text, test_type, 'A.PDF',
+            sections=_whole_report(sample_text))
+
+
+@pytest.mark.parametrize('test_type, pages', [
+    ('phenosense', 'phenosense_pages'),
+    ('phenosense', PHENOSENSE_PAGES),
+    ('phenosense-gt', PHENOSENSE_GT_PAGES)])
+def test_phenotypic_extractors_find_the_same_in_sections(
+        request, make_pdf, test_type, pages):
+    if isinstance(pages, str):
+        pages = request.getfixturevalue(pages)
+
+    for sample_text in _report_texts(make_pdf, pages):
+        record, eav_df = _extract_phenotypic_record(sample_text, test_type,
+                                                    'A.PDF')
+        whole_record, whole_eav_df = _extract_phenotypic_record(
+            sample_text, test_type, 'A.PDF',
+            sections=_whole_report(sample_text))
+
+        assert record == whole_record
+        assert eav_df.equals(whole_eav_df)
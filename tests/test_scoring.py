@@ -0,0 +1,106 @@
+import re
+
+import pandas as pd
+import pytest
+
+import baseline
+from src.utils import (calculate_total_resistance, compile_score_tensor,
+                       index_accessions_by_mutation,
+                       load_hivdb_scores, match_mutation_index,
+                       melt_loci_specific_mutations_to_position,
+                       score_positioned_mutations, tokenize_complex_rules)
+
+
+loci = pytest.mark.parametrize('locus', ['RT', 'PR', 'INSTI'])
+
+
+def _scored(hivdb_dir, mutations_df, locus):
+    position_df = melt_loci_specific_mutations_to_position(mutations_df, locus)
+    scores = load_hivdb_scores(hivdb_dir, locus, 'simple')
+
+    return position_df, scores
+
+
+@loci
+def test_scored_as_with_merges(hivdb_dir, mutations_df, locus):
+    position_df, scores = _scored(hivdb_dir, mutations_df, locus)
+    merged_df = baseline.score_positioned_mutations(position_df, scores)
+
+    for simple_scores in [scores, compile_score_tensor(scores)]:
+        pd.testing.assert_frame_equal(
+            score_positioned_mutations(position_df, simple_scores),
+            merged_df)
+
+
+def test_mutation_scored_by_more_than_one_rule(hivdb_dir, mutations_df):
+    # A62V and V245M are scored by both the NRTI and NNRTI rules
+    position_df, scores = _scored(hivdb_dir, mutations_df, 'RT')
+    score_tensor = compile_score_tensor(scores)
+
+    assert score_tensor.counts.max() == 2
+
+    scores_df = score_positioned_mutations(position_df, score_tensor)
+    observed = (position_df['MUTATION'] == 'A62V').sum()
+
+    # A row per combination of rules (per ARV)
+    assert observed > 0
+    assert (scores_df['MUTATION'] == 'A62V').sum() == \
+        observed * 2 ** len(score_tensor.arvs)
+
+
+def _matched_as_before(position_df, rule):
+    # As in baseline.calculate_total_resistance
+    pos = re.findall(r'([A-Z][\d][\d]?[\d]?)', rule)
+    aas = re.findall(r'[\d][\d]?[\d]?([A-Z]+)', rule)
+
+    accessions_list = list()
+    for j in range(0, len(pos)):
+        if j == 0:
+            accessions_list = position_df[
+                position_df['MUTATION'].str.startswith(pos[j]) &
+                position_df['AA'].str.contains(f'[{aas[j]}]', regex=True)
+                ]['ACCESSION'].to_list()
+
+        else:
+            accessions_list = position_df[
+                position_df['ACCESSION'].isin(accessions_list) &
+                position_df['MUTATION'].str.startswith(pos[j]) &
+                position_df['AA'].str.contains(f'[{aas[j]}]', regex=True)
+                ]['ACCESSION'].to_list()
+
+    return set(accessions_list)
+
+
+@loci
+def test_rules_matched_as_before(hivdb_dir, mutations_df, locus):
+    position_df, _ = _scored(hivdb_dir, mutations_df, locus)
+    complex_rules = load_hivdb_scores(hivdb_dir, locus, 'complex')
+    mutation_index = index_accessions_by_mutation(position_df)
+
+    rule_tokens = tokenize_complex_rules(complex_rules)
+    matched = [set(match_mutation_index(mutation_index, positions, aas))
+               for positions, aas in zip(rule_tokens['RULE_POSITIONS'],
+                                         rule_tokens['RULE_AAS'])]
+
+    assert any(matched)
+    assert matched == [_matched_as_before(position_df, rule)
+                       for rule in complex_rules['RULE']]
+
+
+@loci
+def test_totals_same_as_before(hivdb_dir, mutations_df, locus):
+    position_df, scores = _scored(hivdb_dir, mutations_df, locus)
+    scores_df = score_positioned_mutations(position_df, scores)
+    complex_rules = load_hivdb_scores(hivdb_dir, locus, 'complex')
+
+    total_scores_df = baseline.calculate_total_resistance(scores_df,
+                                                          complex_rules)
+
+    pd.testing.assert_frame_equal(
+        calculate_total_resistance(scores_df, complex_rules),
+        total_scores_df)
+    pd.testing.assert_frame_equal(
+        calculate_total_resistance(
+            scores_df, complex_rules,
+            rule_tokens=tokenize_complex_rules(complex_rules)),
+        total_scores_df)
@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+from src.utils import (PrefetchedReport, _text_cache_key, _write_text_cache,
+                       prune_text_cache, scrape_PDF_to_text)
+
+
+def _scrape_again(*args, **kwargs):
+    raise AssertionError('scraped again (not served from the cache)')
+
+
+@pytest.mark.parametrize('compress_cache', [False, True])
+def test_second_scrape_served_from_cache(tmp_path, make_pdf, monkeypatch,
+                                         compress_cache):
+    report = PrefetchedReport('18-157409_F.PDF',
+                              make_pdf(['GeneSeq HIV', 'RT M184V']))
+
+    text = scrape_PDF_to_text(report, cache_dir=tmp_path,
+                              compress_cache=compress_cache)
+    assert 'M184V' in text
+
+    monkeypatch.setattr('src.utils._scrape_PDF_bytes_to_text', _scrape_again)
+    assert scrape_PDF_to_text(report, cache_dir=tmp_path) == text
+
+    # ... whatever the report's name
+    assert scrape_PDF_to_text(PrefetchedReport('COPY.PDF', report.pdf_bytes),
+                              cache_dir=tmp_path) == text
+
+
+def test_page_limited_text_not_cached(tmp_path, make_pdf):
+    report = PrefetchedReport('18-157409_F.PDF',
+                              make_pdf(['GeneSeq HIV', 'RT M184V']))
+
+    assert 'M184V' not in scrape_PDF_to_text(report, cache_dir=tmp_path,
+                                             max_pages=1)
+    assert not list(tmp_path.iterdir())
+
+
+def test_prune_evicts_least_recently_used(tmp_path, make_pdf):
+    reports = [PrefetchedReport(f'{n}.PDF', make_pdf([f'Report {n}']))
+               for n in range(3)]
+
+    # Scraped one after the other ...
+    for n, report in enumerate(reports):
+        scrape_PDF_to_text(report, cache_dir=tmp_path)
+        cache_path, = tmp_path.glob(f'*/{_text_cache_key(report.pdf_bytes)}*')
+        os.utime(cache_path, (1_000_000 + n, 1_000_000 + n))
+
+    # ... and the first read again (now the most recently used)
+    scrape_PDF_to_text(reports[0], cache_dir=tmp_path)
+
+    entry_bytes = cache_path.stat().st_size
+    assert prune_text_cache(tmp_path, max_cache_bytes=2 * entry_bytes) == 1
+
+    cached = {cache_path.name.split('.')[0]
+              for cache_path in tmp_path.glob('*/*.txt*')}
+    assert cached == {_text_cache_key(reports[0].pdf_bytes),
+                      _text_cache_key(reports[2].pdf_bytes)}
+
+
+def test_prune_ignores_partial_writes(tmp_path):
+    _write_text_cache(tmp_path, 'ab' * 32, 'text')
+    temp_path = tmp_path / 'ab' / f"{'ab' * 32}.txt.123.tmp"
+    temp_path.write_text('partial')
+
+    assert prune_text_cache(tmp_path, max_cache_bytes=0) == 1
+    assert temp_path.exists()
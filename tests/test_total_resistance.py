@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils import (calculate_total_resistance,
+                       calculate_total_resistance_by_profile,
+                       compile_score_tensor, load_hivdb_scores,
+                       melt_mutations_to_position, score_positioned_mutations)
+
+
+loci = pytest.mark.parametrize('locus', ['RT', 'PR', 'INSTI'])
+
+
+def _by_accession(position_df, scores, complex_rules):
+    return calculate_total_resistance(
+        score_positioned_mutations(position_df, scores), complex_rules)
+
+
+@loci
+def test_by_profile_same_as_by_accession(hivdb_dir, mutations_df, locus):
+    position_df = melt_mutations_to_position(mutations_df, loci=[locus])[locus]
+    scores = load_hivdb_scores(hivdb_dir, locus, 'simple')
+    complex_rules = load_hivdb_scores(hivdb_dir, locus, 'complex')
+
+    total_scores_df = _by_accession(position_df, scores, complex_rules)
+
+    for simple_scores in [scores, compile_score_tensor(scores)]:
+        by_profile_df = calculate_total_resistance_by_profile(
+            position_df, simple_scores, complex_rules)
+
+        pd.testing.assert_frame_equal(by_profile_df, total_scores_df)
+
+    # Patients 1002, 1003 and 1005/1006 repeat earlier profiles
+    profile_cache = by_profile_df.attrs['PROFILE_CACHE']
+    assert profile_cache['HITS'] == 3
+    assert profile_cache['PROFILES'] + profile_cache['HITS'] == \
+        position_df['ACCESSION'].nunique()
+
+
+def test_incomplete_accessions_are_their_own_profile(hivdb_dir,
+                                                     mutations_df):
+    position_df = melt_mutations_to_position(mutations_df, loci=['RT'])['RT']
+    scores = load_hivdb_scores(hivdb_dir, 'RT', 'simple')
+    complex_rules = load_hivdb_scores(hivdb_dir, 'RT', 'complex')
+
+    # 15-100004 and 16-100005 share the profile of 15-100001;
+    #   one loses its MRN and the other a POSITION
+    position_df.loc[position_df['ACCESSION'] == '15-100004',
+                    'PAT_MRN_ID'] = None
+    position_df.loc[(position_df['ACCESSION'] == '16-100005') &
+                    (position_df['MUTATION'] == 'K103N'), 'POSITION'] = np.NaN
+    # ... and 18-100010 is listed under two dates
+    listed = position_df['ACCESSION'] == '18-100010'
+    position_df.loc[listed, 'COLLECTED_DATE'] = \
+        ['2018-06-12'] * (listed.sum() - 1) + ['2018-06-13']
+
+    by_profile_df = calculate_total_resistance_by_profile(
+        position_df, scores, complex_rules)
+
+    pd.testing.assert_frame_equal(
+        by_profile_df, _by_accession(position_df, scores, complex_rules))
+    # Only 18-100009 (the same as 17-100008) still shares a profile
+    assert by_profile_df.attrs['PROFILE_CACHE']['HITS'] == 1
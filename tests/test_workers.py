@@ -0,0 +1,30 @@
+import pandas as pd
+import pytest
+
+from src.utils import parse_genotypic_reports, parse_phenotypic_reports
+
+
+def _as_tuple(parsed):
+    return parsed if isinstance(parsed, tuple) else (parsed,)
+
+
+@pytest.mark.parametrize('parse_reports, test_type, pages', [
+    (parse_genotypic_reports, 'geneseq', 'geneseq_pages'),
+    (parse_phenotypic_reports, 'phenosense', 'phenosense_pages')])
+@pytest.mark.parametrize('workers', [2, 4])
+@pytest.mark.parametrize('stream', [False, True])
+def test_parallel_run_same_as_serial(tmp_path, deliver, request,
+                                     parse_reports, test_type, pages,
+                                     workers, stream):
+    pages = request.getfixturevalue(pages)
+    deliver(tmp_path / 'delivery.zip',
+            {f'18-{n:06d}_F.PDF': pages(n) for n in range(40)})
+
+    serial = parse_reports(tmp_path, test_type, stream=stream)
+    parallel = parse_reports(tmp_path, test_type, stream=stream,
+                             workers=workers)
+
+    for parallel_df, serial_df in zip(_as_tuple(parallel),
+                                      _as_tuple(serial)):
+        assert len(serial_df) > 0
+        pd.testing.assert_frame_equal(parallel_df, serial_df)
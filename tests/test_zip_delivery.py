@@ -0,0 +1,52 @@
+import os
+from zipfile import ZipFile
+
+import pytest
+
+from src.utils import _list_zipped_reports, extract_from_zips
+
+
+def _deliver(path, content, mtime):
+    with ZipFile(path, 'w') as zipObj:
+        zipObj.writestr('18-157409_F.PDF', content)
+    os.utime(path, (mtime, mtime))
+
+
+# The corrected report arrives in the newer archive, whose name may sort
+#   (and be listed) before or after that of the original delivery
+deliveries = pytest.mark.parametrize('original, corrected', [
+    ('b-original.zip', 'a-corrected.zip'),
+    ('a-original.zip', 'b-corrected.zip'),
+    ('2019-05.zip', '2019-04-resent.zip')])
+
+
+def _redelivered(tmp_path, original, corrected):
+    _deliver(tmp_path / corrected, b'corrected', mtime=2_000_000)
+    _deliver(tmp_path / original, b'original', mtime=1_000_000)
+
+    return tmp_path
+
+
+@deliveries
+def test_newest_delivery_wins_when_streaming(tmp_path, original, corrected):
+    report, = extract_from_zips(
+        _redelivered(tmp_path, original, corrected), stream=True)
+
+    assert report.read_bytes() == b'corrected'
+
+
+@deliveries
+def test_newest_delivery_wins_when_extracting(tmp_path, original,
+                                              corrected):
+    report_path, = extract_from_zips(
+        _redelivered(tmp_path, original, corrected))
+
+    assert report_path.read_bytes() == b'corrected'
+
+
+@deliveries
+def test_newest_delivery_wins_in_manifest(tmp_path, original, corrected):
+    zip_members = _list_zipped_reports(
+        _redelivered(tmp_path, original, corrected))
+
+    assert zip_members['ZIP_FILE'].to_list() == [str(tmp_path / corrected)]
@@ -0,0 +1,49 @@
+import os
+from zipfile import ZipFile, ZIP_DEFLATED
+
+from src.utils import ZippedReport
+
+
+def _deliver(path, members, mtime):
+    with ZipFile(path, 'w') as zipObj:
+        for member, content in members.items():
+            zipObj.writestr(member, content)
+    os.utime(path, (mtime, mtime))
+
+
+def test_rewritten_archive_is_reopened(tmp_path):
+    zip_path = tmp_path / 'delivery.zip'
+
+    _deliver(zip_path, {'A.PDF': b'a'}, mtime=1_000_000)
+    assert ZippedReport(str(zip_path), 'A.PDF').read_bytes() == b'a'
+
+    # Rewritten in place with another member
+    _deliver(zip_path, {'A.PDF': b'a', 'B.PDF': b'b'}, mtime=2_000_000)
+    assert ZippedReport(str(zip_path), 'B.PDF').read_bytes() == b'b'
+
+
+def _read_report(report, test_type):
+    return report.read_bytes()
+
+
+def test_serial_then_parallel_reads(tmp_path):
+    # Workers forked after a serial read must not share the parent's
+    #   open archive (and its file offset)
+    from src.utils import _map_reports
+
+    zip_path = tmp_path / 'delivery.zip'
+    members = {f'{i:03d}.PDF': os.urandom(64) * 64 for i in range(400)}
+
+    with ZipFile(zip_path, 'w', compression=ZIP_DEFLATED) as zipObj:
+        for member, content in members.items():
+            zipObj.writestr(member, content)
+
+    reports = [ZippedReport(str(zip_path), member) for member in members]
+    expected = list(members.values())
+
+    assert list(_map_reports(_read_report, reports, 'GENESEQ')) == expected
+    assert list(_map_reports(_read_report, reports, 'GENESEQ',
+                             workers=4)) == expected
+    assert list(_map_reports(_read_report, reports, 'GENESEQ',
+                             isolate=True, workers=4)) == expected
+    assert list(_map_reports(_read_report, reports, 'GENESEQ')) == expected